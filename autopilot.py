@@ -0,0 +1,485 @@
+import asyncio
+import json
+import math
+import random
+import threading
+import time
+
+from motor_control import LoopbackTransport, decode_messages
+from metrics import LatencyHistogram
+from perf import STAGE_BUCKETS
+from sensor_sources import SensorSource
+
+# Kontrol döngüsü hızı (Hz)
+CONTROL_RATE = 50.0
+
+# Tahmin bu kadar saniyeden eskiyse kontrolcüler durur (bağlantı kopukken itme yok)
+CONTROL_MAX_AGE = 0.5
+
+# Motor ayar değerleri: eksen -> [-1, 1]
+# ileri: + ileri, düşey: + aşağı (dalış), dönüş: + saat yönü,
+# yatış: + sağa yatış, yunuslama: + burun yukarı
+CONTROL_AXES = ("ileri", "düşey", "dönüş", "yatış", "yunuslama")
+
+# Özel hareketler: DAL bir adımda bu kadar metre iner, DÖNÜŞ bu hızda döner (°/s)
+DIVE_STEP = 2.0
+TURN_RATE = 30.0
+
+
+def wrap_degrees(angle):
+    """Açıyı [-180, 180) aralığına indir"""
+    return (angle + 180.0) % 360.0 - 180.0
+
+
+class FixedRateLoop:
+    """Kendi iş parçacığında sabit hızda, kaymasız çalışan döngü.
+
+    k. tur `başlangıç + k * periyot` anında başlar; uyku hataları birikmez.
+    Bir tur bir sonraki vadeyi geçerse kaçırılan turlar art arda
+    koşturulmaz, atlanır (`overruns` tur, `skipped` vade). Her turun
+    vadesinden ne kadar geç başladığı `jitter`, turun kendisi `work`
+    histogramına yazılır. `step(zaman, dt)` içindeki hatalar döngüyü
+    durdurmaz, `errors` sayılır.
+    """
+
+    def __init__(self, step, rate_hz=CONTROL_RATE, name="kontrol"):
+        self.step = step
+        self.rate_hz = rate_hz
+        self.period = 1.0 / rate_hz
+        self.name = name
+        self.jitter = LatencyHistogram(STAGE_BUCKETS)
+        self.work = LatencyHistogram(STAGE_BUCKETS)
+        self.ticks = 0
+        self.overruns = 0
+        self.skipped = 0
+        self.errors = 0
+        self.last_error = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def running(self):
+        return self._thread is not None
+
+    def start(self):
+        if self._thread:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=1.0):
+        self._stop.set()
+        thread, self._thread = self._thread, None
+        if thread and thread is not threading.current_thread():
+            thread.join(timeout)
+
+    def _run(self):
+        start = time.monotonic()
+        previous = None
+        k = 0
+        while not self._stop.is_set():
+            deadline = start + k * self.period
+            now = time.monotonic()
+            if deadline > now:
+                if self._stop.wait(deadline - now):
+                    return
+                now = time.monotonic()
+            self.jitter.record(now - deadline)
+
+            dt = now - previous if previous is not None else self.period
+            previous = now
+            try:
+                self.step(now, dt)
+            except Exception as e:
+                self.errors += 1
+                self.last_error = str(e)
+            done = time.monotonic()
+            self.work.record(done - now)
+            self.ticks += 1
+
+            k += 1
+            # Sıradaki vade geçtiyse gelecekteki ilk vadeye atla
+            due = int((done - start) / self.period) + 1
+            if due > k:
+                self.overruns += 1
+                self.skipped += due - k
+                k = due
+
+    def stats(self):
+        return {
+            "rate": self.rate_hz,
+            "ticks": self.ticks,
+            "overruns": self.overruns,
+            "skipped": self.skipped,
+            "errors": self.errors,
+            "jitter_p50": self.jitter.percentile(50),
+            "jitter_p99": self.jitter.percentile(99),
+            "jitter_max": self.jitter.max,
+            "work_p99": self.work.percentile(99),
+        }
+
+
+class PID:
+    """Çıkışı [-limit, limit] aralığında sınırlı PID.
+
+    Türev, verilirse ölçülen değişim hızından alınır (hedef değişince
+    sıçrama yapmaz). Çıkış doymuşken integral büyütülmez (sarılma yok).
+    """
+
+    def __init__(self, kp, ki=0.0, kd=0.0, limit=1.0):
+        self.kp = kp
+        self.ki = ki
+        self.kd = kd
+        self.limit = limit
+        self.reset()
+
+    def reset(self):
+        self.integral = 0.0
+        self._previous_error = None
+
+    def update(self, error, dt, rate=None):
+        """rate: hatanın zamana göre türevi (bilinmiyorsa farktan bulunur)"""
+        if rate is None:
+            previous = self._previous_error
+            rate = (error - previous) / dt if previous is not None and dt > 0 else 0.0
+        self._previous_error = error
+        output = self.kp * error + self.ki * self.integral + self.kd * rate
+        if abs(output) < self.limit or output * error < 0:
+            self.integral += error * dt
+        return max(-self.limit, min(self.limit, output))
+
+
+class DepthHold:
+    """Derinliği hedefte tutar (düşey ekseni)"""
+
+    def __init__(self, target, pid=None):
+        self.target = max(0.0, target)
+        self.pid = pid or PID(1.0, 0.02, 2.0)
+
+    def update(self, state, dt):
+        error = self.target - state["derinlik"]
+        return {"düşey": self.pid.update(error, dt, rate=-state["düşey_hız"])}
+
+    def describe(self):
+        return f"derinlik {self.target:.1f} m"
+
+
+class HeadingHold:
+    """Yönü hedefte tutar (dönüş ekseni)"""
+
+    def __init__(self, target, pid=None):
+        self.target = target % 360
+        self.pid = pid or PID(0.06, 0.001, 0.04)
+
+    def update(self, state, dt):
+        error = wrap_degrees(self.target - state["yön"])
+        return {"dönüş": self.pid.update(error, dt, rate=-state["dönüş_hızı"])}
+
+    def describe(self):
+        return f"yön {self.target:.0f}°"
+
+
+class Turn(HeadingHold):
+    """Hedef yönü `rate` °/s ile `degrees` kadar döndürür, sonra son yönü tutar.
+
+    Dönüş boyunca biriken integral (hedefin gerisinde kalma) dönüş bitince
+    atılır; yoksa son yönde aşma yapar.
+    """
+
+    def __init__(self, start, degrees=360.0, rate=TURN_RATE, pid=None):
+        super().__init__(start, pid)
+        self.remaining = degrees
+        self.rate = rate if degrees >= 0 else -rate
+
+    def update(self, state, dt):
+        if self.remaining:
+            step = self.rate * dt
+            if abs(step) >= abs(self.remaining):
+                step = self.remaining
+            self.remaining -= step
+            self.target = (self.target + step) % 360
+            if not self.remaining:
+                self.pid.integral = 0.0
+        return super().update(state, dt)
+
+    def describe(self):
+        if self.remaining:
+            return f"dönüş {abs(self.remaining):.0f}° kaldı"
+        return super().describe()
+
+
+class Stabilize:
+    """Yatış ve yunuslamayı sıfırda tutar"""
+
+    def __init__(self, roll_pid=None, pitch_pid=None):
+        self.roll_pid = roll_pid or PID(0.05, 0.005, 0.02)
+        self.pitch_pid = pitch_pid or PID(0.05, 0.005, 0.02)
+
+    def update(self, state, dt):
+        return {"yatış": self.roll_pid.update(-state["yatış"], dt),
+                "yunuslama": self.pitch_pid.update(-state["yunuslama"], dt)}
+
+    def describe(self):
+        return "denge"
+
+
+class Autopilot:
+    """Otonom mod: kontrolcüleri sabit hızlı döngüde çalıştırıp motor ayarı üretir.
+
+    Döngü Tk'den bağımsız kendi iş parçacığındadır; arayüz takılsa da
+    ayarlar zamanında gider. Her turda `snapshot()` son tahmini verir
+    (`StateEstimator.state()` biçimi); etkin kontrolcülerin çıktıları
+    birleştirilip `motors` üzerinden tek "ayar" komutu olarak gönderilir
+    (gönderici bloklamaz, araç hızına göre son ayarı iletir). Tahmin
+    `max_age` saniyeden eskiyse ayarlar sıfırlanır ve `stale` sayılır.
+    """
+
+    def __init__(self, snapshot, motors, rate_hz=CONTROL_RATE, max_age=CONTROL_MAX_AGE):
+        self.snapshot = snapshot
+        self.motors = motors
+        self.max_age = max_age
+        self.loop = FixedRateLoop(self.step, rate_hz, name="otonom")
+        self.controllers = {}
+        self.setpoints = dict.fromkeys(CONTROL_AXES, 0.0)
+        self.state = None
+        self.stale = 0
+        self._lock = threading.Lock()
+
+    # --- Arayüz tarafı ----------------------------------------------------
+
+    @property
+    def engaged(self):
+        return self.loop.running
+
+    def _set(self, name, controller):
+        with self._lock:
+            self.controllers[name] = controller
+        self.loop.start()
+
+    def engage(self):
+        """Şimdiki derinlik ve yönü tut, dengeyi koru"""
+        state = self.snapshot()
+        self._set("derinlik", DepthHold(_finite(state["derinlik"])))
+        self._set("yön", HeadingHold(_finite(state["yön"])))
+        self._set("denge", Stabilize())
+
+    def hold_depth(self, target):
+        self._set("derinlik", DepthHold(target))
+
+    def dive(self, step=DIVE_STEP):
+        """Derinlik hedefini `step` metre değiştir (eksi: yüksel)"""
+        with self._lock:
+            current = self.controllers.get("derinlik")
+        base = current.target if current else _finite(self.snapshot()["derinlik"])
+        self.hold_depth(base + step)
+
+    def surface(self):
+        self.hold_depth(0.0)
+
+    def hold_heading(self, target):
+        self._set("yön", HeadingHold(target))
+
+    def turn(self, degrees=360.0):
+        with self._lock:
+            current = self.controllers.get("yön")
+        start = current.target if current else _finite(self.snapshot()["yön"])
+        self._set("yön", Turn(start, degrees))
+
+    def stabilize(self):
+        self._set("denge", Stabilize())
+
+    def disengage(self):
+        """Döngüyü durdur ve motorlara sıfır ayar gönder"""
+        self.loop.stop()
+        with self._lock:
+            self.controllers.clear()
+        self.setpoints = dict.fromkeys(CONTROL_AXES, 0.0)
+        self.motors.submit("ayar", "ayar", self.setpoints)
+
+    # --- Döngü tarafı -----------------------------------------------------
+
+    def step(self, now, dt):
+        state = self.snapshot()
+        self.state = state
+        with self._lock:
+            controllers = list(self.controllers.values())
+
+        setpoints = dict.fromkeys(CONTROL_AXES, 0.0)
+        if now - state["zaman"] <= self.max_age:
+            for controller in controllers:
+                setpoints.update(controller.update(state, dt))
+        else:
+            # Eski tahminle itme yapılmaz (NaN zaman da buraya düşer)
+            self.stale += 1
+        self.setpoints = setpoints
+        self.motors.submit("ayar", "ayar", {axis: round(value, 3)
+                                              for axis, value in setpoints.items()})
+
+    def describe(self):
+        with self._lock:
+            controllers = list(self.controllers.values())
+        return ", ".join(controller.describe() for controller in controllers)
+
+    def stats(self):
+        stats = self.loop.stats()
+        stats["stale"] = self.stale
+        stats["mode"] = self.describe()
+        return stats
+
+
+def _finite(value, default=0.0):
+    return value if math.isfinite(value) else default
+
+
+class SimulatedVehicle(LoopbackTransport):
+    """Kapalı çevrim denemeleri için basit araç modeli.
+
+    Motor aktarımı olarak komutları alır ve onaylar ("ayar", "hız", "yön",
+    "acil_dur"), `source()` ise aynı aracın sensörlerini (ivme, gyro, pusula,
+    manyetik, derinlik, basınç, konum) üreten kaynağı verir. Fizik kaynak
+    döngüsünde ilerler: dönüş hızı, düşey hız ve ileri hız birinci
+    derece, yatış/yunuslama az sönümlü ikinci derece (dalga bozucusu ile),
+    araç hafif pozitif yüzer.
+    """
+
+    name = "sim-araç"
+
+    # Tam ayarda hızlar ve zaman sabitleri
+    TURN_RATE = 40.0          # °/s
+    TURN_TAU = 0.5
+    VERTICAL_SPEED = 0.6      # m/s
+    VERTICAL_TAU = 1.0
+    BUOYANCY = -0.05          # m/s (yukarı)
+    FORWARD_SPEED = 1.0       # m/s
+    FORWARD_TAU = 2.0
+    TILT_FREQUENCY = 2.0      # rad/s
+    TILT_DAMPING = 0.15
+    TILT_AUTHORITY = 20.0     # ° (tam ayarda kalıcı açı)
+    WAVE = 3.0                # ° (dalga bozucusu genliği)
+
+    MANUAL = {"YUKARI": (1, 0), "AŞAĞI": (-1, 0), "SOL": (0, -1), "SAĞ": (0, 1),
+              "SOL-YUKARI": (1, -1), "SAĞ-YUKARI": (1, 1),
+              "SOL-AŞAĞI": (-1, -1), "SAĞ-AŞAĞI": (-1, 1), "DURDU": (0, 0)}
+
+    def __init__(self, depth=0.0, heading=0.0, lat=41.0082, lon=28.9784, seed=0,
+                 ack_delay=0.002):
+        super().__init__(ack_delay)
+        self.rng = random.Random(seed)
+        self.depth = depth
+        self.heading = heading
+        self.lat, self.lon = lat, lon
+        self.yaw_rate = self.vertical_speed = self.speed = self.accel = 0.0
+        self.roll = self.pitch = self.roll_rate = self.pitch_rate = 0.0
+        self.t = 0.0
+        self.throttle = 0.0
+        self.manual = (0, 0)
+        self.setpoints = dict.fromkeys(CONTROL_AXES, 0.0)
+
+    # --- Motor aktarımı ---------------------------------------------------
+
+    def send(self, data):
+        due = time.monotonic() + self.ack_delay
+        with self._cond:
+            for message in decode_messages(data):
+                self._apply(message.get("cmd"), message.get("value"))
+                self._acks.append((due, json.dumps({"ack": message["seq"]}).encode() + b"\n"))
+            self._cond.notify()
+
+    def _apply(self, command, value):
+        if command == "ayar" and isinstance(value, dict):
+            for axis in CONTROL_AXES:
+                self.setpoints[axis] = max(-1.0, min(1.0, float(value.get(axis, 0.0))))
+        elif command == "hız":
+            self.throttle = float(value) / 100
+        elif command == "yön":
+            self.manual = self.MANUAL.get(value, (0, 0))
+        elif command == "acil_dur":
+            self.setpoints = dict.fromkeys(CONTROL_AXES, 0.0)
+            self.manual = (0, 0)
+
+    # --- Fizik ------------------------------------------------------------
+
+    def advance(self, dt):
+        """Modeli dt saniye ilerlet"""
+        s = self.setpoints
+        forward = max(-1.0, min(1.0, s["ileri"] + self.manual[0] * self.throttle))
+        turn = max(-1.0, min(1.0, s["dönüş"] + self.manual[1] * self.throttle))
+
+        self.yaw_rate += (self.TURN_RATE * turn - self.yaw_rate) * dt / self.TURN_TAU
+        self.heading = (self.heading + self.yaw_rate * dt) % 360
+
+        target = self.VERTICAL_SPEED * s["düşey"] + self.BUOYANCY
+        self.vertical_speed += (target - self.vertical_speed) * dt / self.VERTICAL_TAU
+        self.depth = max(0.0, self.depth + self.vertical_speed * dt)
+
+        self.accel = (self.FORWARD_SPEED * forward - self.speed) / self.FORWARD_TAU
+        self.speed += self.accel * dt
+        heading = math.radians(self.heading)
+        meters = 6371000.0 * math.pi / 180
+        self.lat += self.speed * math.cos(heading) * dt / meters
+        self.lon += self.speed * math.sin(heading) * dt / (meters * math.cos(math.radians(self.lat)))
+
+        self.t += dt
+        w, z = self.TILT_FREQUENCY, self.TILT_DAMPING
+        for axis, phase in (("roll", 0.0), ("pitch", 1.3)):
+            angle, rate = getattr(self, axis), getattr(self, axis + "_rate")
+            command = s["yatış" if axis == "roll" else "yunuslama"] * self.TILT_AUTHORITY
+            wave = self.WAVE * math.sin(0.7 * self.t + phase)
+            rate += (w * w * (command + wave - angle) - 2 * z * w * rate) * dt
+            setattr(self, axis + "_rate", rate)
+            setattr(self, axis, angle + rate * dt)
+
+    def sample(self, with_location=False):
+        """Şimdiki durumdan sensör okumaları (hafif gürültülü)"""
+        noise = self.rng.gauss
+        roll, pitch = math.radians(self.roll), math.radians(self.pitch)
+        values = {
+            "basınç": 1013.25 + self.depth * 100.5 + noise(0, 0.5),
+            "derinlik": self.depth + noise(0, 0.02),
+            "sıcaklık": 18.0 - 0.1 * self.depth,
+            "nem": 40.0,
+            "ivme_x": -math.sin(pitch) + self.accel / 9.80665 + noise(0, 0.005),
+            "ivme_y": math.sin(roll) * math.cos(pitch) + noise(0, 0.005),
+            "ivme_z": math.cos(roll) * math.cos(pitch) + noise(0, 0.005),
+            "manyetik": 46.0 + noise(0, 0.2),
+            "gyro": self.yaw_rate + noise(0, 0.1),
+            "pusula": (self.heading + noise(0, 1.0)) % 360,
+            "batarya": 90.0,
+        }
+        if with_location:
+            values["lat"] = self.lat
+            values["lon"] = self.lon
+        return values
+
+    def source(self, rate_hz=100.0, location_interval=1.0):
+        return VehicleSource(self, rate_hz, location_interval)
+
+
+class VehicleSource(SensorSource):
+    """SimulatedVehicle'ın sensörleri: fiziği ilerletir, `rate_hz` örnek üretir"""
+
+    name = "sim-araç"
+
+    def __init__(self, vehicle, rate_hz=100.0, location_interval=1.0):
+        self.vehicle = vehicle
+        self.rate_hz = rate_hz
+        self.location_interval = location_interval
+
+    async def run(self, emit):
+        period = 1.0 / self.rate_hz
+        start = previous = time.monotonic()
+        next_location = start
+        k = 0
+        while True:
+            now = time.monotonic()
+            with self.vehicle._cond:
+                self.vehicle.advance(now - previous)
+                location = now >= next_location
+                values = self.vehicle.sample(with_location=location)
+            previous = now
+            if location:
+                next_location += self.location_interval
+            emit(values, now)
+            k += 1
+            await asyncio.sleep(max(0.0, start + k * period - time.monotonic()))
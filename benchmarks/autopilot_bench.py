@@ -0,0 +1,105 @@
+"""Otonom döngü: benzetilmiş araçla kapalı çevrim deneme ve zamanlama ölçümü.
+
+Araç modeli (autopilot.SimulatedVehicle) hem sensör kaynağı hem motor
+aktarımı olarak arayüzsüz çekirdeğe bağlanır; otonom döngü tahminciden
+okuyup ayar gönderir. Senaryo: mevcut durumu tut, `--depth` metreye in,
+`--turn` derece dön. Her aşamanın sonundaki derinlik/yön hatası, döngü
+sapması (vadeden gecikme) ve taşma sayısı yazılır. `--stall` arayüz
+takılmalarını taklit eder: ayrı bir iş parçacığı her saniye bu kadar
+milisaniye Python işi yapar (GIL'i tutar). Hedefler tutmazsa çıkış kodu 1.
+
+    python benchmarks/autopilot_bench.py
+    python benchmarks/autopilot_bench.py --rate 100 --stall 300
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO)
+
+from autopilot import Autopilot, SimulatedVehicle, wrap_degrees  # noqa: E402
+from engine import TelemetryEngine  # noqa: E402
+
+# Başarı ölçütleri
+MAX_DEPTH_ERROR = 0.3      # m
+MAX_HEADING_ERROR = 5.0    # °
+MAX_OVERRUN_SHARE = 0.01   # taşan tur oranı
+
+
+def busy(stop, burst_ms):
+    """Her saniye burst_ms boyunca saf Python işi (takılan arayüz yerine)"""
+    while not stop.wait(1.0):
+        end = time.perf_counter() + burst_ms / 1000
+        while time.perf_counter() < end:
+            sum(range(1000))
+
+
+def settle(vehicle, seconds):
+    time.sleep(seconds)
+    return vehicle.depth, vehicle.heading
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Otonom döngü kapalı çevrim denemesi")
+    parser.add_argument("--rate", type=float, default=50.0, help="Kontrol hızı (Hz)")
+    parser.add_argument("--depth", type=float, default=5.0, help="İnilecek derinlik (m)")
+    parser.add_argument("--turn", type=float, default=90.0, help="Dönüş açısı (°)")
+    parser.add_argument("--phase", type=float, default=20.0, help="Aşama süresi (s)")
+    parser.add_argument("--stall", type=float, default=0.0, metavar="MS",
+                        help="Saniyede bir bu kadar ms GIL tutan iş")
+    args = parser.parse_args()
+
+    vehicle = SimulatedVehicle(depth=1.0, heading=30.0)
+    engine = TelemetryEngine([vehicle.source()], motor_transport=vehicle)
+    engine.start()
+    autopilot = Autopilot(engine.snapshot, engine.motors, rate_hz=args.rate)
+    stop = threading.Event()
+    if args.stall:
+        threading.Thread(target=busy, args=(stop, args.stall), daemon=True).start()
+
+    time.sleep(2.0)   # tahminci ısınsın
+    autopilot.engage()
+    start_depth, start_heading = vehicle.depth, vehicle.heading
+    hold_depth = autopilot.controllers["derinlik"].target
+    hold_heading = autopilot.controllers["yön"].target
+    depth, heading = settle(vehicle, args.phase / 2)
+    rows = [("tut", depth - hold_depth, wrap_degrees(heading - hold_heading))]
+
+    autopilot.hold_depth(args.depth)
+    depth, heading = settle(vehicle, args.phase)
+    rows.append((f"{args.depth:g} m'ye in", depth - args.depth,
+                 wrap_degrees(heading - hold_heading)))
+
+    autopilot.turn(args.turn)
+    depth, heading = settle(vehicle, args.phase + abs(args.turn) / 30.0)
+    rows.append((f"{args.turn:g}° dön", depth - args.depth,
+                 wrap_degrees(heading - hold_heading - args.turn)))
+
+    stats = autopilot.stats()
+    autopilot.disengage()
+    stop.set()
+    engine.stop()
+
+    print(f"başlangıç: derinlik {start_depth:.2f} m, yön {start_heading:.1f}°; "
+          f"{args.rate:g} Hz, takılma {args.stall:g} ms/s")
+    failed = False
+    for name, depth_error, heading_error in rows:
+        ok = abs(depth_error) <= MAX_DEPTH_ERROR and abs(heading_error) <= MAX_HEADING_ERROR
+        failed = failed or not ok
+        print(f"  {name:14s} derinlik hatası {depth_error:+6.2f} m  yön hatası "
+              f"{heading_error:+6.1f}°  {'TAMAM' if ok else 'BAŞARISIZ'}")
+    overrun_share = stats["overruns"] / max(stats["ticks"], 1)
+    print(f"  tur {stats['ticks']}, taşma {stats['overruns']} (%{overrun_share * 100:.2f}), "
+          f"atlanan {stats['skipped']}, eski veri {stats['stale']}, hata {stats['errors']}")
+    print(f"  sapma p50 {stats['jitter_p50'] * 1000:.2f} ms  p99 {stats['jitter_p99'] * 1000:.2f} ms"
+          f"  en büyük {stats['jitter_max'] * 1000:.2f} ms; tur süresi p99 "
+          f"{stats['work_p99'] * 1000:.2f} ms")
+    failed = failed or overrun_share > MAX_OVERRUN_SHARE or stats["errors"] > 0
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,359 @@
+"""Arayüzün sıcak yolları için tekrarlanabilir ölçüm takımı.
+
+Her senaryo (kamera çözünürlüğü x telemetri hızı) ayrı bir süreçte, gerçek
+`SystemControlInterface` ile sahte kamera ve sentetik telemetri kullanılarak
+çalıştırılır. Ekran yoksa Xvfb başlatılır. Sonuçlar JSON'a yazılır;
+`compare` kaydedilmiş bir temel ölçümle kıyaslayıp gerilemeleri işaretler.
+
+    python benchmarks/console_bench.py run --out sonuc.json
+    python benchmarks/console_bench.py run --cameras 640x480 --rates 1000 --duration 5
+    python benchmarks/console_bench.py compare temel.json sonuc.json
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO)
+
+DEFAULT_CAMERAS = ("640x480", "1280x720", "1920x1080")
+DEFAULT_RATES = (10, 125, 1000)
+XVFB_SCREEN = "1600x1000x24"
+
+# Ölçüm adı -> (daha iyi yön, gürültü tabanı): tabanın altındaki farklar gerileme sayılmaz
+METRICS = {
+    "graph_p50_ms": ("lower", 0.1),
+    "graph_p99_ms": ("lower", 0.5),
+    "camera_frame_p50_ms": ("lower", 0.1),
+    "camera_frame_p99_ms": ("lower", 0.5),
+    "map_update_p50_ms": ("lower", 0.1),
+    "map_update_p99_ms": ("lower", 0.5),
+    "ui_event_p50_ms": ("lower", 0.2),
+    "ui_event_p99_ms": ("lower", 1.0),
+    "tk_lag_p99_ms": ("lower", 1.0),
+    "camera_display_fps": ("higher", 0.5),
+    "telemetry_rate": ("higher", 1.0),
+    "cpu_percent": ("lower", 2.0),
+    "rss_mb": ("lower", 5.0),
+    "startup_ms": ("lower", 20.0),
+}
+
+
+def parse_size(text):
+    width, _, height = text.lower().partition("x")
+    return int(width), int(height)
+
+
+def rss_mb():
+    """Şu anki yerleşik bellek (Linux /proc), yoksa en yüksek değer"""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+# --- Tek senaryo (alt süreç) ---------------------------------------------------
+
+def run_scenario(width, height, rate, duration, warmup, camera_fps, seed):
+    import tkinter as tk
+
+    from metrics import LatencyHistogram
+    from perf import REGISTRY as PERF, STAGE_BUCKETS
+    from synthetic import SyntheticTelemetrySource, camera_factory
+    from sualtı_interface import SystemControlInterface
+
+    # Kayıt, karo veritabanı vb. geçici klasöre yazılsın (ölçüm ağa çıkmaz)
+    workdir = tempfile.mkdtemp(prefix="oruc_bench_")
+    os.chdir(workdir)
+
+    root = tk.Tk()
+    app = SystemControlInterface(
+        root, sources=[SyntheticTelemetrySource(rate, seed=seed)], map_offline=True,
+        camera_factory=camera_factory(width, height, camera_fps, seed=seed))
+
+    # Arayüz olay gecikmesi: sona eklenen sanal olayın işlenme süresi
+    ui_event = LatencyHistogram(STAGE_BUCKETS)
+    pending = []
+
+    def on_ping(event):
+        if pending:
+            ui_event.record(time.perf_counter() - pending.pop(0))
+
+    def ping():
+        pending.append(time.perf_counter())
+        root.event_generate("<<BenchPing>>", when="tail")
+        root.after(50, ping)
+
+    root.bind("<<BenchPing>>", on_ping)
+    root.after(50, ping)
+
+    marks = {}
+
+    def begin():
+        PERF.reset()
+        ui_event.reset()
+        marks["start"] = (time.perf_counter(), time.process_time(),
+                          app.displayed_frames, app.engine.sensor_hub.received)
+        root.after(int(duration * 1000), root.quit)
+
+    root.after(int(warmup * 1000), begin)
+    root.mainloop()
+
+    wall0, cpu0, frames0, samples0 = marks["start"]
+    elapsed = time.perf_counter() - wall0
+    cpu = time.process_time() - cpu0
+    stages = PERF.summary()
+
+    def stage(name, key):
+        row = stages.get(name)
+        return row[key] * 1000 if row and row["count"] else None
+
+    result = {
+        "graph_p50_ms": stage("grafik", "p50"),
+        "graph_p99_ms": stage("grafik", "p99"),
+        "camera_frame_p50_ms": stage("kamera", "p50"),
+        "camera_frame_p99_ms": stage("kamera", "p99"),
+        "map_update_p50_ms": stage("harita", "p50"),
+        "map_update_p99_ms": stage("harita", "p99"),
+        "map_updates": stages.get("harita", {}).get("count", 0),
+        "ui_event_p50_ms": ui_event.percentile(50) * 1000,
+        "ui_event_p99_ms": ui_event.percentile(99) * 1000,
+        "tk_lag_p99_ms": stage("tk_gecikme", "p99"),
+        "camera_display_fps": (app.displayed_frames - frames0) / elapsed,
+        "camera_dropped": app.capture.dropped if app.capture else None,
+        "telemetry_rate": (app.engine.sensor_hub.received - samples0) / elapsed,
+        "cpu_percent": 100.0 * cpu / elapsed,
+        "rss_mb": rss_mb(),
+        "startup_ms": PERF.gauges.get("startup_seconds", 0.0) * 1000,
+        "seconds": elapsed,
+    }
+    app.on_closing()
+    shutil.rmtree(workdir, ignore_errors=True)
+    return result
+
+
+# --- Ekran ---------------------------------------------------------------------
+
+def start_xvfb():
+    """Boş bir ekran numarasında Xvfb başlat: (süreç, DISPLAY)"""
+    xvfb = shutil.which("Xvfb")
+    if xvfb is None:
+        raise SystemExit("Ekran yok ve Xvfb bulunamadı (apt install xvfb).")
+    number = 99
+    while os.path.exists(f"/tmp/.X{number}-lock"):
+        number += 1
+    display = f":{number}"
+    process = subprocess.Popen([xvfb, display, "-screen", "0", XVFB_SCREEN, "-nolisten", "tcp"],
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    socket_path = f"/tmp/.X11-unix/X{number}"
+    deadline = time.monotonic() + 10.0
+    while not os.path.exists(socket_path):
+        if process.poll() is not None or time.monotonic() > deadline:
+            process.kill()
+            raise SystemExit("Xvfb başlatılamadı.")
+        time.sleep(0.05)
+    return process, display
+
+
+# --- Takım -----------------------------------------------------------------------
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO,
+                              capture_output=True, text=True, timeout=5).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def run_suite(args):
+    env = dict(os.environ)
+    xvfb = None
+    if args.xvfb or not env.get("DISPLAY"):
+        xvfb, env["DISPLAY"] = start_xvfb()
+
+    report = {
+        "meta": {
+            "date": datetime.now().isoformat(timespec="seconds"),
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "duration": args.duration,
+            "warmup": args.warmup,
+            "camera_fps": args.camera_fps,
+            "seed": args.seed,
+        },
+        "scenarios": {},
+    }
+    try:
+        for camera in args.cameras.split(","):
+            for rate in (float(r) for r in args.rates.split(",")):
+                name = f"{camera}@{rate:g}Hz"
+                with tempfile.NamedTemporaryFile(suffix=".json", delete=False) as f:
+                    result_path = f.name
+                command = [sys.executable, os.path.abspath(__file__), "_scenario",
+                           "--camera", camera, "--rate", str(rate),
+                           "--duration", str(args.duration), "--warmup", str(args.warmup),
+                           "--camera-fps", str(args.camera_fps), "--seed", str(args.seed),
+                           "--result", result_path]
+                print(f"{name} ...", flush=True)
+                completed = subprocess.run(command, env=env, stdout=subprocess.DEVNULL,
+                                           timeout=args.duration + args.warmup + 120)
+                try:
+                    with open(result_path, encoding="utf-8") as f:
+                        result = json.load(f)
+                except (OSError, ValueError):
+                    result = {"error": f"çıkış kodu {completed.returncode}"}
+                finally:
+                    os.unlink(result_path)
+                report["scenarios"][name] = result
+                print("   " + format_result(result), flush=True)
+    finally:
+        if xvfb:
+            xvfb.terminate()
+            xvfb.wait()
+
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print(f"Sonuçlar: {args.out}")
+    if args.compare:
+        return compare_files(args.compare, args.out, args.threshold)
+    return 0
+
+
+def format_result(result):
+    if "error" in result:
+        return "HATA: " + result["error"]
+
+    def ms(key):
+        value = result.get(key)
+        return "—" if value is None else f"{value:.2f}"
+
+    return (f"grafik {ms('graph_p50_ms')}/{ms('graph_p99_ms')} ms  "
+            f"kamera {result['camera_display_fps']:.1f} fps ({ms('camera_frame_p50_ms')} ms)  "
+            f"harita {ms('map_update_p50_ms')} ms  olay p99 {ms('ui_event_p99_ms')} ms  "
+            f"telemetri {result['telemetry_rate']:.0f} Hz  "
+            f"CPU %{result['cpu_percent']:.0f}  RSS {result['rss_mb']:.0f} MB")
+
+
+# --- Kıyaslama -------------------------------------------------------------------
+
+def compare(baseline, current, threshold=0.10):
+    """Gerileme listesi: (senaryo, ölçüm, temel, şimdiki, oransal değişim).
+
+    Temelde ölçülüp bu ölçümde olmayan her şey de gerilemedir: senaryo
+    eksikse ölçüm "senaryo", senaryo hata verdiyse "hata", bir ölçüm
+    kaydedilmediyse şimdiki değer None olarak döner (değişim None).
+    """
+    regressions = []
+    for name, base in baseline["scenarios"].items():
+        if "error" in base:
+            continue
+        result = current["scenarios"].get(name)
+        if result is None:
+            regressions.append((name, "senaryo", None, None, None))
+            continue
+        if "error" in result:
+            regressions.append((name, "hata", None, result["error"], None))
+            continue
+        for metric, (better, floor) in METRICS.items():
+            old, new = base.get(metric), result.get(metric)
+            if old is None:
+                continue
+            if new is None:
+                regressions.append((name, metric, old, None, None))
+                continue
+            worse = new - old if better == "lower" else old - new
+            if worse <= floor:
+                continue
+            change = worse / abs(old) if old else float("inf")
+            if change > threshold:
+                regressions.append((name, metric, old, new, change))
+    return regressions
+
+
+def compare_files(baseline_path, current_path, threshold):
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = json.load(f)
+    with open(current_path, encoding="utf-8") as f:
+        current = json.load(f)
+    regressions = compare(baseline, current, threshold)
+    if not regressions:
+        print(f"Gerileme yok (eşik %{threshold * 100:.0f}).")
+        return 0
+    print(f"{len(regressions)} gerileme (eşik %{threshold * 100:.0f}):")
+    for name, metric, old, new, change in regressions:
+        if metric == "senaryo":
+            print(f"  {name:22s} bu ölçümde yok")
+        elif metric == "hata":
+            print(f"  {name:22s} HATA: {new}")
+        elif new is None:
+            print(f"  {name:22s} {metric:22s} {old:10.2f} -> ölçülmedi")
+        else:
+            print(f"  {name:22s} {metric:22s} {old:10.2f} -> {new:10.2f}  (%{change * 100:+.0f})")
+    return 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Arayüz sıcak yol ölçümleri")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run = sub.add_parser("run", help="Senaryoları çalıştır ve JSON'a yaz")
+    run.add_argument("--out", default="benchmark.json")
+    run.add_argument("--cameras", default=",".join(DEFAULT_CAMERAS),
+                     help="Virgülle ayrılmış çözünürlükler (GxY)")
+    run.add_argument("--rates", default=",".join(str(r) for r in DEFAULT_RATES),
+                     help="Virgülle ayrılmış telemetri hızları (Hz)")
+    run.add_argument("--duration", type=float, default=10.0, help="Ölçüm süresi (s)")
+    run.add_argument("--warmup", type=float, default=3.0, help="Isınma süresi (s)")
+    run.add_argument("--camera-fps", type=float, default=30.0)
+    run.add_argument("--seed", type=int, default=0)
+    run.add_argument("--xvfb", action="store_true",
+                     help="DISPLAY tanımlı olsa da Xvfb içinde çalıştır")
+    run.add_argument("--compare", metavar="TEMEL", help="Bitince bu temel ile kıyasla")
+    run.add_argument("--threshold", type=float, default=0.10,
+                     help="Gerileme sayılacak oransal kötüleşme (0.10 = %%10)")
+
+    cmp_ = sub.add_parser("compare", help="İki sonuç dosyasını kıyasla")
+    cmp_.add_argument("baseline")
+    cmp_.add_argument("current")
+    cmp_.add_argument("--threshold", type=float, default=0.10)
+
+    scenario = sub.add_parser("_scenario")
+    scenario.add_argument("--camera", required=True)
+    scenario.add_argument("--rate", type=float, required=True)
+    scenario.add_argument("--duration", type=float, required=True)
+    scenario.add_argument("--warmup", type=float, required=True)
+    scenario.add_argument("--camera-fps", type=float, required=True)
+    scenario.add_argument("--seed", type=int, required=True)
+    scenario.add_argument("--result", required=True)
+
+    args = parser.parse_args()
+    if args.command == "run":
+        return run_suite(args)
+    if args.command == "compare":
+        return compare_files(args.baseline, args.current, args.threshold)
+
+    width, height = parse_size(args.camera)
+    result = run_scenario(width, height, args.rate, args.duration, args.warmup,
+                          args.camera_fps, args.seed)
+    with open(args.result, "w", encoding="utf-8") as f:
+        json.dump(result, f)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,222 @@
+"""Durum tahmincisi: hız ölçümü ve kayıttan doğruluk testi.
+
+`speed`: farklı toplu örnek boyutlarında güncelleme süresi ve 200 Hz IMU
+akışında (20 ms'lik topluluklar) bir çekirdeğin ne kadarının harcandığı.
+
+`accuracy`: bilinen bir yörüngeden (tırmık deseni, dönüşler, dalış,
+manyetik bozulma, 10 s'de bir gürültülü konum düzeltmesi) gürültülü,
+kaymalı sensör verisi üretilir, gerçek telemetri kaydı biçiminde diske
+yazılır, geri okunup canlıdaki gibi 20 ms'lik topluluklarla tahminciye
+verilir. Yön, derinlik ve konum hataları eşiklerin altında değilse çıkış
+kodu 1 olur. Konum hatası "son düzeltmede bekle" yöntemiyle kıyaslanır.
+
+    python benchmarks/estimator_bench.py speed
+    python benchmarks/estimator_bench.py accuracy --seed 3
+"""
+import argparse
+import math
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO)
+
+from state_estimator import GRAVITY, StateEstimator, wrap_angle  # noqa: E402
+from telemetry import TELEMETRY_CHANNELS  # noqa: E402
+from telemetry_log import TelemetryLogReader, TelemetryLogWriter  # noqa: E402
+
+IMU_HZ = 200.0
+BATCH_SECONDS = 0.02
+
+# Doğruluk eşikleri
+MAX_HEADING_RMS_DEG = 3.0
+MAX_DEPTH_RMS_M = 0.15
+MAX_POSITION_RATIO = 0.6  # tahmin RMS / son-düzeltmede-bekle RMS
+
+
+def trajectory(duration=600.0, rate=IMU_HZ):
+    """Gerçek yörünge: tırmık deseni (60 s düz, 20 s 180° dönüş), 1 m/s, dalış"""
+    t = np.arange(0.0, duration, 1.0 / rate)
+    dt = 1.0 / rate
+    leg, turn = 60.0, 20.0
+    phase = t % (leg + turn)
+    turn_index = (t // (leg + turn)).astype(int)
+    direction = np.where(turn_index % 2 == 0, 1.0, -1.0)
+    yaw_rate = np.where(phase >= leg, direction * math.pi / turn, 0.0)     # rad/s
+    heading = np.radians(30.0) + np.cumsum(yaw_rate) * dt
+    speed = np.minimum(t / 10.0, 1.0) * (1.0 + 0.1 * np.sin(2 * math.pi * t / 45.0))
+    forward_accel = np.gradient(speed, dt)
+    right_accel = speed * yaw_rate
+    north = np.cumsum(speed * np.cos(heading)) * dt
+    east = np.cumsum(speed * np.sin(heading)) * dt
+    depth = 10.0 * (1 - np.exp(-t / 60.0)) + 1.5 * np.sin(2 * math.pi * t / 120.0)
+    up_accel = -np.gradient(np.gradient(depth, dt), dt)
+    roll = np.radians(3.0) * np.sin(0.2 * t)
+    return {"t": t, "heading": heading, "yaw_rate": yaw_rate, "north": north, "east": east,
+            "depth": depth, "forward": forward_accel, "right": right_accel, "up": up_accel,
+            "roll": roll}
+
+
+def sensors(truth, seed=0, origin=(41.0, 29.0), fix_interval=10.0, fix_noise=2.0,
+            disturbance=(200.0, 215.0)):
+    """Gerçek yörüngeden kanal blokları (hub gibi: yavaş kanallar son değerle dolar)"""
+    rng = np.random.default_rng(seed)
+    t = truth["t"]
+    n = len(t)
+    cr, sr = np.cos(truth["roll"]), np.sin(truth["roll"])
+    # Gövde ivmesi (g): yerçekimi + doğrusal ivme yatış açısıyla döndürülmüş
+    ax = truth["forward"] / GRAVITY
+    ay = sr + (cr * truth["right"] + sr * truth["up"]) / GRAVITY
+    az = cr + (-sr * truth["right"] + cr * truth["up"]) / GRAVITY
+    accel = np.column_stack((ax, ay, az)) + 0.003 + 0.01 * rng.standard_normal((n, 3))
+    gyro = np.degrees(truth["yaw_rate"]) + 0.3 + 0.2 * rng.standard_normal(n)
+
+    def held(values, hz):
+        """hz hızındaki ölçüm, IMU hızında son değerle tutulur"""
+        step = max(1, int(round(IMU_HZ / hz)))
+        index = (np.arange(n) // step) * step
+        return values[index]
+
+    compass = np.degrees(truth["heading"]) + 2.0 * rng.standard_normal(n)
+    field = 46.0 + 0.3 * rng.standard_normal(n)
+    bad = (t >= disturbance[0]) & (t < disturbance[1])
+    compass[bad] += 40.0
+    field[bad] += 25.0
+    compass = held(compass % 360, 20.0)
+    field = held(field, 20.0)
+    depth = held(truth["depth"] + 0.05 * rng.standard_normal(n), 10.0)
+
+    meters = GRAVITY * 0 + 6371000.0 * math.pi / 180
+    fix_north = truth["north"] + fix_noise * rng.standard_normal(n)
+    fix_east = truth["east"] + fix_noise * rng.standard_normal(n)
+    lat = held(origin[0] + fix_north / meters, 1.0 / fix_interval)
+    lon = held(origin[1] + fix_east / (meters * math.cos(math.radians(origin[0]))),
+               1.0 / fix_interval)
+
+    columns = {
+        "basınç": 1013.25 + truth["depth"] * 98.1, "derinlik": depth,
+        "sıcaklık": np.full(n, 18.0), "nem": np.full(n, 40.0),
+        "ivme_x": accel[:, 0], "ivme_y": accel[:, 1], "ivme_z": accel[:, 2],
+        "manyetik": field, "gyro": gyro, "pusula": compass,
+        "lat": lat, "lon": lon, "batarya": np.full(n, 90.0),
+    }
+    return np.column_stack([columns[name] for name in TELEMETRY_CHANNELS])
+
+
+def run_estimator(estimator, times, block, batch=int(IMU_HZ * BATCH_SECONDS)):
+    """Kayıttaki örnekleri canlıdaki gibi topluluklarla ver; tüm tahmin dizileri"""
+    outputs = []
+    for start in range(0, len(times), batch):
+        outputs.append(estimator.update(times[start:start + batch], block[start:start + batch]))
+    return {key: np.concatenate([o[key] for o in outputs])
+            for key in ("north", "east", "heading", "depth")}
+
+
+def accuracy(args):
+    truth = trajectory(args.duration)
+    block = sensors(truth, seed=args.seed)
+
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "dogruluk.otl")
+        writer = TelemetryLogWriter(path, TELEMETRY_CHANNELS)
+        for start in range(0, len(block), 4096):
+            writer.extend(truth["t"][start:start + 4096], block[start:start + 4096])
+        writer.close()
+        reader = TelemetryLogReader(path)
+        records = reader.records
+        times = np.array(records["t"])
+        replayed = np.column_stack([records[name] for name in TELEMETRY_CHANNELS])
+        del records, reader
+
+    estimator = StateEstimator(TELEMETRY_CHANNELS)
+    started = time.perf_counter()
+    estimate = run_estimator(estimator, times, replayed)
+    elapsed = time.perf_counter() - started
+
+    # Yerel düzlem ilk düzeltmeye göre: gerçek yörüngeyi de ona taşı
+    lat0, lon0 = estimator.origin
+    first_fix = np.flatnonzero(np.isfinite(replayed[:, TELEMETRY_CHANNELS.index("lat")]))[0]
+    fix_n, fix_e = estimator._to_local(replayed[first_fix, TELEMETRY_CHANNELS.index("lat")],
+                                       replayed[first_fix, TELEMETRY_CHANNELS.index("lon")])
+    offset = np.array([truth["north"][first_fix] - fix_n, truth["east"][first_fix] - fix_e])
+
+    settle = times >= 10.0
+    heading_error = np.degrees(wrap_angle(estimate["heading"] - truth["heading"]))[settle]
+    depth_error = (estimate["depth"] - truth["depth"])[settle]
+    position_error = np.hypot(estimate["north"] + offset[0] - truth["north"],
+                              estimate["east"] + offset[1] - truth["east"])[settle]
+    fixes_local = estimator._to_local(replayed[:, TELEMETRY_CHANNELS.index("lat")],
+                                      replayed[:, TELEMETRY_CHANNELS.index("lon")]) + offset
+    hold_error = np.hypot(fixes_local[:, 0] - truth["north"],
+                          fixes_local[:, 1] - truth["east"])[settle]
+
+    def rms(values):
+        return float(np.sqrt(np.mean(np.square(values))))
+
+    heading_rms = rms(heading_error)
+    depth_rms = rms(depth_error)
+    position_rms, hold_rms = rms(position_error), rms(hold_error)
+    rows = [
+        ("yön RMS (°)", heading_rms, MAX_HEADING_RMS_DEG, heading_rms <= MAX_HEADING_RMS_DEG),
+        ("derinlik RMS (m)", depth_rms, MAX_DEPTH_RMS_M, depth_rms <= MAX_DEPTH_RMS_M),
+        ("konum RMS (m)", position_rms, hold_rms * MAX_POSITION_RATIO,
+         position_rms <= hold_rms * MAX_POSITION_RATIO),
+    ]
+    print(f"{len(times)} örnek ({args.duration:.0f} s, {IMU_HZ:.0f} Hz), "
+          f"tahmin {elapsed * 1000:.0f} ms, reddedilen pusula: {estimator.rejected_compass}")
+    print(f"  son düzeltmede bekleme RMS: {hold_rms:.2f} m, "
+          f"en büyük yön hatası {np.abs(heading_error).max():.1f}°")
+    failed = False
+    for name, value, limit, ok in rows:
+        print(f"  {name:18s} {value:7.3f}  (sınır {limit:.3f})  {'TAMAM' if ok else 'BAŞARISIZ'}")
+        failed = failed or not ok
+    return 1 if failed else 0
+
+
+def speed(args):
+    truth = trajectory(60.0)
+    block = sensors(truth)
+    times = truth["t"]
+    print(f"{'topluluk':>9} {'µs/güncelleme':>14} {'örnek/s':>12}")
+    for batch in (1, 4, 20, 200, 2000):
+        estimator = StateEstimator(TELEMETRY_CHANNELS)
+        count = 0
+        started = time.perf_counter()
+        deadline = started + args.seconds
+        start = 0
+        while time.perf_counter() < deadline:
+            if start + batch > len(times):
+                start = 0
+                estimator.reset()
+            estimator.update(times[start:start + batch], block[start:start + batch])
+            start += batch
+            count += 1
+        elapsed = time.perf_counter() - started
+        per_update = elapsed / count
+        print(f"{batch:9d} {per_update * 1e6:14.1f} {batch / per_update:12.0f}")
+        if batch == int(IMU_HZ * BATCH_SECONDS):
+            live_share = per_update / BATCH_SECONDS
+    print(f"200 Hz IMU, {BATCH_SECONDS * 1000:.0f} ms topluluk: bir çekirdeğin "
+          f"%{live_share * 100:.2f}'i")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Durum tahmincisi ölçümleri")
+    sub = parser.add_subparsers(dest="command", required=True)
+    speed_parser = sub.add_parser("speed", help="Güncelleme süresi ve çekirdek payı")
+    speed_parser.add_argument("--seconds", type=float, default=1.0,
+                              help="Her topluluk boyutu için ölçüm süresi")
+    accuracy_parser = sub.add_parser("accuracy", help="Kayıttan doğruluk testi")
+    accuracy_parser.add_argument("--duration", type=float, default=600.0)
+    accuracy_parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    return speed(args) if args.command == "speed" else accuracy(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
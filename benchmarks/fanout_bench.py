@@ -0,0 +1,167 @@
+"""Dağıtım sunucusu: 1, 4 ve 16 aboneyle yerel döngü (loopback) ölçümü.
+
+Her senaryo için sunucu ayrı bir süreçte sentetik telemetri (`--rate` Hz)
+ve sentetik kamera (`--size`, `--fps`) ile başlatılır; bu süreçte N
+izleyici bağlanıp `--seconds` boyunca okur. Abone başına örnek/s, video
+kare/s, MB/s ve örnek gecikmesi (sunucuda damgalanma -> istemcide
+çözülme; aynı makinede monotonic saat ortaktır) yazılır. `--slow` her
+senaryoya kasıtlı yavaş bir abone ekler: onun kuyruğu taşar ve atar,
+diğerlerinin hızı değişmemelidir.
+
+    python benchmarks/fanout_bench.py
+    python benchmarks/fanout_bench.py --subscribers 1 4 16 --slow --seconds 10
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import sys
+import time
+
+import numpy as np
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO)
+
+from fanout_server import (HELLO, ROLE_VIEWER, TELEMETRY, VIDEO,  # noqa: E402
+                           decode_telemetry, encode_json, read_frame)
+
+# Sunucu sürecinden yanıt için en uzun bekleme (s)
+SERVER_TIMEOUT = 10.0
+
+
+def serve(port_pipe, rate, width, height, fps):
+    """Sunucu süreci: sentetik kaynaklarla dağıtım sunucusu"""
+    sys.path.insert(0, os.path.join(REPO, "benchmarks"))
+    from camera import CameraCaptureThread
+    from engine import TelemetryEngine
+    from fanout_server import FanoutServer
+    from synthetic import SyntheticTelemetrySource, camera_factory
+
+    engine = TelemetryEngine([SyntheticTelemetrySource(rate)])
+    camera = CameraCaptureThread(0, capture_factory=camera_factory(width, height, fps))
+    server = FanoutServer(engine, "127.0.0.1", 0, camera=camera)
+    server.start()
+    port_pipe.send(server.port)
+    while port_pipe.recv() == "durum":
+        port_pipe.send(server.stats())
+    server.stop()
+
+
+def recv_from(pipe, process, timeout=SERVER_TIMEOUT):
+    """Sunucu sürecinin yanıtı; süreç ölürse ya da yanıt gelmezse hata"""
+    end = time.monotonic() + timeout
+    while not pipe.poll(0.1):
+        if not process.is_alive():
+            raise RuntimeError(f"Sunucu süreci kapandı (çıkış kodu {process.exitcode})")
+        if time.monotonic() > end:
+            process.terminate()
+            raise RuntimeError(f"Sunucu {timeout:.0f} s içinde yanıt vermedi")
+    return pipe.recv()
+
+
+async def subscriber(port, seconds, results, slow=False):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(encode_json(HELLO, {"role": ROLE_VIEWER, "name": "yavaş" if slow else None}))
+    kind, payload = await read_frame(reader)
+    channels = len(json.loads(payload)["channels"])
+    samples = frames = total = 0
+    latencies = []
+    end = time.monotonic() + seconds
+    while time.monotonic() < end:
+        try:
+            kind, payload = await asyncio.wait_for(read_frame(reader),
+                                                   max(end - time.monotonic(), 0.001))
+        except asyncio.TimeoutError:
+            break
+        total += len(payload) + 5
+        if kind == TELEMETRY:
+            times, _ = decode_telemetry(payload, channels)
+            samples += len(times)
+            if len(times):
+                latencies.append(time.monotonic() - float(times[-1]))
+        elif kind == VIDEO:
+            frames += 1
+        if slow:
+            await asyncio.sleep(0.2)
+    writer.close()
+    results.append({"slow": slow, "samples": samples / seconds, "frames": frames / seconds,
+                    "mbps": total / seconds / 1e6, "latencies": latencies})
+
+
+def scenario(count, args):
+    parent, child = multiprocessing.Pipe()
+    process = multiprocessing.Process(target=serve, args=(child, args.rate, args.size[0],
+                                                           args.size[1], args.fps))
+    process.start()
+    port = recv_from(parent, process)
+    time.sleep(1.0)
+
+    results = []
+
+    def server_stats():
+        parent.send("durum")
+        return recv_from(parent, process)
+
+    async def run_all():
+        clients = [subscriber(port, args.seconds, results) for _ in range(count)]
+        if args.slow:
+            clients.append(subscriber(port, args.seconds, results, slow=True))
+        tasks = [asyncio.ensure_future(client) for client in clients]
+        # Aboneler ayrılmadan sunucunun sayaçlarını al
+        await asyncio.sleep(args.seconds * 0.9)
+        stats = await asyncio.get_running_loop().run_in_executor(None, server_stats)
+        await asyncio.gather(*tasks)
+        return stats
+
+    server = asyncio.run(run_all())
+    parent.send("bitti")
+    process.join(5)
+
+    fast = [r for r in results if not r["slow"]]
+    latencies = np.concatenate([r["latencies"] for r in fast]) * 1000
+    row = {
+        "subscribers": count,
+        "samples_min": min(r["samples"] for r in fast),
+        "samples_mean": float(np.mean([r["samples"] for r in fast])),
+        "fps_mean": float(np.mean([r["frames"] for r in fast])),
+        "mbps_total": sum(r["mbps"] for r in fast),
+        "latency_p50": float(np.percentile(latencies, 50)) if len(latencies) else 0.0,
+        "latency_p99": float(np.percentile(latencies, 99)) if len(latencies) else 0.0,
+    }
+    slow = [r for r in results if r["slow"]]
+    if slow:
+        dropped = [c for c in server["clients"] if c["name"] == "yavaş"]
+        row["slow_samples"] = slow[0]["samples"]
+        row["slow_dropped"] = dropped[0]["dropped_telemetry"] if dropped else None
+    return row
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Dağıtım sunucusu ölçümü")
+    parser.add_argument("--subscribers", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--rate", type=float, default=1000.0, help="Telemetri hızı (Hz)")
+    parser.add_argument("--size", type=int, nargs=2, default=[1280, 720], metavar=("G", "Y"))
+    parser.add_argument("--fps", type=float, default=30.0, help="Kamera hızı")
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--slow", action="store_true", help="Kasıtlı yavaş abone ekle")
+    args = parser.parse_args()
+
+    print(f"telemetri {args.rate:g} Hz, kamera {args.size[0]}x{args.size[1]} @ {args.fps:g}, "
+          f"{args.seconds:g} s")
+    print(f"{'abone':>5} {'örnek/s min':>11} {'ort':>8} {'video/s':>8} {'MB/s':>7} "
+          f"{'gecikme p50':>11} {'p99':>7}" + ("  yavaş abone" if args.slow else ""))
+    for count in args.subscribers:
+        row = scenario(count, args)
+        line = (f"{row['subscribers']:5d} {row['samples_min']:11.0f} {row['samples_mean']:8.0f} "
+                f"{row['fps_mean']:8.1f} {row['mbps_total']:7.1f} "
+                f"{row['latency_p50']:9.1f} ms {row['latency_p99']:5.1f} ms")
+        if "slow_samples" in row:
+            line += f"  {row['slow_samples']:.0f} örnek/s, atılan {row['slow_dropped']}"
+        print(line, flush=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
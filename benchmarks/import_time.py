@@ -0,0 +1,91 @@
+"""Modül içe aktarma süresini ölç ve hedefin altında tut.
+
+Her modül ayrı, taze bir yorumlayıcıda `--runs` kez içe aktarılır ve en iyi
+süre alınır (dosya önbelleği ısındıktan sonraki değer). Bir modül hedefi
+aşarsa veya arayüzsüz çekirdek ağır bir arayüz kütüphanesi yüklerse çıkış
+kodu 1 olur; en pahalı alt modüller `-X importtime` ile listelenir.
+
+    python benchmarks/import_time.py
+    python benchmarks/import_time.py --runs 10 --top 15
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modül -> hedef süre (s)
+IMPORT_BUDGETS = {
+    "engine": 0.15,
+    "vehicle_sim": 0.15,
+    "sualtı_interface": 0.20,
+}
+
+# Arayüzsüz çalışan modüller (`engine.py --source vsim` simülatörü de yükler)
+HEADLESS_MODULES = ("engine", "vehicle_sim")
+# Arayüzsüz çekirdeğin yüklememesi gereken modüller
+HEADLESS_FORBIDDEN = ("tkinter", "cv2", "matplotlib", "PIL", "tkintermapview")
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "modules": sorted(sys.modules)}}))
+"""
+
+
+def measure(module, runs=5):
+    """(en iyi süre, yüklenen modüller)"""
+    best, modules = None, []
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, "-c", _PROBE.format(module=module)],
+                                cwd=REPO, capture_output=True, text=True, check=True).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        if best is None or result["seconds"] < best:
+            best, modules = result["seconds"], result["modules"]
+    return best, modules
+
+
+def top_imports(module, count=10):
+    """`-X importtime` çıktısından kendi süresi en yüksek alt modüller"""
+    stderr = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            cwd=REPO, capture_output=True, text=True).stderr
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((int(self_us), int(cumulative_us), name.strip()))
+    rows.sort(reverse=True)
+    return rows[:count]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="İçe aktarma süresi ölçümü")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=8,
+                        help="Her modül için listelenecek en pahalı alt modül sayısı")
+    args = parser.parse_args()
+
+    failed = False
+    for module, budget in IMPORT_BUDGETS.items():
+        seconds, modules = measure(module, args.runs)
+        over = seconds > budget
+        print(f"{module:20s} {seconds * 1000:7.1f} ms  (hedef {budget * 1000:.0f} ms)"
+              f"{'  AŞILDI' if over else ''}")
+        if module in HEADLESS_MODULES:
+            loaded = sorted({name.split(".")[0] for name in modules} & set(HEADLESS_FORBIDDEN))
+            if loaded:
+                print(f"  arayüzsüz çekirdek şunları yüklüyor: {', '.join(loaded)}")
+                failed = True
+        for self_us, cumulative_us, name in top_imports(module, args.top):
+            print(f"    {self_us / 1000:6.1f} ms  (toplam {cumulative_us / 1000:6.1f})  {name}")
+        failed = failed or over
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
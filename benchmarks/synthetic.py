@@ -0,0 +1,124 @@
+import asyncio
+import math
+import time
+
+import cv2
+import numpy as np
+
+from sensor_sources import SensorSource
+
+
+class SyntheticCamera:
+    """`cv2.VideoCapture` yerine geçen, tekrarlanabilir sahte kamera.
+
+    Kareler önceden (tohumlu gürültü + kayan desen) üretilir ve döngüyle
+    verilir; okuma `fps` hızına göre zaman çizelgesinde bekler. `read(image)`
+    gerçek kamera gibi verilen diziye yazar, böylece paylaşılan bellek yolu
+    da ölçülür.
+    """
+
+    def __init__(self, width=640, height=480, fps=30.0, frames=16, seed=0):
+        self.width = width
+        self.height = height
+        self.fps = fps
+        rng = np.random.default_rng(seed)
+        base = rng.integers(0, 256, (height, width, 3), dtype=np.uint8)
+        x = np.arange(width, dtype=np.int32)
+        self._frames = []
+        for i in range(frames):
+            ramp = ((x + i * width // frames) % width * 255 // width).astype(np.uint8)
+            frame = base.copy()
+            frame[:, :, 1] = ramp
+            self._frames.append(frame)
+        self._index = 0
+        self._next = None
+        self._open = True
+
+    def isOpened(self):
+        return self._open
+
+    def read(self, image=None):
+        now = time.perf_counter()
+        if self._next is None:
+            self._next = now
+        if self._next > now:
+            time.sleep(self._next - now)
+        self._next += 1.0 / self.fps
+        frame = self._frames[self._index % len(self._frames)]
+        self._index += 1
+        if image is not None and image.shape == frame.shape:
+            np.copyto(image, frame)
+            return True, image
+        return True, frame.copy()
+
+    def get(self, prop):
+        return {cv2.CAP_PROP_FRAME_WIDTH: self.width,
+                cv2.CAP_PROP_FRAME_HEIGHT: self.height,
+                cv2.CAP_PROP_FPS: self.fps}.get(prop, 0.0)
+
+    def set(self, prop, value):
+        return False
+
+    def release(self):
+        self._open = False
+
+
+def camera_factory(width, height, fps=30.0, seed=0):
+    """`SystemControlInterface(camera_factory=...)` için: kaynak numarasını yok sayar"""
+    return lambda source: SyntheticCamera(width, height, fps, seed=seed)
+
+
+class SyntheticTelemetrySource(SensorSource):
+    """Sabit hızda, tohumlu telemetri kaynağı (10 Hz .. birkaç kHz).
+
+    asyncio uykusu milisaniyenin altında güvenilir olmadığı için her
+    `tick` saniyede bir, o ana kadar vadesi gelmiş tüm örnekler kendi
+    zaman damgalarıyla birlikte verilir; ortalama hız tam `rate_hz` olur.
+    Konum `location_hz` hızında değişir (harita güncellemesini ölçmek için).
+    """
+
+    name = "sentetik"
+
+    def __init__(self, rate_hz=125.0, location_hz=10.0, seed=0, tick=0.005,
+                 start_lat=41.0082, start_lon=28.9784):
+        self.rate_hz = rate_hz
+        self.location_every = max(1, int(round(rate_hz / location_hz)))
+        self.tick = tick
+        self.rng = np.random.default_rng(seed)
+        self.lat = start_lat
+        self.lon = start_lon
+
+    def sample(self, i):
+        """i. örnek (zaman yerine sıra numarasından türetilir: tekrarlanabilir)"""
+        t = i / self.rate_hz
+        noise = self.rng.standard_normal(4)
+        values = {
+            "basınç": 1013.25 + 50 * math.sin(t * 0.5) + 2 * noise[0],
+            "derinlik": 50 + 30 * math.sin(t * 0.3) + noise[1],
+            "sıcaklık": 20 + 5 * math.sin(t * 0.2) + 0.5 * noise[2],
+            "nem": 40 + 10 * math.sin(t * 0.1) + 2 * noise[3],
+            "ivme_x": 0.1 * math.sin(t),
+            "ivme_y": 0.08 * math.sin(t * 1.2),
+            "ivme_z": 0.95 + 0.05 * math.sin(t * 0.5),
+            "manyetik": 50 + 5 * math.sin(t * 0.3),
+            "gyro": 0.05 * math.sin(t),
+            "pusula": 45 - 0.05 * math.cos(t),  # gyro'nun tümlevi
+            "batarya": max(10.0, 100 - t / 60),
+        }
+        if i % self.location_every == 0:
+            self.lat += 0.00002 * math.cos(t * 0.05)
+            self.lon += 0.00002 * math.sin(t * 0.05)
+            values["lat"] = self.lat
+            values["lon"] = self.lon
+        return values
+
+    async def run(self, emit):
+        start = time.monotonic()
+        i = 0
+        while True:
+            now = time.monotonic()
+            due = int((now - start) * self.rate_hz)
+            while i < due:
+                emit(self.sample(i), start + i / self.rate_hz)
+                i += 1
+            await asyncio.sleep(self.tick)
@@ -0,0 +1,115 @@
+"""Araç benzetimi (vehicle_sim): üretim hızı, tekrarlanabilirlik, canlı yük.
+
+`gen`: her örnek hızında 60 benzetim saniyesi üretilir; saniyedeki örnek
+ve gerçek zamanda bir çekirdeğin ne kadarının harcandığı yazılır. Aynı
+tohum rastgele parça boyutlarıyla iki kez üretilip birebir aynı olduğu,
+başka tohumla farklı olduğu denenir; kamera beklemesiz kare/s ölçülür.
+
+`live`: benzetim kaynağı arayüzsüz çekirdeğe bağlanır (hub -> halka ->
+geçmiş -> tahminci), `--seconds` boyunca gelen örnek/s ve süreç CPU
+payı yazılır. Tekrarlanabilirlik tutmazsa ya da canlı hız hedefin
+%95'ine ulaşmazsa çıkış kodu 1.
+
+    python benchmarks/vehicle_sim_bench.py gen
+    python benchmarks/vehicle_sim_bench.py live --rate 5000 --scenario karma
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO)
+
+from engine import TelemetryEngine  # noqa: E402
+from vehicle_sim import SCENARIOS, SimulatedCamera, VehicleSimSource, VehicleSimulator  # noqa: E402
+
+MIN_LIVE_SHARE = 0.95
+
+
+def generate(scenario, rate, seed, seconds, max_chunk):
+    sim = VehicleSimulator(scenario, rate, seed)
+    rng = np.random.default_rng(1234)
+    total = int(seconds * rate)
+    times, values = [], []
+    while sim.produced < total:
+        t, v = sim.take(min(total - sim.produced, int(rng.integers(1, max_chunk + 1))))
+        times.append(t)
+        values.append(v)
+    return np.concatenate(times), np.vstack(values)
+
+
+def gen(args):
+    failed = False
+    print(f"senaryo {args.scenario}, tohum {args.seed}, {args.seconds:g} benzetim saniyesi")
+    print(f"{'hız Hz':>8} {'örnek/s':>10} {'çekirdek %':>11}  tekrarlanabilir")
+    for rate in args.rates:
+        start = time.perf_counter()
+        times, values = generate(args.scenario, rate, args.seed, args.seconds, int(rate))
+        elapsed = time.perf_counter() - start
+        again = generate(args.scenario, rate, args.seed, args.seconds, 7)
+        other = generate(args.scenario, rate, args.seed + 1, args.seconds, int(rate))
+        same = (np.array_equal(times, again[0])
+                and np.array_equal(values, again[1], equal_nan=True))
+        differs = not np.array_equal(values, other[1], equal_nan=True)
+        failed = failed or not (same and differs)
+        produced = args.seconds * rate
+        print(f"{rate:8g} {produced / elapsed:10.0f} {100 * elapsed / args.seconds:11.2f}  "
+              f"{'evet' if same else 'HAYIR'}{'' if differs else ' (tohum etkisiz!)'}")
+
+    camera = SimulatedCamera(*args.size, seed=args.seed, realtime=False)
+    image = np.empty((args.size[1], args.size[0], 3), dtype=np.uint8)
+    start = time.perf_counter()
+    for _ in range(300):
+        camera.read(image)
+    print(f"kamera {args.size[0]}x{args.size[1]}: {300 / (time.perf_counter() - start):.0f} kare/s "
+          f"(beklemesiz)")
+    return 1 if failed else 0
+
+
+def live(args):
+    sim_source = VehicleSimSource(args.scenario, args.rate, args.seed)
+    engine = TelemetryEngine([sim_source])
+    engine.start()
+    time.sleep(1.0)
+    received = engine.sensor_hub.received
+    cpu, wall = time.process_time(), time.monotonic()
+    engine.run(args.seconds)
+    cpu, wall = time.process_time() - cpu, time.monotonic() - wall
+    received = engine.sensor_hub.received - received
+    status = engine.status()
+    engine.stop()
+
+    # Bağlantı kopukluğundaki örnekler hiç gelmez: hedef ona göre
+    produced = np.arange(int(wall * args.rate)) / args.rate + 1.0
+    expected = SCENARIOS[args.scenario].linked(produced).sum()
+    share = received / max(expected, 1)
+    print(f"senaryo {args.scenario}, {args.rate:g} Hz, {wall:.1f} s: {received / wall:.0f} örnek/s "
+          f"(beklenen %{share * 100:.1f}), süreç CPU %{100 * cpu / wall:.1f}")
+    estimate = status["estimate"]
+    print(f"  son tahmin: derinlik {estimate['derinlik']:.2f} m, yön {estimate['yön']:.1f}°; "
+          f"hatalar {status['errors'] or 'yok'}")
+    return 0 if share >= MIN_LIVE_SHARE else 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Araç benzetimi ölçümü")
+    parser.add_argument("mode", choices=("gen", "live"))
+    parser.add_argument("--scenario", default="karma", choices=sorted(SCENARIOS))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--rates", type=float, nargs="+", default=[125, 1000, 5000],
+                        help="gen: örnek hızları (Hz)")
+    parser.add_argument("--seconds", type=float,
+                        help="gen: benzetim süresi (60), live: ölçüm süresi (10)")
+    parser.add_argument("--size", type=int, nargs=2, default=[640, 480], metavar=("G", "Y"))
+    parser.add_argument("--rate", type=float, default=2000.0, help="live: örnek hızı (Hz)")
+    args = parser.parse_args()
+    if args.seconds is None:
+        args.seconds = 60.0 if args.mode == "gen" else 10.0
+    return gen(args) if args.mode == "gen" else live(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
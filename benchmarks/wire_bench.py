@@ -0,0 +1,133 @@
+"""İkili telemetri biçimi (wire_format): kodlama/çözme hızı, metinle kıyas.
+
+Sentetik telemetri (11 sensör + seyrek konum) önce araç tarafındaki gibi
+kodlanır, sonra konsoldaki gibi `--chunk` baytlık alım tamponlarıyla
+çözülüp SensorHub'a verilir. Metin yolu: satır başına JSON ->
+`parse_line` -> `emit`. İkili yol: çerçeve başına 1 ve `--per-frame`
+örnek; "çözme" yalnız WireDecoder, "hub'a" çözme + `emit_block`.
+
+    python benchmarks/wire_bench.py
+    python benchmarks/wire_bench.py --samples 200000 --chunk 1024
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO)
+sys.path.insert(0, os.path.join(REPO, "benchmarks"))
+
+from sensor_sources import SensorHub, WireReceiver, parse_line  # noqa: E402
+from synthetic import SyntheticTelemetrySource  # noqa: E402
+from telemetry import TELEMETRY_CHANNELS  # noqa: E402
+from wire_format import WireDecoder, WireEncoder  # noqa: E402
+
+
+def make_samples(count, rate):
+    """(zamanlar, (n, kanal) değer, sözlük listesi); gelmeyen kanal NaN"""
+    source = SyntheticTelemetrySource(rate)
+    dicts = [source.sample(i) for i in range(count)]
+    index = {name: i for i, name in enumerate(TELEMETRY_CHANNELS)}
+    block = np.full((count, len(TELEMETRY_CHANNELS)), np.nan, dtype=np.float32)
+    for row, values in zip(block, dicts):
+        for name, value in values.items():
+            row[index[name]] = value
+    return np.arange(count) / rate, block, dicts
+
+
+def chunks(data, size):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+def timed(function, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def text_case(times, dicts, chunk, repeat):
+    def encode():
+        return b"".join((json.dumps(values) + "\n").encode("utf-8") for values in dicts)
+
+    data = encode()
+    received = chunks(data, chunk)
+
+    def decode():
+        hub = SensorHub([])
+        buffer = b""
+        for part in received:
+            *lines, buffer = (buffer + part).split(b"\n")
+            for line in lines:
+                values = parse_line(line)
+                if values:
+                    hub.emit(values)
+        hub._flush()
+        return hub
+
+    assert decode().received == len(times)
+    return len(data), timed(encode, repeat), None, timed(decode, repeat)
+
+
+def wire_case(times, block, per_frame, chunk, repeat):
+    def encode():
+        return WireEncoder(TELEMETRY_CHANNELS).encode(times, block, samples_per_frame=per_frame)
+
+    data = encode()
+    received = chunks(data, chunk)
+
+    def decode_only():
+        decoder = WireDecoder()
+        for part in received:
+            decoder.feed(part)
+        return decoder
+
+    def decode_hub():
+        hub = SensorHub([])
+        receiver = WireReceiver(hub.emit, hub.emit_block)
+        for part in received:
+            receiver.feed(part)
+        hub._flush()
+        return hub
+
+    decoder = decode_only()
+    assert decoder.samples == len(times) and not decoder.crc_errors, decoder.stats()
+    assert decode_hub().received == len(times)
+    return len(data), timed(encode, repeat), timed(decode_only, repeat), timed(decode_hub, repeat)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="İkili telemetri biçimi ölçümü")
+    parser.add_argument("--samples", type=int, default=50000)
+    parser.add_argument("--rate", type=float, default=125.0, help="Örnek hızı (Hz)")
+    parser.add_argument("--per-frame", type=int, default=25, help="Toplu çerçevede örnek sayısı")
+    parser.add_argument("--chunk", type=int, default=4096, help="Alım tamponu (bayt)")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    times, block, dicts = make_samples(args.samples, args.rate)
+    n = len(times)
+    cases = [("metin (JSON satır)",) + text_case(times, dicts, args.chunk, args.repeat),
+             ("ikili, 1/çerçeve",) + wire_case(times, block, 1, args.chunk, args.repeat),
+             (f"ikili, {args.per_frame}/çerçeve",) + wire_case(times, block, args.per_frame,
+                                                               args.chunk, args.repeat)]
+
+    print(f"{n} örnek, {len(TELEMETRY_CHANNELS)} kanal, alım tamponu {args.chunk} B, "
+          f"en iyi {args.repeat} deneme")
+    print(f"{'yol':22s} {'B/örnek':>8} {'kodlama örnek/s':>16} {'MB/s':>7} "
+          f"{'çözme örnek/s':>14} {'hub örnek/s':>14} {'MB/s':>7}")
+    for name, size, encode, decode, hub in cases:
+        decode_text = f"{n / decode:14.0f}" if decode else f"{'-':>14}"
+        print(f"{name:22s} {size / n:8.1f} {n / encode:16.0f} {size / encode / 1e6:7.1f} "
+              f"{decode_text} {n / hub:14.0f} {size / hub / 1e6:7.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
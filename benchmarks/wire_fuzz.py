@@ -0,0 +1,178 @@
+"""İkili telemetri çözücüsü (wire_format.WireDecoder) için bozuk girdi denemesi.
+
+Tohumlu her turda araç tarafındaki gibi bir akış üretilir (çerçeve başına
+1..`--per-frame` örnek) ve çerçeve gruplarının bir kısmı bozulur: bit
+çevirme, kesme, araya çöp ekleme, uzunluk alanını bozma, yineleme. Akış
+rastgele boyutlu parçalarla çözücüye verilir. Aranan:
+
+- çözücü hiçbir girdide hata fırlatmaz,
+- çözülen her örnek gönderilen bir örnekle birebir aynıdır,
+- bozulmamış her grup çözülür (bozukluktan sonra hemen toparlanır).
+
+Ayrıca yalnız rastgele çöpten örnek çıkmadığı denenir. Bir koşul tutmazsa
+çıkış kodu 1.
+
+    python benchmarks/wire_fuzz.py
+    python benchmarks/wire_fuzz.py --rounds 200 --seed 7
+"""
+import argparse
+import os
+import sys
+
+import numpy as np
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO)
+
+from telemetry import TELEMETRY_CHANNELS  # noqa: E402
+from wire_format import HEADER, MAGIC, WireDecoder, WireEncoder  # noqa: E402
+
+MUTATIONS = ("bit", "kes", "çöp", "uzunluk", "yinele")
+
+
+def build_units(rng, groups, per_frame):
+    """Her grup: (bayt, zamanlar); ilk grup şemayı taşır ve bozulmaz"""
+    encoder = WireEncoder(TELEMETRY_CHANNELS, schema_every=int(rng.integers(1, 20)))
+    originals = {}
+    units = []
+    t = 0.0
+    for _ in range(groups):
+        n = int(rng.integers(1, per_frame + 1))
+        times = t + np.arange(n) * 0.008
+        t = float(times[-1]) + 0.008
+        block = rng.normal(0, 100, size=(n, len(TELEMETRY_CHANNELS))).astype(np.float32)
+        block[rng.random(block.shape) < 0.2] = np.nan
+        for time_, row in zip(times, block):
+            originals[float(time_)] = row
+        data = encoder.encode(times, block, samples_per_frame=int(rng.integers(1, n + 1)))
+        units.append((data, times))
+    return units, originals
+
+
+def mutate(rng, data):
+    data = bytearray(data)
+    kind = MUTATIONS[int(rng.integers(len(MUTATIONS)))]
+    if kind == "bit":
+        for _ in range(int(rng.integers(1, 4))):
+            i = int(rng.integers(len(data)))
+            data[i] ^= 1 << int(rng.integers(8))
+    elif kind == "kes":
+        i = int(rng.integers(len(data)))
+        j = int(rng.integers(i, len(data) + 1))
+        del data[i:max(j, i + 1)]
+    elif kind == "çöp":
+        garbage = bytearray(rng.integers(0, 256, int(rng.integers(1, 200)), dtype=np.uint8))
+        if rng.random() < 0.5:
+            # Sahte başlık: sihirli sayı + geçerli görünen sürüm/tür
+            garbage[:HEADER.size] = HEADER.pack(MAGIC, 1, 2, int(rng.integers(1 << 32)),
+                                                int(rng.integers(1 << 16)))
+        i = int(rng.integers(len(data) + 1))
+        data[i:i] = garbage
+        data = data[:i] + data[i:]
+    elif kind == "uzunluk":
+        # İlk çerçevenin uzunluk alanı (başlığın son iki baytı)
+        data[HEADER.size - 2:HEADER.size] = rng.integers(0, 256, 2, dtype=np.uint8).tobytes()
+    else:
+        i = int(rng.integers(len(data)))
+        data[i:i] = data[i:int(rng.integers(i, len(data) + 1))]
+    return bytes(data), kind
+
+
+def run_round(rng, args):
+    units, originals = build_units(rng, args.groups, args.per_frame)
+    stream = [units[0][0]]
+    expected = set(units[0][1].tolist())
+    counts = dict.fromkeys(MUTATIONS, 0)
+    for data, times in units[1:]:
+        if rng.random() < args.corrupt:
+            data, kind = mutate(rng, data)
+            counts[kind] += 1
+        else:
+            expected.update(times.tolist())
+        if rng.random() < 0.05:
+            stream.append(rng.integers(0, 256, int(rng.integers(1, 64)), dtype=np.uint8).tobytes())
+        stream.append(data)
+    stream = b"".join(stream)
+
+    decoder = WireDecoder()
+    decoded = set()
+    errors = []
+    pos = 0
+    while pos < len(stream):
+        size = int(rng.integers(1, 3 * args.chunk))
+        try:
+            batches = decoder.feed(stream[pos:pos + size])
+        except Exception as e:
+            errors.append(f"hata fırlattı: {e!r}")
+            break
+        pos += size
+        for channels, times, values in batches:
+            if channels != TELEMETRY_CHANNELS:
+                errors.append(f"yanlış şema: {channels!r}")
+                continue
+            for t, row in zip(times.tolist(), values):
+                original = originals.get(t)
+                if original is None or not np.array_equal(original, row, equal_nan=True):
+                    errors.append(f"gönderilmemiş örnek çözüldü (t={t})")
+                decoded.add(t)
+    missing = expected - decoded
+    if missing:
+        errors.append(f"bozulmamış {len(missing)} örnek çözülmedi (ilk t={min(missing)})")
+    return errors, counts, decoder.stats(), len(stream)
+
+
+def garbage_round(rng, size):
+    decoder = WireDecoder()
+    data = rng.integers(0, 256, size, dtype=np.uint8).tobytes()
+    # Sihirli sayı sıklığını artır: rastgele yerlere serpiştir
+    data = bytearray(data)
+    for i in rng.integers(0, size - 2, size // 64):
+        data[i:i + 2] = MAGIC
+    try:
+        for i in range(0, size, 4096):
+            if decoder.feed(bytes(data[i:i + 4096])):
+                return ["rastgele çöpten örnek çözüldü"]
+    except Exception as e:
+        return [f"çöpte hata fırlattı: {e!r}"]
+    return []
+
+
+def main():
+    parser = argparse.ArgumentParser(description="İkili telemetri çözücüsü bozuk girdi denemesi")
+    parser.add_argument("--rounds", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--groups", type=int, default=400, help="Tur başına çerçeve grubu")
+    parser.add_argument("--per-frame", type=int, default=25)
+    parser.add_argument("--corrupt", type=float, default=0.2, help="Bozulan grup oranı")
+    parser.add_argument("--chunk", type=int, default=1024, help="Ortalama alım parçası (bayt)")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    failures = 0
+    totals = dict.fromkeys(MUTATIONS, 0)
+    stats_total = {}
+    size_total = 0
+    for round_ in range(args.rounds):
+        errors, counts, stats, size = run_round(rng, args)
+        for key, value in counts.items():
+            totals[key] += value
+        for key, value in stats.items():
+            stats_total[key] = stats_total.get(key, 0) + value
+        size_total += size
+        if errors:
+            failures += 1
+            print(f"tur {round_}: " + "; ".join(errors[:3]))
+    errors = garbage_round(rng, 1 << 20)
+    if errors:
+        failures += 1
+        print("çöp turu: " + "; ".join(errors))
+
+    print(f"{args.rounds} tur, {size_total / 1e6:.1f} MB, tohum {args.seed}; bozma: "
+          + ", ".join(f"{key} {value}" for key, value in totals.items()))
+    print("çözücü: " + ", ".join(f"{key} {value}" for key, value in stats_total.items()))
+    print("BAŞARISIZ" if failures else "TAMAM")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,467 @@
+import os
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import cv2
+import numpy as np
+
+from frame_transport import SharedFrameRing
+
+
+class RateMeter:
+    """Son `window` saniyedeki olay sayısından hız (Hz) hesaplar"""
+
+    def __init__(self, window=2.0):
+        self.window = window
+        self._times = deque()
+        self._lock = threading.Lock()
+
+    def tick(self, now=None):
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            self._times.append(now)
+            self._trim(now)
+
+    def rate(self, now=None):
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            self._trim(now)
+            if len(self._times) < 2:
+                return 0.0
+            span = now - self._times[0]
+            return len(self._times) / span if span > 0 else 0.0
+
+    def _trim(self, now):
+        limit = now - self.window
+        while self._times and self._times[0] < limit:
+            self._times.popleft()
+
+
+class FrameRing:
+    """Canlı yayının son `seconds` saniyelik karelerini tutan halka tampon.
+
+    Kareler yakalama iş parçacığının zaten ayırdığı dizilerdir; halka sadece
+    referans tutar, kopyalamaz. `max_frames` bellek için kesin üst sınırdır;
+    bir kare `seconds` dolmadan bu sınır yüzünden atılırsa `overflow` artar
+    ve `overflow_until` atılan en yeni karenin zamanı olur.
+    Kareler paylaşılan bellek yuvalarıysa (`transport`), yuva yeniden
+    yazılmış olabileceğinden kullanıldıktan sonra `valid(seq)` sorulmalıdır.
+    """
+
+    def __init__(self, seconds=2.5, max_frames=300):
+        self.seconds = seconds
+        self.transport = None
+        self.overflow = 0
+        self.overflow_until = -float("inf")
+        self._frames = deque(maxlen=max_frames)
+
+    def append(self, seq, timestamp, frame):
+        # Sadece yakalama iş parçacığı ekler/siler
+        if len(self._frames) == self._frames.maxlen:
+            evicted = self._frames[0][1]
+            if evicted >= timestamp - self.seconds:
+                self.overflow += 1
+                self.overflow_until = evicted
+        self._frames.append((seq, timestamp, frame))
+        limit = timestamp - self.seconds
+        while self._frames and self._frames[0][1] < limit:
+            self._frames.popleft()
+
+    def latest(self):
+        """En yeni (seq, zaman, kare) ya da None"""
+        try:
+            return self._frames[-1]
+        except IndexError:
+            return None
+
+    def between(self, t0, t1):
+        """t0 < zaman <= t1 aralığındaki kareler (eskiden yeniye)"""
+        # list(deque) GIL altında tek adımda kopyalanır
+        return [item for item in list(self._frames) if t0 < item[1] <= t1]
+
+    def rate(self):
+        """Halkadaki karelerden ölçülen kare hızı (Hz); ölçülemezse 0"""
+        frames = list(self._frames)
+        if len(frames) < 2:
+            return 0.0
+        span = frames[-1][1] - frames[0][1]
+        return (len(frames) - 1) / span if span > 0 else 0.0
+
+    def valid(self, seq):
+        """seq karesinin belleği hâlâ geçerli mi"""
+        transport = self.transport
+        return transport is None or transport.valid(seq)
+
+
+class CameraCaptureThread:
+    """Kamerayı kendi iş parçacığında okur, sadece en yeni kareyi tutar.
+
+    GUI `get_latest()` ile kendi gösterim hızında o anki kareyi çeker. GUI'nin
+    almadan üzerine yazılan kareler `dropped` olarak sayılır; böylece darboğazın
+    kamera mı arayüz mü olduğu görülebilir.
+
+    `shared_slots` verilirse kareler paylaşılan bellekteki yuvalara
+    (`transport`) doğrudan okunur: GUI, halka, kayıt ve görüntü işleme
+    süreci aynı belleği kopyasız kullanır. Kamera yuvaya yazamayıp yeni dizi
+    döndürürse kare yuvaya kopyalanır ve `copies` artar.
+    """
+
+    # Art arda bu kadar okuma hatasından sonra kamera kopmuş sayılır
+    MAX_READ_FAILURES = 50
+
+    def __init__(self, source=0, capture_factory=None, ring=None, shared_slots=None):
+        self.source = source
+        self.capture_factory = capture_factory or cv2.VideoCapture
+        self.ring = ring if ring is not None else FrameRing()
+        self.shared_slots = shared_slots
+        self.transport = None
+        # Her karede (seq, zaman, kare) ile çağrılır; bloklamamalı
+        self.consumers = []
+        self.status = "stopped"  # stopped / opening / running / failed
+        self.error = None
+
+        self._cap = None
+        self._thread = None
+        self._stop = threading.Event()
+
+        # Tek kareli tampon (kilit korumalı)
+        self._lock = threading.Lock()
+        self._frame = None
+        self._timestamp = 0.0
+        self._seq = 0
+        self._consumed_seq = 0
+
+        # Ölçümler
+        self.captured = 0
+        self.dropped = 0
+        self.read_failures = 0
+        self.copies = 0
+        self.capture_meter = RateMeter()
+
+    def start(self):
+        """Yakalama iş parçacığını başlat (kamera açılışı da arka planda)"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self.status = "opening"
+        self.error = None
+        self._thread = threading.Thread(target=self._run, name="camera-capture",
+                                        daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=1.0):
+        """İş parçacığını durdur ve kamerayı serbest bırak"""
+        self._stop.set()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+        self._thread = None
+        self.status = "stopped"
+
+    def _run(self):
+        try:
+            self._cap = self.capture_factory(self.source)
+            if not self._cap.isOpened():
+                self.status = "failed"
+                self.error = "Kamera bulunamadı veya erişilemiyor."
+                return
+
+            self.status = "running"
+            failures = 0
+            while not self._stop.is_set():
+                ret, frame = self._read()
+                if not ret:
+                    failures += 1
+                    self.read_failures += 1
+                    if failures >= self.MAX_READ_FAILURES:
+                        self.status = "failed"
+                        self.error = "Kamera görüntüsü alınamıyor"
+                        return
+                    time.sleep(0.01)
+                    continue
+
+                failures = 0
+                now = time.monotonic()
+                self._publish(frame, now)
+                self.capture_meter.tick(now)
+        except Exception as e:
+            self.status = "failed"
+            self.error = f"Kamera hatası: {str(e)[:50]}"
+        finally:
+            if self._cap is not None:
+                self._cap.release()
+                self._cap = None
+            self._release_transport()
+
+    def _read(self):
+        """Sonraki kareyi oku; paylaşılan bellek varsa doğrudan yuvaya"""
+        if not self.shared_slots:
+            return self._cap.read()
+
+        seq = self._seq + 1
+        transport = self.transport
+        slot = transport.slot(seq) if transport is not None else None
+        ret, frame = self._cap.read(slot) if slot is not None else self._cap.read()
+        if not ret:
+            return ret, frame
+        if slot is None or frame.shape != slot.shape:
+            # İlk kare ya da çözünürlük değişti: halkayı kare boyutunda kur
+            self._release_transport()
+            self.transport = SharedFrameRing(frame.shape, slots=self.shared_slots)
+            self.ring.transport = self.transport
+            slot = self.transport.slot(seq)
+        if not np.shares_memory(frame, slot):
+            np.copyto(slot, frame)
+            self.copies += 1
+        return ret, slot
+
+    def _release_transport(self):
+        # Görünümler başka yerde yaşayabilir; sadece ad silinir, bellek GC ile
+        transport, self.transport = self.transport, None
+        if transport is not None:
+            transport.unlink()
+
+    def _publish(self, frame, timestamp):
+        with self._lock:
+            # Önceki kare GUI tarafından alınmadan eziliyorsa atlanmış say
+            if self._seq != self._consumed_seq:
+                self.dropped += 1
+            self._frame = frame
+            self._timestamp = timestamp
+            self._seq += 1
+            self.captured += 1
+            seq = self._seq
+        if self.transport is not None:
+            self.transport.publish(seq, timestamp)
+        self.ring.append(seq, timestamp, frame)
+        for consumer in self.consumers:
+            consumer(seq, timestamp, frame)
+
+    def frame_valid(self, seq):
+        """Paylaşılan yuvadaki kare hâlâ seq mi (yuva yoksa her zaman True)"""
+        transport = self.transport
+        return transport is None or transport.valid(seq)
+
+    def get_latest(self):
+        """Yeni kare varsa (seq, zaman, kare) döndürür, yoksa None"""
+        with self._lock:
+            if self._frame is None or self._seq == self._consumed_seq:
+                return None
+            self._consumed_seq = self._seq
+            return self._seq, self._timestamp, self._frame
+
+
+class SnapshotWriter:
+    """Halka tampondaki karelerden anlık görüntü ve seri çekim kaydeder.
+
+    Kodlama (imwrite) arka plandaki iş parçacığı havuzunda yapılır. Sonuçlar
+    (başarılı mı, mesaj) `notify` verildiyse ona (havuz iş parçacığından)
+    iletilir, verilmediyse `results` kuyruğuna düşer ve `poll()` ile okunur.
+
+    Seri çekim mesajı iki kaybı ayrı verir: yuvası kodlanırken ezilen
+    kareler "geç kaldı", halka `max_frames` sınırı yüzünden daha kodlamaya
+    sırası gelmeden attığı kareler "halkadan düştü". Tetik sonrası düşenler
+    seq boşluklarından tam, tetik öncesi düşenler ölçülen kare hızından
+    tahmini sayılır.
+    """
+
+    def __init__(self, ring, output_dir=".", max_workers=2, notify=None):
+        self.ring = ring
+        self.output_dir = output_dir
+        self.notify = notify
+        self.results = queue.SimpleQueue()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers,
+                                            thread_name_prefix="snapshot")
+
+    def snapshot(self):
+        """En yeni kareyi PNG olarak kaydet; kare yoksa False"""
+        latest = self.ring.latest()
+        if latest is None:
+            return False
+        seq, timestamp, frame = latest
+        stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        filename = os.path.join(self.output_dir, f"capture_{stamp}_{seq}.png")
+        self._executor.submit(self._write_single, filename, seq, frame)
+        return True
+
+    def burst(self, pre=2.0, post=2.0):
+        """Tetik anından önceki `pre` ve sonraki `post` saniyeyi kaydet"""
+        trigger = time.monotonic()
+        # Tetik öncesi kareler şimdi alınır; halka onları sonra silebilir.
+        # Paylaşılan yuvalar yeniden yazılmadan önce hemen kodlanırlar.
+        pre_frames = self.ring.between(trigger - pre, trigger)
+        pre_dropped = 0
+        if self.ring.overflow_until > trigger - pre:
+            pre_dropped = max(0, round(pre * self.ring.rate()) - len(pre_frames))
+        latest = self.ring.latest()
+        last_seq = pre_frames[-1][0] if pre_frames else (latest[0] if latest else 0)
+        stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        folder = os.path.join(self.output_dir, f"burst_{stamp}")
+        self._executor.submit(self._write_burst, folder, trigger, pre_frames, post,
+                              last_seq, pre_dropped)
+        return True
+
+    def _write_frame(self, filename, seq, frame):
+        """Kareyi yaz; yazarken yuvası ezildiyse dosyayı silip False döndür"""
+        if not cv2.imwrite(filename, frame):
+            return False
+        if not self.ring.valid(seq):
+            os.remove(filename)
+            return False
+        return True
+
+    def _write_single(self, filename, seq, frame):
+        try:
+            if self._write_frame(filename, seq, frame):
+                self._report((True, f"Fotoğraf kaydedildi: {filename}"))
+            else:
+                self._report((False, f"Fotoğraf yazılamadı: {filename}"))
+        except Exception as e:
+            self._report((False, f"Fotoğraf hatası: {e}"))
+
+    def _write_burst(self, folder, trigger, pre_frames, post, last_seq=0, dropped=0):
+        try:
+            os.makedirs(folder, exist_ok=True)
+            written = lost = 0
+
+            def write(frames):
+                nonlocal written, lost
+                for seq, timestamp, frame in frames:
+                    offset = timestamp - trigger
+                    name = f"frame_{seq:06d}_{offset:+.3f}s.jpg"
+                    if self._write_frame(os.path.join(folder, name), seq, frame):
+                        written += 1
+                    else:
+                        lost += 1
+
+            # Tetik öncesi kareler beklemeden, sonrakiler pencere dolunca
+            write(pre_frames)
+            delay = trigger + post - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            post_frames = self.ring.between(trigger, trigger + post)
+            if post_frames:
+                # Tetik sonrası seq'ler ardışık olmalı: eksikler halkadan düştü
+                dropped += post_frames[-1][0] - last_seq - len(post_frames)
+            write(post_frames)
+            if not written:
+                os.rmdir(folder)
+                self._report((False, "Seri çekim: kare yok"))
+                return
+            message = f"Seri çekim kaydedildi: {folder} ({written} kare"
+            if lost:
+                message += f", {lost} kare geç kaldı"
+            if dropped:
+                message += f", {dropped} kare halkadan düştü"
+            self._report((True, message + ")"))
+        except Exception as e:
+            self._report((False, f"Seri çekim hatası: {e}"))
+
+    def _report(self, result):
+        if self.notify:
+            self.notify(*result)
+        else:
+            self.results.put(result)
+
+    def poll(self):
+        """Tamamlanan işlerin sonuçlarını döndür (bloklamaz)"""
+        done = []
+        while True:
+            try:
+                done.append(self.results.get_nowait())
+            except queue.Empty:
+                return done
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
+
+
+class FrameDisplay:
+    """Kameradan gelen kareleri tek bir kalıcı PhotoImage üzerine basar.
+
+    Hedef boyut sadece `<Configure>` olaylarında hesaplanır (en-boy oranı
+    korunur). Küçültme INTER_AREA ile, renk dönüşümü ve boyutlandırma önceden
+    ayrılmış tamponlara yapılır; PIL görüntüsü RGBA tamponunu kopyalamadan
+    paylaşır ve PhotoImage `paste()` ile yerinde güncellenir.
+    """
+
+    def __init__(self, label, padding=4, default_box=(620, 460)):
+        self.label = label
+        self.padding = padding
+        self._box = default_box
+        self._src_shape = None
+        self._size = None
+        self._interpolation = cv2.INTER_AREA
+
+        # Önceden ayrılmış tamponlar
+        self._resized = None
+        self._rgba = None
+        self._image = None
+        self._photo = None
+        self._attached = False
+
+        # Hedef boyut her kare sorgulanmasın diye olaydan güncellenir
+        self.label.bind("<Configure>", self.on_configure)
+
+    def on_configure(self, event):
+        """Alan boyutu değişti: hedef boyutu bir sonraki karede yeniden hesapla"""
+        box = (event.width - self.padding, event.height - self.padding)
+        if box[0] < 10 or box[1] < 10 or box == self._box:
+            return
+        self._box = box
+        self._size = None
+
+    def _allocate(self, src_w, src_h):
+        """Kaynak ve alan boyutuna göre tamponları ve PhotoImage'ı hazırla"""
+        # PIL sadece gösterimde gerekir (sunucu/başsız süreçler kamerayı PIL'siz kullanır)
+        from PIL import Image, ImageTk
+
+        box_w, box_h = self._box
+        scale = min(box_w / src_w, box_h / src_h)
+        size = (max(1, int(src_w * scale)), max(1, int(src_h * scale)))
+
+        self._src_shape = (src_h, src_w)
+        self._interpolation = cv2.INTER_AREA if scale < 1 else cv2.INTER_LINEAR
+        if size == self._size and self._photo is not None:
+            return
+
+        self._size = size
+        w, h = size
+        self._resized = np.empty((h, w, 3), dtype=np.uint8)
+        self._rgba = np.empty((h, w, 4), dtype=np.uint8)
+        # frombuffer RGBA tamponu kopyalamadan paylaşır
+        self._image = Image.frombuffer("RGBA", size, self._rgba, "raw", "RGBA", 0, 1)
+        self._photo = ImageTk.PhotoImage("RGBA", size)
+        self._attached = False
+
+    def show(self, frame, overlay=None):
+        """BGR kareyi ekrana bas.
+
+        overlay(rgba, ölçek): varsa gösterim tamponuna (kareye değil) çizer,
+        böylece kayıt ve anlık görüntüler katmansız kalır.
+        """
+        src_h, src_w = frame.shape[:2]
+        if self._size is None or self._src_shape != (src_h, src_w):
+            self._allocate(src_w, src_h)
+
+        if self._size == (src_w, src_h):
+            resized = frame
+        else:
+            resized = cv2.resize(frame, self._size, dst=self._resized,
+                                 interpolation=self._interpolation)
+        cv2.cvtColor(resized, cv2.COLOR_BGR2RGBA, dst=self._rgba)
+        if overlay is not None:
+            overlay(self._rgba, self._size[0] / src_w)
+
+        self._photo.paste(self._image)
+        if not self._attached:
+            self.label.config(image=self._photo, text="")
+            self._attached = True
+
+    def clear(self, text=""):
+        """Görüntüyü kaldırıp mesaj göster"""
+        self.label.config(image="", text=text)
+        self._attached = False
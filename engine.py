@@ -0,0 +1,232 @@
+import argparse
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+
+from history_pyramid import MinMaxPyramid
+from link_health import LinkHealth
+from motor_control import LoopbackTransport, MotorCommandDispatcher, transport_from_spec
+from perf import timed
+from sensor_sources import SensorHub, SimulatedSource, source_from_spec
+from state_estimator import StateEstimator
+from telemetry import TELEMETRY_CHANNELS, TelemetryRing
+from telemetry_log import TelemetryLogWriter
+
+# Halka tampondaki örnek sayısı (grafikler, alarmlar buradan okur)
+TELEMETRY_CAPACITY = 65536
+
+# Kalıcı telemetri kaydı klasörü (her dalış ayrı dosya)
+TELEMETRY_LOG_DIR = "telemetry_logs"
+
+# Bağlantı bekçisi: bu kadar saniye hiç örnek gelmezse bağlantı kopuk,
+# bir kanal bu kadar susarsa bağlantı zayıf sayılır
+LINK_HEARTBEAT_TIMEOUT = 1.0
+LINK_CHANNEL_TIMEOUT = 3.0
+
+# Motor komutları: aracın kabul ettiği en yüksek komut hızı (komut/s)
+MOTOR_COMMAND_RATE = 20.0
+
+
+class TelemetryEngine:
+    """Arayüzsüz telemetri çekirdeği: alma, tampon, kayıt ve komut yolu.
+
+    Tkinter, OpenCV veya matplotlib yüklemez; araç tarafındaki bilgisayarda
+    tek başına kaydedici olarak çalışabilir (`python engine.py`). Arayüz aynı
+    nesneye abone olur: tek bir alma iş parçacığı hub'da biriken toplu
+    örnekleri halkaya, geçmiş piramidine ve kayıt dosyasına yazar, sonra
+    her aboneyi `(zamanlar, blok)` ile çağırır; aboneler bu iş parçacığında
+    çalışır. Depolara yazma `lock` tutularak yapılır; halkayı başka iş
+    parçacığından okuyan (ör. grafikler) de onu tutmalıdır. Durum
+    tahmincisi abonelerden önce güncellenir ve son tahmin `snapshot()` ile
+    kilitsiz okunur; kontrol döngüsü alma işini hiç beklemez.
+    """
+
+    def __init__(self, sources=None, channels=TELEMETRY_CHANNELS,
+                 capacity=TELEMETRY_CAPACITY, log_dir=None, motor_transport=None,
+                 motor_rate=MOTOR_COMMAND_RATE, heartbeat_timeout=LINK_HEARTBEAT_TIMEOUT,
+                 channel_timeout=LINK_CHANNEL_TIMEOUT):
+        self.sources = list(sources) if sources is not None else [SimulatedSource()]
+        self.log_dir = log_dir
+
+        self.telemetry = TelemetryRing(channels, capacity=capacity)
+        self.history = MinMaxPyramid(self.telemetry.channels)
+        self.link_health = LinkHealth(self.telemetry.channels,
+                                      heartbeat_timeout=heartbeat_timeout,
+                                      channel_timeout=channel_timeout)
+        self.estimator = StateEstimator(self.telemetry.channels)
+        self.motors = MotorCommandDispatcher(motor_transport or LoopbackTransport(),
+                                             rate_hz=motor_rate)
+        self.sensor_hub = None
+        self.log = None
+        self.ingest_errors = 0
+        self._subscribers = []
+        # Alma iş parçacığı (ya da tekrar modunda ingest() çağıran) tutar
+        self.lock = threading.RLock()
+        # Son tahmin: alma tarafı her toplu örnekten sonra yenisini koyar
+        self._estimate = self.estimator.state()
+        self._ingest_thread = None
+        self._stopping = threading.Event()
+
+    # --- Yaşam döngüsü ----------------------------------------------------
+
+    def start(self, sensors=True):
+        """Komut yolunu ve (sensors=True ise) kaynakları ve kaydı başlat.
+
+        sensors=False: veri dışarıdan `ingest()` ile verilir (tekrar modu).
+        """
+        self.motors.start()
+        if not sensors:
+            return
+        if self.log_dir:
+            stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            self.log = TelemetryLogWriter(os.path.join(self.log_dir, f"dive_{stamp}.otl"),
+                                          self.telemetry.channels)
+        self.sensor_hub = SensorHub(self.sources, channels=self.telemetry.channels)
+        self.sensor_hub.start()
+        self._stopping.clear()
+        self._ingest_thread = threading.Thread(target=self._ingest_loop, name="telemetri-alma",
+                                               daemon=True)
+        self._ingest_thread.start()
+
+    def stop(self):
+        if self.sensor_hub:
+            self.sensor_hub.stop()
+        # Hub'ın son topluluğu da işlensin diye kuyruk boşalınca durur
+        self._stopping.set()
+        if self._ingest_thread:
+            self._ingest_thread.join(2.0)
+            self._ingest_thread = None
+        self.motors.stop()
+        log, self.log = self.log, None
+        if log:
+            log.close()
+
+    # --- Veri yolu --------------------------------------------------------
+
+    def subscribe(self, callback):
+        """Her toplu örnekte `callback(zamanlar, blok)` çağrılır"""
+        self._subscribers.append(callback)
+        return callback
+
+    def unsubscribe(self, callback):
+        if callback in self._subscribers:
+            self._subscribers.remove(callback)
+
+    def _ingest_loop(self):
+        """Alma iş parçacığı: hub kuyruğundan gelen her topluluğu işle"""
+        batches = self.sensor_hub.queue
+        while True:
+            try:
+                timestamps, block, arrivals = batches.get(timeout=0.1)
+            except queue.Empty:
+                if self._stopping.is_set():
+                    return
+                continue
+            try:
+                self.ingest(timestamps, block, arrivals)
+            except Exception as e:
+                self.ingest_errors += 1
+                print(f"Sensör hatası: {e}")
+
+    def ingest(self, timestamps, block, arrivals=None):
+        """Toplu örneği depola, kaydet ve abonelere ilet.
+
+        arrivals (hangi kanal gerçekten geldi) canlı veride verilir ve
+        bağlantı sağlığına yazılır; kayıttan gelen veride None'dır.
+        """
+        with self.lock:
+            if arrivals is not None:
+                self.link_health.observe(timestamps, arrivals)
+            self.telemetry.extend(timestamps, block)
+            self.history.extend(timestamps, block)
+            if self.log:
+                self.log.extend(timestamps, block)
+            self.estimate(timestamps, block)
+            self._estimate = self.estimator.state()
+            for callback in self._subscribers:
+                callback(timestamps, block)
+
+    @timed("tahmin")
+    def estimate(self, timestamps, block):
+        return self.estimator.update(timestamps, block)
+
+    def snapshot(self):
+        """Son yayınlanan tahmin (`StateEstimator.state()` biçimi).
+
+        Kilit almaz, hesap yapmaz: kontrol döngüsü her turda bunu okur.
+        """
+        return self._estimate
+
+    def latest(self):
+        return self.telemetry.latest()
+
+    def status(self):
+        """Bağlantı özeti + toplam örnek, kayıt dosyası ve son tahmin"""
+        health = self.link_health.check()
+        health["estimate"] = self.snapshot()
+        health["log"] = self.log.path if self.log else None
+        health["errors"] = dict(self.sensor_hub.errors) if self.sensor_hub else {}
+        return health
+
+    # --- Arayüzsüz çalışma ------------------------------------------------
+
+    def run(self, duration=None, status_interval=1.0, on_status=None):
+        """Bloklayan döngü: alma kendi iş parçacığında, `status_interval`de bir durum"""
+        start = time.monotonic()
+        end = start + duration if duration is not None else None
+        next_status = start + status_interval
+        try:
+            while end is None or time.monotonic() < end:
+                now = time.monotonic()
+                if on_status and now >= next_status:
+                    next_status = now + status_interval
+                    on_status(self.status())
+                wake = next_status if end is None else min(next_status, end)
+                time.sleep(max(0.0, wake - time.monotonic()))
+        except KeyboardInterrupt:
+            pass
+
+
+def format_status(status):
+    text = (f"{datetime.now():%H:%M:%S} {status['state']:<10} {status['rate']:7.1f} Hz  "
+            f"örnek {status['received']}  yaş p95 {status['age_p95'] * 1000:.0f} ms")
+    estimate = status.get("estimate")
+    if estimate:
+        text += (f"  konum {estimate['lat']:.6f},{estimate['lon']:.6f}"
+                 f"  yön {estimate['yön']:.0f}°  derinlik {estimate['derinlik']:.1f} m")
+    if status["stale"]:
+        text += "  susan: " + ", ".join(status["stale"])
+    for name, error in status["errors"].items():
+        text += f"  [{name}: {error}]"
+    return text
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Arayüzsüz telemetri kaydedici")
+    parser.add_argument("--source", action="append", metavar="SPEC",
+                        help="Sensör kaynağı (birden çok verilebilir): sim[:HZ], "
+                             "vsim[:HZ[:SENARYO[:TOHUM]]], serial:PORT[:BAUD], udp:HOST:PORT, replay:DOSYA[:HIZ]")
+    parser.add_argument("--log-dir", default=TELEMETRY_LOG_DIR,
+                        help="Kayıt klasörü (boş verilirse kayıt yapılmaz)")
+    parser.add_argument("--motor", default="loop", metavar="SPEC",
+                        help="Motor komut aktarımı: loop, serial:PORT[:BAUD], udp:HOST:PORT")
+    parser.add_argument("--duration", type=float, help="Bu kadar saniye sonra dur")
+    parser.add_argument("--status-interval", type=float, default=1.0)
+    args = parser.parse_args()
+
+    sources = [source_from_spec(spec) for spec in args.source] if args.source else None
+    engine = TelemetryEngine(sources, log_dir=args.log_dir or None,
+                             motor_transport=transport_from_spec(args.motor))
+    engine.start()
+    if engine.log:
+        print(f"Kayıt: {engine.log.path}")
+    engine.run(args.duration, status_interval=args.status_interval,
+               on_status=lambda status: print(format_status(status), flush=True))
+    engine.stop()
+    print(f"Toplam {engine.link_health.received} örnek.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,589 @@
+import argparse
+import asyncio
+import collections
+import functools
+import json
+import struct
+import threading
+import time
+from datetime import datetime
+
+import numpy as np
+
+from engine import TelemetryEngine
+from motor_control import CommandTransport, decode_messages, transport_from_spec
+from sensor_sources import SensorSource, source_from_spec
+from wire_format import ClockOffset
+
+# Varsayılan dinleme adresi (yerel ağdaki konsollar bağlanır)
+FANOUT_HOST = "0.0.0.0"
+FANOUT_PORT = 5760
+
+# Abone başına kuyruk sınırları: telemetri toplu örneği ve video karesi.
+# Dolunca en eskisi atılır; yavaş istemci diğerlerini hiç bekletmez.
+TELEMETRY_QUEUE = 64
+VIDEO_QUEUE = 1
+
+# Video: en fazla bu hızda JPEG'e çevrilir (bir kez, tüm abonelere aynı bayt)
+VIDEO_FPS = 15.0
+JPEG_QUALITY = 70
+
+# Roller: tek bir birincil konsol komut gönderebilir, izleyiciler salt okur
+ROLE_PRIMARY = "birincil"
+ROLE_VIEWER = "izleyici"
+
+# Çerçeve: 1 bayt tür + 4 bayt uzunluk (ağ sırası) + yük
+FRAME_HEADER = struct.Struct("!cI")
+HELLO = b"H"        # JSON: istemci -> rol isteği, sunucu -> kanallar ve verilen rol
+TELEMETRY = b"T"    # <u4 n> + n zaman (<f8) + n x kanal değer (<f8)
+VIDEO = b"V"        # <f8 zaman> + JPEG
+COMMAND = b"C"      # motor komut satırları (motor_control.encode_command)
+REPLY = b"A"        # JSON: {"ack": seq} ya da {"seq": seq, "error": ...}
+
+# Bu boyuttan büyük çerçeve bozuk sayılır ve bağlantı kapatılır
+MAX_FRAME = 16 * 1024 * 1024
+
+
+def encode_frame(kind, payload):
+    return FRAME_HEADER.pack(kind, len(payload)) + payload
+
+
+async def read_frame(reader):
+    """(tür, yük); bağlantı kapanınca asyncio.IncompleteReadError"""
+    kind, length = FRAME_HEADER.unpack(await reader.readexactly(FRAME_HEADER.size))
+    if length > MAX_FRAME:
+        raise ValueError(f"Çerçeve çok büyük: {length} bayt")
+    return kind, await reader.readexactly(length)
+
+
+def encode_telemetry(timestamps, block):
+    timestamps = np.ascontiguousarray(timestamps, dtype="<f8")
+    block = np.ascontiguousarray(block, dtype="<f8")
+    return encode_frame(TELEMETRY, struct.pack("<I", len(timestamps))
+                        + timestamps.tobytes() + block.tobytes())
+
+
+def decode_telemetry(payload, channel_count):
+    """(zamanlar, (n, kanal) blok); kopyasız görünümler"""
+    (n,) = struct.unpack_from("<I", payload)
+    times = np.frombuffer(payload, dtype="<f8", count=n, offset=4)
+    block = np.frombuffer(payload, dtype="<f8", count=n * channel_count, offset=4 + 8 * n)
+    return times, block.reshape(n, channel_count)
+
+
+def encode_json(kind, message):
+    return encode_frame(kind, json.dumps(message, ensure_ascii=False).encode("utf-8"))
+
+
+class LatestQueue:
+    """Sınırlı, en-yeni-kalır kuyruk: doluyken eklenen öğe en eskisini atar"""
+
+    def __init__(self, maxsize):
+        self.items = collections.deque(maxlen=maxsize)
+        self.dropped = 0
+
+    def put(self, item):
+        if len(self.items) == self.items.maxlen:
+            self.dropped += 1
+        self.items.append(item)
+
+    def drain(self):
+        items = list(self.items)
+        self.items.clear()
+        return items
+
+
+class Subscriber:
+    """Sunucu tarafında bir istemci: kendi kuyrukları ve yazıcı görevi"""
+
+    def __init__(self, writer, name, role, telemetry_queue=TELEMETRY_QUEUE,
+                 video_queue=VIDEO_QUEUE):
+        self.writer = writer
+        self.name = name
+        self.role = role
+        self.replies = collections.deque()
+        self.telemetry = LatestQueue(telemetry_queue)
+        self.video = LatestQueue(video_queue)
+        self.wake = asyncio.Event()
+        self.sent_bytes = 0
+        self.connected = time.monotonic()
+
+    def push(self, queue, frame):
+        queue.put(frame)
+        self.wake.set()
+
+    def reply(self, message):
+        self.replies.append(encode_json(REPLY, message))
+        self.wake.set()
+
+    async def write_loop(self):
+        """Bekleyenleri tek seferde yaz; yazma sürerken gelenler kuyrukta birikir/atılır"""
+        while True:
+            await self.wake.wait()
+            self.wake.clear()
+            frames = list(self.replies)
+            self.replies.clear()
+            frames += self.telemetry.drain() + self.video.drain()
+            if not frames:
+                continue
+            self.writer.writelines(frames)
+            self.sent_bytes += sum(len(frame) for frame in frames)
+            try:
+                await self.writer.drain()
+            except ConnectionError:
+                return
+
+    def stats(self):
+        return {"name": self.name, "role": self.role, "sent_bytes": self.sent_bytes,
+                "dropped_telemetry": self.telemetry.dropped,
+                "dropped_video": self.video.dropped,
+                "seconds": time.monotonic() - self.connected}
+
+
+class FanoutServer:
+    """Araç bağlantısının tek sahibi: telemetri ve videoyu N yerel konsola dağıtır.
+
+    Arayüzsüz çekirdeği (`TelemetryEngine`) başlatır ve ona abone olur; her
+    toplu örnek çekirdeğin alma iş parçacığında bir kez kodlanır ve sunucu
+    döngüsünde tüm abonelerin kuyruğuna aynı bayt dizisi olarak konur. Kameradan gelen
+    kareler en fazla `video_fps` hızında, kamerayı bekletmemek için ayrı bir
+    kodlayıcı iş parçacığında bir kez JPEG'e çevrilir; kodlayıcı yetişemezse
+    sadece en yeni kare kodlanır (`video_skipped`). Her abone
+    kendi yazıcı görevinde, kendi hızında okur; kuyruğu dolarsa en eski
+    öğeler atılır (`dropped_*`), diğer aboneler etkilenmez.
+
+    İlk `birincil` rol isteyen istemci motor komutu gönderebilir; komutlar
+    çekirdeğin komut yoluna verilir ve araç onayladığında istemciye onay
+    iletilir (onay gecikmesi konsol -> araç yolunu ölçer). Diğerleri
+    izleyicidir.
+    """
+
+    def __init__(self, engine, host=FANOUT_HOST, port=FANOUT_PORT, camera=None,
+                 video_fps=VIDEO_FPS, jpeg_quality=JPEG_QUALITY,
+                 telemetry_queue=TELEMETRY_QUEUE):
+        self.engine = engine
+        self.host = host
+        self.port = port
+        self.camera = camera
+        self.video_interval = 1.0 / video_fps
+        self.jpeg_quality = jpeg_quality
+        self.telemetry_queue = telemetry_queue
+        self.subscribers = []
+        self.primary = None
+        self.published = 0
+        self.video_frames = 0
+        self.video_skipped = 0
+
+        self._next_video = 0.0
+        self._video_cond = threading.Condition()
+        self._video_pending = None
+        self._video_running = False
+        self._video_thread = None
+        self._loop = None
+        self._stop = None
+        self._ready = threading.Event()
+        self._thread = None
+        engine.subscribe(self._on_samples)
+
+    # --- Yaşam döngüsü ----------------------------------------------------
+
+    def start(self):
+        """Çekirdeği ve sunucuyu arka plan iş parçacığında başlat (dinleyene kadar bekler)"""
+        self.engine.start()
+        self._thread = threading.Thread(target=lambda: asyncio.run(self._main()),
+                                        name="fanout", daemon=True)
+        self._thread.start()
+        self._ready.wait(5.0)
+        if self.camera is not None:
+            self._video_running = True
+            self._video_thread = threading.Thread(target=self._encode_loop,
+                                                  name="fanout-video", daemon=True)
+            self._video_thread.start()
+            self.camera.consumers.append(self._on_frame)
+            self.camera.start()
+
+    def stop(self, timeout=2.0):
+        if self._loop and self._stop:
+            self._loop.call_soon_threadsafe(self._stop.set)
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+        if self.camera is not None:
+            self.camera.stop()
+        with self._video_cond:
+            self._video_running = False
+            self._video_cond.notify()
+        if self._video_thread:
+            self._video_thread.join(timeout)
+            self._video_thread = None
+        self.engine.stop()
+
+    async def _main(self):
+        self._loop = asyncio.get_running_loop()
+        self._stop = asyncio.Event()
+        server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = server.sockets[0].getsockname()[1]
+        self._ready.set()
+        async with server:
+            await self._stop.wait()
+        for subscriber in list(self.subscribers):
+            subscriber.writer.close()
+
+    # --- Yayın ------------------------------------------------------------
+
+    def _on_samples(self, timestamps, block):
+        """Çekirdek aboneliği (alma iş parçacığı): bir kez kodla, döngüye devret"""
+        loop = self._loop
+        if loop is None:
+            return
+        frame = encode_telemetry(timestamps, block)
+        try:
+            loop.call_soon_threadsafe(self._publish_telemetry, frame, len(timestamps))
+        except RuntimeError:
+            pass  # Sunucu durdu, çekirdek son örnekleri işliyor
+
+    def _publish_telemetry(self, frame, count):
+        self.published += count
+        for subscriber in self.subscribers:
+            subscriber.push(subscriber.telemetry, frame)
+
+    def _on_frame(self, seq, timestamp, frame):
+        """Kamera iş parçacığı (bloklamaz): hız sınırıyla kodlayıcıya bırak"""
+        # Kamera zamanlaması oynak: vadeye çeyrek aralık kala gelen kare de alınır
+        if not self.subscribers or timestamp < self._next_video - self.video_interval / 4:
+            return
+        self._next_video = max(self._next_video + self.video_interval, timestamp)
+        with self._video_cond:
+            if self._video_pending is not None:
+                self.video_skipped += 1
+            self._video_pending = (seq, timestamp, frame)
+            self._video_cond.notify()
+
+    def _encode_loop(self):
+        """Kodlayıcı iş parçacığı: en yeni kareyi JPEG'e çevir, döngüye devret"""
+        import cv2
+
+        while True:
+            with self._video_cond:
+                while self._video_running and self._video_pending is None:
+                    self._video_cond.wait()
+                if not self._video_running:
+                    return
+                seq, timestamp, frame = self._video_pending
+                self._video_pending = None
+
+            ok, jpeg = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, self.jpeg_quality])
+            # Paylaşılan yuva kodlanırken ezildiyse kare yırtık olabilir
+            if not ok or not self.camera.frame_valid(seq):
+                self.video_skipped += 1
+                continue
+            payload = encode_frame(VIDEO, struct.pack("<d", timestamp) + jpeg.tobytes())
+            try:
+                self._loop.call_soon_threadsafe(self._publish_video, payload)
+            except RuntimeError:
+                pass  # Sunucu durdu, kamera son kareleri veriyor
+
+    def _publish_video(self, payload):
+        self.video_frames += 1
+        for subscriber in self.subscribers:
+            subscriber.push(subscriber.video, payload)
+
+    # --- İstemciler -------------------------------------------------------
+
+    async def _handle(self, reader, writer):
+        peer = writer.get_extra_info("peername")
+        try:
+            kind, payload = await asyncio.wait_for(read_frame(reader), 5.0)
+            hello = json.loads(payload) if kind == HELLO else {}
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, ValueError):
+            writer.close()
+            return
+        if not isinstance(hello, dict):
+            writer.close()
+            return
+
+        name = str(hello.get("name") or f"{peer[0]}:{peer[1]}")
+        role = ROLE_VIEWER
+        note = None
+        if hello.get("role") == ROLE_PRIMARY:
+            if self.primary is None:
+                role = ROLE_PRIMARY
+            else:
+                note = f"Birincil konsol zaten bağlı: {self.primary.name}"
+        subscriber = Subscriber(writer, name, role, telemetry_queue=self.telemetry_queue)
+        if role == ROLE_PRIMARY:
+            self.primary = subscriber
+        writer.write(encode_json(HELLO, {"channels": list(self.engine.telemetry.channels),
+                                         "role": role, "note": note,
+                                         "video": self.camera is not None}))
+        self.subscribers.append(subscriber)
+        print(f"Bağlandı: {name} ({role})")
+
+        write_task = asyncio.create_task(subscriber.write_loop())
+        try:
+            while True:
+                kind, payload = await read_frame(reader)
+                if kind == COMMAND:
+                    self._command(subscriber, payload)
+        except (asyncio.IncompleteReadError, OSError, ValueError):
+            pass
+        finally:
+            write_task.cancel()
+            self.subscribers.remove(subscriber)
+            if self.primary is subscriber:
+                self.primary = None
+            writer.close()
+            print(f"Ayrıldı: {name}")
+
+    def _command(self, subscriber, payload):
+        """Birincil konsolun komutlarını çekirdeğin komut yoluna ver; araç
+        onaylayınca onayı istemcinin sıra numarasıyla geri gönder"""
+        for message in decode_messages(payload):
+            seq = message.get("seq")
+            if subscriber is not self.primary:
+                subscriber.reply({"seq": seq, "error": "salt okunur izleyici"})
+                continue
+            command = message.get("cmd")
+            on_ack = functools.partial(self._forward_ack, subscriber, seq)
+            if command == "acil_dur":
+                self.engine.motors.emergency_stop(on_ack=on_ack)
+            else:
+                self.engine.motors.submit(command, command, message.get("value"), on_ack=on_ack)
+
+    def _forward_ack(self, subscriber, seq):
+        """Komut iş parçacığı: aracın onayını sunucu döngüsüne devret"""
+        try:
+            self._loop.call_soon_threadsafe(subscriber.reply, {"ack": seq})
+        except RuntimeError:
+            pass  # Sunucu durdu
+
+    def stats(self):
+        return {"clients": [subscriber.stats() for subscriber in self.subscribers],
+                "published": self.published, "video_frames": self.video_frames,
+                "video_skipped": self.video_skipped}
+
+
+# --- İstemci tarafı -------------------------------------------------------
+
+class FanoutClient:
+    """Dağıtım sunucusuna bağlanan konsolun tarafı.
+
+    Bağlantıyı `source()` ile alınan sensör kaynağı kurar ve sürdürür
+    (çekirdeğin hub döngüsünde); aynı bağlantıdan gelen video `camera()`
+    nesnesine, onaylar `motor_transport()` aktarımına gider. Sunucudaki
+    örnek zamanları yerel saate, görülen en kısa gecikmeyle hizalanır.
+    """
+
+    def __init__(self, host, port=FANOUT_PORT, role=ROLE_VIEWER, name=None):
+        self.host = host
+        self.port = port
+        self.requested_role = role
+        self.name = name
+        self.role = None
+        self.channels = ()
+        self.note = None
+        self.received = 0
+
+        self._cond = threading.Condition()
+        self._jpeg = None
+        self._jpeg_time = 0.0
+        self._jpeg_seq = 0
+        self._replies = collections.deque()
+        self._loop = None
+        self._writer = None
+        self._clock = ClockOffset()
+
+    # --- Bağlantı (hub döngüsünde) ----------------------------------------
+
+    async def run(self, emit, emit_block=None):
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        try:
+            writer.write(encode_json(HELLO, {"role": self.requested_role, "name": self.name}))
+            kind, payload = await read_frame(reader)
+            if kind != HELLO:
+                raise ConnectionError("Sunucu el sıkışması beklenmedik")
+            header = json.loads(payload)
+            self.channels = tuple(header["channels"])
+            self.role = header["role"]
+            self.note = header.get("note")
+            if self.note:
+                print(f"Dağıtım sunucusu: {self.note}")
+            self._loop = asyncio.get_running_loop()
+            self._writer = writer
+            while True:
+                kind, payload = await read_frame(reader)
+                if kind == TELEMETRY:
+                    self._emit(payload, emit, emit_block)
+                elif kind == VIDEO:
+                    self._video(payload)
+                elif kind == REPLY:
+                    with self._cond:
+                        self._replies.append(payload + b"\n")
+                        self._cond.notify_all()
+        finally:
+            self._writer = None
+            writer.close()
+
+    def _emit(self, payload, emit, emit_block=None):
+        times, block = decode_telemetry(payload, len(self.channels))
+        times = self._clock.to_local(times, time.monotonic())
+        if emit_block is not None:
+            emit_block(self.channels, times, block)
+        else:
+            for t, row in zip(times.tolist(), block.tolist()):
+                emit({name: value for name, value in zip(self.channels, row)
+                      if value == value}, t)
+        self.received += len(times)
+
+    def _video(self, payload):
+        (timestamp,) = struct.unpack_from("<d", payload)
+        with self._cond:
+            self._jpeg = payload[8:]
+            self._jpeg_time = timestamp
+            self._jpeg_seq += 1
+            self._cond.notify_all()
+
+    def send_command(self, data):
+        writer, loop = self._writer, self._loop
+        if writer is None:
+            raise ConnectionError("Dağıtım sunucusuna bağlı değil")
+        loop.call_soon_threadsafe(writer.write, encode_frame(COMMAND, data))
+
+    # --- Konsola verilen nesneler -----------------------------------------
+
+    def source(self):
+        return RemoteSource(self)
+
+    def camera(self, source=None):
+        return RemoteCamera(self)
+
+    def motor_transport(self):
+        return RemoteMotorTransport(self)
+
+
+class RemoteSource(SensorSource):
+    """Dağıtım sunucusundan gelen telemetri (bağlantıyı bu kaynak sürdürür)"""
+
+    def __init__(self, client):
+        self.client = client
+        self.name = f"dağıtım:{client.host}:{client.port}"
+
+    block_emitter = True
+
+    async def run(self, emit, emit_block=None):
+        await self.client.run(emit, emit_block)
+
+
+class RemoteCamera:
+    """`cv2.VideoCapture` yerine: dağıtım sunucusunun JPEG karelerini çözer"""
+
+    def __init__(self, client, timeout=1.0):
+        self.client = client
+        self.timeout = timeout
+        self._seq = 0
+        self._shape = (0, 0)
+        self._open = True
+
+    def isOpened(self):
+        return self._open
+
+    def read(self, image=None):
+        import cv2
+
+        client = self.client
+        with client._cond:
+            if not client._cond.wait_for(lambda: client._jpeg_seq != self._seq or not self._open,
+                                         self.timeout) or not self._open:
+                return False, None
+            jpeg, self._seq = client._jpeg, client._jpeg_seq
+        frame = cv2.imdecode(np.frombuffer(jpeg, dtype=np.uint8), cv2.IMREAD_COLOR)
+        if frame is None:
+            return False, None
+        self._shape = frame.shape[:2]
+        if image is not None and image.shape == frame.shape:
+            np.copyto(image, frame)
+            return True, image
+        return True, frame
+
+    def get(self, prop):
+        import cv2
+
+        return {cv2.CAP_PROP_FRAME_HEIGHT: self._shape[0],
+                cv2.CAP_PROP_FRAME_WIDTH: self._shape[1]}.get(prop, 0.0)
+
+    def set(self, prop, value):
+        return False
+
+    def release(self):
+        self._open = False
+        with self.client._cond:
+            self.client._cond.notify_all()
+
+
+class RemoteMotorTransport(CommandTransport):
+    """Motor komutlarını dağıtım sunucusu üzerinden gönderir (sadece birincil konsol)"""
+
+    def __init__(self, client):
+        self.client = client
+        self.name = f"dağıtım:{client.host}"
+
+    def send(self, data):
+        if self.client.role is not None and self.client.role != ROLE_PRIMARY:
+            raise PermissionError("salt okunur izleyici")
+        self.client.send_command(data)
+
+    def recv(self, timeout):
+        client = self.client
+        with client._cond:
+            if not client._cond.wait_for(lambda: client._replies, timeout):
+                return None
+            return b"".join(client._replies.popleft() for _ in range(len(client._replies)))
+
+
+def format_stats(stats):
+    text = (f"{datetime.now():%H:%M:%S} örnek {stats['published']}  "
+            f"video {stats['video_frames']}  istemci {len(stats['clients'])}")
+    for client in stats["clients"]:
+        text += (f"\n  {client['name']} ({client['role']}): "
+                 f"{client['sent_bytes'] / 1e6:.1f} MB, atılan telemetri "
+                 f"{client['dropped_telemetry']} video {client['dropped_video']}")
+    return text
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Telemetri ve video dağıtım sunucusu")
+    parser.add_argument("--source", action="append", metavar="SPEC",
+                        help="Sensör kaynağı (birden çok verilebilir): sim[:HZ], "
+                             "serial:PORT[:BAUD], udp:HOST:PORT, replay:DOSYA[:HIZ]")
+    parser.add_argument("--motor", default="loop", metavar="SPEC",
+                        help="Motor komut aktarımı: loop, serial:PORT[:BAUD], udp:HOST:PORT")
+    parser.add_argument("--camera", type=int, metavar="INDEX",
+                        help="Bu kamerayı aç ve videoyu dağıt")
+    parser.add_argument("--host", default=FANOUT_HOST)
+    parser.add_argument("--port", type=int, default=FANOUT_PORT)
+    parser.add_argument("--log-dir", default=None, help="Telemetri kayıt klasörü")
+    parser.add_argument("--status-interval", type=float, default=5.0)
+    args = parser.parse_args()
+
+    sources = [source_from_spec(spec) for spec in args.source] if args.source else None
+    engine = TelemetryEngine(sources, log_dir=args.log_dir,
+                             motor_transport=transport_from_spec(args.motor))
+    camera = None
+    if args.camera is not None:
+        from camera import CameraCaptureThread
+
+        camera = CameraCaptureThread(args.camera)
+    server = FanoutServer(engine, args.host, args.port, camera=camera)
+    server.start()
+    print(f"Dağıtım sunucusu: {args.host}:{server.port}")
+    try:
+        while True:
+            time.sleep(args.status_interval)
+            print(format_stats(server.stats()), flush=True)
+    except KeyboardInterrupt:
+        pass
+    server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,288 @@
+import argparse
+import multiprocessing
+import pickle
+import time
+from multiprocessing import shared_memory
+
+import numpy as np
+
+MAGIC = 0x4F5246524D  # "ORFRM"
+# Başlık: magic, slot sayısı, yükseklik, genişlik, kanal, son seq
+HEADER_FIELDS = 6
+# Kare verisi bu hizadan başlar (önbellek satırı)
+ALIGN = 64
+
+
+class SharedFrameRing:
+    """`multiprocessing.shared_memory` üzerinde sabit sayıda kare yuvası.
+
+    Tek yazıcı (yakalama) kareyi doğrudan yuvaya yazar (`cap.read(yuva)`),
+    okuyucular (arayüz, kayıt, görüntü işleme süreci) aynı belleği
+    kopyalamadan görünüm olarak okur. Kilit yoktur: seq numarası `n` olan
+    kare `n % slots` yuvasındadır ve yuvanın seq alanı yazma sırasında -1
+    yapılır, bitince `n` olur. Okuyucu görünümü kullandıktan sonra
+    `valid(n)` ile yuvanın hâlâ aynı kareyi tuttuğunu doğrular; yuva en
+    erken `slots - 1` kare sonra yeniden yazılır.
+    """
+
+    def __init__(self, shape=None, slots=96, name=None, create=True):
+        if create:
+            h, w, c = shape
+            size = self._frames_offset(slots) + slots * h * w * c
+            self._shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        else:
+            self._shm = shared_memory.SharedMemory(name=name)
+        self._map(create, shape, slots)
+
+    @classmethod
+    def attach(cls, name):
+        """Başka süreçte oluşturulmuş halkaya bağlan"""
+        return cls(name=name, create=False)
+
+    @staticmethod
+    def _frames_offset(slots):
+        header = (HEADER_FIELDS + 2 * slots) * 8
+        return -(-header // ALIGN) * ALIGN
+
+    def _map(self, create, shape, slots):
+        buf = self._shm.buf
+        self._header = np.ndarray((HEADER_FIELDS,), dtype=np.int64, buffer=buf)
+        if create:
+            self._header[:] = (MAGIC, slots, *shape, 0)
+        elif self._header[0] != MAGIC:
+            raise ValueError(f"Kare halkası değil: {self._shm.name}")
+        slots, h, w, c = (int(v) for v in self._header[1:5])
+        self.slots = slots
+        self.shape = (h, w, c)
+        offset = HEADER_FIELDS * 8
+        self._seqs = np.ndarray((slots,), dtype=np.int64, buffer=buf, offset=offset)
+        self._times = np.ndarray((slots,), dtype=np.float64, buffer=buf,
+                                 offset=offset + slots * 8)
+        self._frames = np.ndarray((slots, h, w, c), dtype=np.uint8, buffer=buf,
+                                  offset=self._frames_offset(slots))
+        if create:
+            self._seqs[:] = 0
+
+    @property
+    def name(self):
+        return self._shm.name
+
+    @property
+    def latest_seq(self):
+        return int(self._header[5])
+
+    # --- Yazıcı -----------------------------------------------------------
+
+    def slot(self, seq):
+        """seq için yazılacak yuva (görünüm); yazma bitene kadar geçersiz işaretlenir"""
+        i = seq % self.slots
+        self._seqs[i] = -1
+        return self._frames[i]
+
+    def publish(self, seq, timestamp):
+        """Yuvaya yazma bitti: kareyi okuyuculara aç"""
+        i = seq % self.slots
+        self._times[i] = timestamp
+        self._seqs[i] = seq
+        self._header[5] = seq
+
+    # --- Okuyucu ----------------------------------------------------------
+
+    def valid(self, seq):
+        """Yuva hâlâ bu seq'i tutuyor mu (görünüm kullanıldıktan sonra sorulur)"""
+        return seq > 0 and int(self._seqs[seq % self.slots]) == seq
+
+    def get(self, seq):
+        """seq karesi: (zaman, görünüm) ya da üzerine yazıldıysa None"""
+        i = seq % self.slots
+        if int(self._seqs[i]) != seq:
+            return None
+        return float(self._times[i]), self._frames[i]
+
+    def latest(self):
+        """En yeni kare: (seq, zaman, görünüm) ya da None"""
+        seq = self.latest_seq
+        if seq <= 0:
+            return None
+        item = self.get(seq)
+        return None if item is None else (seq, *item)
+
+    # --- Kapatma ----------------------------------------------------------
+
+    def close(self):
+        """Bu süreçteki eşlemeyi bırak (dışarıda görünüm kaldıysa GC'ye bırakılır)"""
+        self._header = self._seqs = self._times = self._frames = None
+        try:
+            self._shm.close()
+        except BufferError:
+            pass
+
+    def unlink(self):
+        """Paylaşılan belleğin adını sil (sadece oluşturan süreç çağırır)"""
+        try:
+            self._shm.unlink()
+        except FileNotFoundError:
+            pass
+
+
+# --- Ölçüm -------------------------------------------------------------------
+
+class _BenchCapture:
+    """Ölçüm için sahte kamera: `into_slot` ise verilen diziye yazar (gerçek
+    kamera gibi), değilse her karede yeni dizi döndürür"""
+
+    def __init__(self, source, into_slot=True):
+        self.source = source
+        self.into_slot = into_slot
+
+    def isOpened(self):
+        return True
+
+    def read(self, image=None):
+        if image is not None and self.into_slot and image.shape == self.source.shape:
+            np.copyto(image, self.source)
+            return True, image
+        return True, self.source.copy()
+
+    def release(self):
+        pass
+
+
+def capture_copies(source, frames=64, slots=32, into_slot=True):
+    """Gerçek yakalama yolunda (`CameraCaptureThread._read`) kare başına kopya"""
+    from camera import CameraCaptureThread
+
+    camera = CameraCaptureThread(capture_factory=_BenchCapture, shared_slots=slots)
+    camera._cap = _BenchCapture(source, into_slot)
+    try:
+        for _ in range(frames):
+            ok, frame = camera._read()
+            camera._publish(frame, time.monotonic())
+    finally:
+        camera._release_transport()
+    return camera.copies / camera.captured
+
+
+def pickle_copies(frame):
+    """Kuyruk yolu: pickle ile bayta ve geri diziye çevirmede yapılan kopyalar"""
+    data = pickle.dumps(frame, protocol=pickle.HIGHEST_PROTOCOL)
+    raw = np.frombuffer(data, dtype=np.uint8)
+    copies = 0 if np.shares_memory(raw, frame) else 1
+    loaded = pickle.loads(data)
+    return copies + (0 if np.shares_memory(loaded, raw) else 1)
+
+
+def _shared_reader(name, count, results):
+    ring = SharedFrameRing.attach(name)
+    seen = torn = copies = 0
+    checksum = 0
+    last = 0
+    start = time.perf_counter()
+    while last < count:
+        seq = ring.latest_seq
+        if seq == last:
+            continue
+        item = ring.get(seq)
+        if item is None:
+            continue
+        _, frame = item
+        checksum += int(frame[::64, ::64, 0].sum())  # Kareye dokun (kopyasız)
+        if not np.shares_memory(frame, ring._frames):
+            copies += 1
+        if not ring.valid(seq):
+            torn += 1
+        seen += 1
+        last = seq
+    results.put(("shared", seen, torn, time.perf_counter() - start, copies))
+    ring.close()
+
+
+def _queue_reader(inbox, count, results):
+    seen = 0
+    checksum = 0
+    start = time.perf_counter()
+    while True:
+        seq, frame = inbox.get()
+        checksum += int(frame[::64, ::64, 0].sum())
+        seen += 1
+        if seq >= count:
+            break
+    results.put(("queue", seen, 0, time.perf_counter() - start, None))
+
+
+def benchmark(width, height, frames=300, slots=32):
+    """Paylaşılan bellek ile pickle'lı kuyruğu kıyasla (yazıcı mümkün olan en hızlı).
+
+    İki yol aynı ölçülür: `write_fps` yazıcı döngüsünün süresinden (kuyruk
+    dolunca bekleme dahil), `delivered_fps` yazmanın başından okuyucunun
+    son kareyi alıp bildirdiği ana kadar geçen süreden hesaplanır.
+    Paylaşılan bellekte okuyucu yalnız en yeni kareyi okur; `read` kaç
+    karenin görüldüğünü verir.
+
+    `copies_per_frame` ölçülür (kameranın kareyi ilk kez yazması hariç,
+    kullanıcı alanındaki kopyalar): paylaşılan bellekte gerçek yakalama
+    yolunun `copies / captured` oranı artı okuyucunun yuvayla bellek
+    paylaşmayan kare sayısı; kuyrukta kareyi pickle ile gönderip açarken
+    `np.shares_memory` ile görülen kopyalar.
+    """
+    ctx = multiprocessing.get_context("spawn")
+    source = np.random.randint(0, 255, (height, width, 3), dtype=np.uint8)
+    results = ctx.Queue()
+    report = {}
+
+    # Paylaşılan bellek: yazıcı yuvaya bir kez yazar, okuyucu kopyalamaz
+    ring = SharedFrameRing((height, width, 3), slots=slots)
+    reader = ctx.Process(target=_shared_reader, args=(ring.name, frames, results))
+    reader.start()
+    time.sleep(1.0)
+    start = time.perf_counter()
+    for seq in range(1, frames + 1):
+        np.copyto(ring.slot(seq), source)  # Kameranın yuvaya yazması yerine
+        ring.publish(seq, time.monotonic())
+    write_time = time.perf_counter() - start
+    kind, seen, torn, read_time, read_copies = results.get()
+    delivered_time = time.perf_counter() - start
+    reader.join()
+    ring.close()
+    ring.unlink()
+    copies = capture_copies(source, slots=slots) + read_copies / max(seen, 1)
+    report[kind] = {"write_fps": frames / write_time, "delivered_fps": frames / delivered_time,
+                    "read": seen, "torn": torn, "copies_per_frame": copies}
+
+    # Karşılaştırma: kareyi pickle ile kuyruğa koymak (yazma + pickle + unpickle)
+    inbox = ctx.Queue(maxsize=4)
+    reader = ctx.Process(target=_queue_reader, args=(inbox, frames, results))
+    reader.start()
+    time.sleep(1.0)
+    start = time.perf_counter()
+    for seq in range(1, frames + 1):
+        frame = source.copy()  # Kameranın yeni dizi ayırması yerine
+        inbox.put((seq, frame))
+    write_time = time.perf_counter() - start
+    kind, seen, torn, read_time, _ = results.get()
+    delivered_time = time.perf_counter() - start
+    reader.join()
+    copies = np.mean([pickle_copies(source.copy()) for _ in range(8)])
+    report[kind] = {"write_fps": frames / write_time, "delivered_fps": frames / delivered_time,
+                    "read": seen, "torn": torn, "copies_per_frame": float(copies)}
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Paylaşılan bellek kare aktarımı ölçümü")
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--slots", type=int, default=32)
+    args = parser.parse_args()
+
+    for width, height in ((1280, 720), (1920, 1080)):
+        report = benchmark(width, height, args.frames, args.slots)
+        print(f"{width}x{height}")
+        for kind, row in report.items():
+            print(f"  {kind:7s} yazma {row['write_fps']:8.0f} kare/s  "
+                  f"teslim {row['delivered_fps']:8.0f} kare/s  "
+                  f"kopya/kare: {row['copies_per_frame']:.2f}  "
+                  f"okunan: {row['read']}/{args.frames}  yırtık: {row['torn']}")
+
+
+if __name__ == "__main__":
+    main()
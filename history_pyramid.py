@@ -0,0 +1,348 @@
+import threading
+
+import numpy as np
+
+from telemetry import TELEMETRY_CHANNELS
+
+
+class _Level:
+    """Piramidin bir katı: her kova için kanal başına min/max örnek dizini"""
+
+    def __init__(self, n_channels, bucket, capacity=1024):
+        self.bucket = bucket  # Kova başına ham örnek sayısı
+        self.count = 0
+        self.vmin = np.empty((n_channels, capacity))
+        self.vmax = np.empty((n_channels, capacity))
+        self.imin = np.empty((n_channels, capacity), dtype=np.int64)
+        self.imax = np.empty((n_channels, capacity), dtype=np.int64)
+
+    def reserve(self, n):
+        capacity = self.vmin.shape[1]
+        if n <= capacity:
+            return
+        while capacity < n:
+            capacity *= 2
+        for name in ("vmin", "vmax", "imin", "imax"):
+            old = getattr(self, name)
+            new = np.empty((old.shape[0], capacity), dtype=old.dtype)
+            new[:, :self.count] = old[:, :self.count]
+            setattr(self, name, new)
+
+
+class MinMaxPyramid:
+    """Tüm görev boyunca telemetri geçmişi ve min/max seyreltme piramidi.
+
+    Ham örnekler büyüyen dizilerde saklanır. Kat 0'da her `base_bucket`
+    örneğin, üst katlarda alttaki `factor` kovanın en küçük ve en büyük
+    örneğinin dizini tutulur; katlar örnek geldikçe sadece yeni tamamlanan
+    kovalar için hesaplanır. `query()` istenen aralıkta piksel başına en
+    fazla iki nokta verecek katı seçer. Noktalar gerçek örnekler olduğu için
+    derinlik sapmaları ve basınç sıçramaları seyreltmeden sonra da görünür.
+
+    Tek iş parçacığından beslenir (çekirdeğin alma iş parçacığı);
+    `extend()`, `clear()`, `query()` ve `time_range()` kendi kilidini
+    tuttuğu için başka iş parçacığından (arayüz) sorgulanabilir.
+    """
+
+    def __init__(self, channels=TELEMETRY_CHANNELS, base_bucket=8, factor=4,
+                 capacity=65536):
+        self.channels = tuple(channels)
+        self._index = {name: i for i, name in enumerate(self.channels)}
+        self.base_bucket = base_bucket
+        self.factor = factor
+        self._t = np.empty(capacity)
+        self._v = np.empty((len(self.channels), capacity))
+        self._n = 0
+        self.levels = [_Level(len(self.channels), base_bucket)]
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return self._n
+
+    @property
+    def times(self):
+        return self._t[:self._n]
+
+    def column(self, name):
+        return self._v[self._index[name], :self._n]
+
+    def time_range(self):
+        with self._lock:
+            if not self._n:
+                return None
+            return float(self._t[0]), float(self._t[self._n - 1])
+
+    def clear(self):
+        with self._lock:
+            self._n = 0
+            self.levels = [_Level(len(self.channels), self.base_bucket)]
+
+    def extend(self, timestamps, block):
+        """Toplu ekleme; block (k, kanal) dizi. Yeni kovalar hemen hesaplanır"""
+        timestamps = np.asarray(timestamps, dtype=np.float64)
+        k = len(timestamps)
+        if not k:
+            return
+        with self._lock:
+            n = self._n + k
+            if n > len(self._t):
+                capacity = len(self._t)
+                while capacity < n:
+                    capacity *= 2
+                t = np.empty(capacity)
+                v = np.empty((len(self.channels), capacity))
+                t[:self._n] = self._t[:self._n]
+                v[:, :self._n] = self._v[:, :self._n]
+                self._t, self._v = t, v
+            self._t[self._n:n] = timestamps
+            self._v[:, self._n:n] = np.asarray(block, dtype=np.float64).T
+            self._n = n
+            self._update_levels()
+
+    def _update_levels(self):
+        # Kat 0: ham örneklerden
+        level = self.levels[0]
+        done, total = level.count, self._n // level.bucket
+        if total > done:
+            size = level.bucket
+            seg = self._v[:, done * size:total * size].reshape(len(self.channels), -1, size)
+            offsets = (done + np.arange(total - done)) * size
+            self._reduce(level, done, total, seg, seg, None, None, offsets)
+
+        # Üst katlar: alttaki katın kovalarından
+        depth = 0
+        while True:
+            lower = self.levels[depth]
+            if lower.count < self.factor:
+                return
+            if depth + 1 == len(self.levels):
+                self.levels.append(_Level(len(self.channels), lower.bucket * self.factor))
+            level = self.levels[depth + 1]
+            done, total = level.count, lower.count // self.factor
+            if total > done:
+                f = self.factor
+                span = slice(done * f, total * f)
+                shape = (len(self.channels), -1, f)
+                self._reduce(level, done, total,
+                             lower.vmin[:, span].reshape(shape),
+                             lower.vmax[:, span].reshape(shape),
+                             lower.imin[:, span].reshape(shape),
+                             lower.imax[:, span].reshape(shape), None)
+            depth += 1
+
+    @staticmethod
+    def _reduce(level, done, total, vmin, vmax, imin, imax, offsets):
+        """Kova gruplarından min/max seç; NaN'lar seçilmez"""
+        level.reserve(total)
+        lo = np.where(np.isnan(vmin), np.inf, vmin)
+        hi = np.where(np.isnan(vmax), -np.inf, vmax)
+        a_min = lo.argmin(axis=2)[..., None]
+        a_max = hi.argmax(axis=2)[..., None]
+        level.vmin[:, done:total] = np.take_along_axis(lo, a_min, 2)[..., 0]
+        level.vmax[:, done:total] = np.take_along_axis(hi, a_max, 2)[..., 0]
+        if offsets is not None:
+            level.imin[:, done:total] = a_min[..., 0] + offsets
+            level.imax[:, done:total] = a_max[..., 0] + offsets
+        else:
+            level.imin[:, done:total] = np.take_along_axis(imin, a_min, 2)[..., 0]
+            level.imax[:, done:total] = np.take_along_axis(imax, a_max, 2)[..., 0]
+        level.count = total
+
+    def _pick_level(self, n, n_px):
+        """Aralığı en fazla n_px kovaya bölen en ince kat"""
+        for level in self.levels:
+            if n / level.bucket <= n_px:
+                return level
+        return self.levels[-1]
+
+    def query(self, names, t0, t1, n_px):
+        """[t0, t1] aralığını n_px piksel için seyrelt.
+
+        Dönüş: {kanal: (zamanlar, değerler)}. Ham örnek sayısı 2·n_px'ten
+        azsa örnekler olduğu gibi, değilse her kova için zaman sırasında
+        min ve max örneği döner; maliyet aralığın uzunluğundan bağımsızdır.
+        """
+        if isinstance(names, str):
+            names = [names]
+        with self._lock:
+            rows = [self._index[name] for name in names]
+            t = self.times
+            i0 = int(np.searchsorted(t, t0, side="left"))
+            i1 = int(np.searchsorted(t, t1, side="right"))
+            # Çizgi görünür alanın kenarına kadar uzansın diye birer örnek taşır
+            i0, i1 = max(i0 - 1, 0), min(i1 + 1, self._n)
+            n = i1 - i0
+            if n <= 0:
+                return {name: (np.empty(0), np.empty(0)) for name in names}
+            if n <= 2 * n_px:
+                return {name: (t[i0:i1], self._v[row, i0:i1]) for name, row in zip(names, rows)}
+
+            level = self._pick_level(n, n_px)
+            size = level.bucket
+            b0 = i0 // size
+            b1 = min(-(-i1 // size), level.count)
+            imin = level.imin[rows, b0:b1]
+            imax = level.imax[rows, b0:b1]
+            # Kova içinde zaman sırası: önce gelen örnek önce
+            idx = np.empty((len(rows), 2 * (b1 - b0)), dtype=np.int64)
+            idx[:, 0::2] = np.minimum(imin, imax)
+            idx[:, 1::2] = np.maximum(imin, imax)
+
+            # Henüz tamamlanmamış son kova ham örneklerden (< bir kova)
+            tail_start = max(level.count * size, i0)
+            if tail_start < i1:
+                tail = self._v[rows, tail_start:i1]
+                lo = np.where(np.isnan(tail), np.inf, tail).argmin(axis=1)
+                hi = np.where(np.isnan(tail), -np.inf, tail).argmax(axis=1)
+                extra = np.stack([np.minimum(lo, hi), np.maximum(lo, hi)], axis=1) + tail_start
+                idx = np.concatenate([idx, extra], axis=1)
+
+            return {name: (t[idx[i]], self._v[row, idx[i]])
+                    for i, (name, row) in enumerate(zip(names, rows))}
+
+
+class HistoryExplorer:
+    """Tüm görev geçmişi için yakınlaştırılabilir/kaydırılabilir pencere.
+
+    Eksen sınırı değişince (araç çubuğu ile yakınlaştırma/kaydırma) veri
+    piramitten yeni genişliğe göre yeniden sorgulanır; yeni örnek geldikçe
+    saniyede bir tazelenir, "Canlı takip" açıksa görünüm sona kayar.
+    """
+
+    PANELS = (
+        ("Basınç (hPa)", ("basınç",), ("y",)),
+        ("Derinlik (m)", ("derinlik",), ("c",)),
+        ("İvme (g)", ("ivme_x", "ivme_y", "ivme_z"), ("r", "g", "b")),
+    )
+    REFRESH_MS = 1000
+
+    def __init__(self, root, pyramid, on_close=None):
+        # Arayüz kütüphaneleri pencere ilk açıldığında yüklenir (piramit arayüzsüz kullanılır)
+        import tkinter as tk
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
+        from matplotlib.ticker import FuncFormatter
+
+        self.root = root
+        self.pyramid = pyramid
+        self.on_close = on_close
+        self._requery_id = None
+        self._refresh_id = None
+        self._drawn_count = -1
+        self._origin = None
+
+        self.window = tk.Toplevel(root)
+        self.window.title("📈 TELEMETRİ GEÇMİŞİ")
+        self.window.geometry("1000x700")
+        self.window.configure(bg="#1a1a2e")
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+
+        bar = tk.Frame(self.window, bg="#162447")
+        bar.pack(side="top", fill="x")
+        tk.Button(bar, text="⤢ TÜMÜ", font=("Arial", 9, "bold"),
+                  bg="#3498db", fg="white", command=self.show_all).pack(side="left", padx=5, pady=4)
+        self.follow_var = tk.BooleanVar(value=True)
+        tk.Checkbutton(bar, text="Canlı takip", variable=self.follow_var,
+                       bg="#162447", fg="white", selectcolor="#0f3460",
+                       activebackground="#162447").pack(side="left", padx=5)
+        self.info_var = tk.StringVar(value="")
+        tk.Label(bar, textvariable=self.info_var, font=("Arial", 9),
+                 bg="#162447", fg="#b3b3cc").pack(side="right", padx=10)
+
+        self.figure = Figure(figsize=(10, 7), dpi=80, facecolor="#0f3460")
+        self.axes = []
+        self.lines = []
+        for i, (label, names, colors) in enumerate(self.PANELS):
+            ax = self.figure.add_subplot(len(self.PANELS), 1, i + 1,
+                                         sharex=self.axes[0] if self.axes else None)
+            ax.set_facecolor("#0f3460")
+            ax.tick_params(colors="white")
+            ax.set_ylabel(label, color="white")
+            ax.grid(True, color="#2c3e50")
+            ax.xaxis.set_major_formatter(FuncFormatter(self._clock))
+            self.axes.append(ax)
+            self.lines.append([(name, ax.plot([], [], color + "-", linewidth=1)[0])
+                               for name, color in zip(names, colors)])
+        self.axes[-1].set_xlabel("Görev süresi", color="white")
+
+        self.canvas = FigureCanvasTkAgg(self.figure, self.window)
+        toolbar = NavigationToolbar2Tk(self.canvas, self.window, pack_toolbar=False)
+        toolbar.update()
+        toolbar.pack(side="bottom", fill="x")
+        self.canvas.get_tk_widget().pack(fill="both", expand=True)
+        self.axes[0].callbacks.connect("xlim_changed", self._on_xlim)
+
+        self.show_all()
+        self.refresh()
+
+    @staticmethod
+    def _clock(seconds, _pos=None):
+        seconds = int(seconds)
+        sign = "-" if seconds < 0 else ""
+        seconds = abs(seconds)
+        return f"{sign}{seconds // 3600:d}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+
+    def _on_xlim(self, ax):
+        # Sürükleme sırasında birikmesin: boşta bir kez sorgula
+        if self._requery_id is None:
+            self._requery_id = self.root.after_idle(self.requery)
+
+    def show_all(self):
+        span = self.pyramid.time_range()
+        if span is None:
+            return
+        self._origin = span[0] if self._origin is None else self._origin
+        self.axes[0].set_xlim(span[0] - self._origin, max(span[1] - self._origin, 1.0))
+
+    def requery(self):
+        """Görünen aralığı ekran genişliğine göre seyreltip çiz"""
+        self._requery_id = None
+        span = self.pyramid.time_range()
+        if span is None:
+            return
+        if self._origin is None:
+            self._origin = span[0]
+        x0, x1 = self.axes[0].get_xlim()
+        n_px = max(int(self.axes[0].bbox.width), 100)
+
+        points = 0
+        for ax, lines in zip(self.axes, self.lines):
+            names = [name for name, _ in lines]
+            result = self.pyramid.query(names, x0 + self._origin, x1 + self._origin, n_px)
+            low, high = np.inf, -np.inf
+            for name, line in lines:
+                t, v = result[name]
+                line.set_data(t - self._origin, v)
+                points += len(t)
+                finite = v[np.isfinite(v)]
+                if len(finite):
+                    low, high = min(low, finite.min()), max(high, finite.max())
+            if np.isfinite(low):
+                pad = max((high - low) * 0.05, 1e-3)
+                ax.set_ylim(low - pad, high + pad)
+        self.info_var.set(f"{len(self.pyramid)} örnek · {points} nokta çizildi")
+        self.canvas.draw_idle()
+
+    def refresh(self):
+        """Yeni örnek geldiyse görünümü tazele (canlı takipte sona kaydır)"""
+        count = len(self.pyramid)
+        if count != self._drawn_count:
+            self._drawn_count = count
+            span = self.pyramid.time_range()
+            if span is not None and self.follow_var.get():
+                if self._origin is None:
+                    self._origin = span[0]
+                x0, x1 = self.axes[0].get_xlim()
+                end = span[1] - self._origin
+                self.axes[0].set_xlim(max(end - (x1 - x0), 0.0), end)
+            else:
+                self.requery()
+        self._refresh_id = self.root.after(self.REFRESH_MS, self.refresh)
+
+    def close(self):
+        for after_id in (self._requery_id, self._refresh_id):
+            if after_id:
+                self.root.after_cancel(after_id)
+        self.window.destroy()
+        if self.on_close:
+            self.on_close()
@@ -0,0 +1,155 @@
+import math
+import threading
+import time
+
+import numpy as np
+
+from metrics import LatencyHistogram
+from telemetry import TELEMETRY_CHANNELS
+
+# Bağlantı durumları (iyiden kötüye)
+LINK_OK = "AKTİF"
+LINK_DEGRADED = "ZAYIF"
+LINK_LOST = "KOPUK"
+LINK_WAITING = "BEKLENİYOR"
+
+# Örnek yaşı ve ardışık örnekler arası boşluk için kovalar (saniye)
+AGE_BUCKETS = (0.005, 0.01, 0.02, 0.05, 0.1, 0.2, 0.5, 1.0, 2.0, 5.0, math.inf)
+
+
+class SlidingRate:
+    """Kayan pencerede olay hızı (Hz), `n` sayaç için birlikte.
+
+    Pencere `buckets` dilime bölünür; ekleme ve okuma O(dilim), bellek
+    sabittir. Okunan hız, dolmakta olan dilim hariç son tam pencereye göre
+    hesaplanır, böylece dilim sınırında zıplamaz.
+    """
+
+    def __init__(self, n=1, window=2.0, buckets=20):
+        self.window = window
+        self.width = window / buckets
+        self._counts = np.zeros((buckets + 1, n), dtype=np.int64)
+        self._slot = None
+
+    def _advance(self, now):
+        slot = int(now // self.width)
+        if self._slot is None:
+            self._slot = slot
+            return
+        gap = slot - self._slot
+        if gap <= 0:
+            return
+        size = len(self._counts)
+        if gap >= size:
+            self._counts[:] = 0
+        else:
+            for s in range(self._slot + 1, slot + 1):
+                self._counts[s % size] = 0
+        self._slot = slot
+
+    def add(self, counts, now):
+        self._advance(now)
+        self._counts[self._slot % len(self._counts)] += counts
+
+    def rates(self, now):
+        self._advance(now)
+        current = self._counts[self._slot % len(self._counts)]
+        return (self._counts.sum(axis=0) - current) / self.window
+
+
+class LinkHealth:
+    """Sensör bağlantısının ölçülen sağlığı.
+
+    `observe()` hub'dan gelen her toplu örnekle çağrılır: kanal başına gelen
+    örnekler kayan pencerede sayılır, örnek yaşı (alınma -> arayüz) ve
+    ardışık örnekler arasındaki boşluk histogramlara yazılır. `check()`
+    bekçi köpeğidir: son örnek `heartbeat_timeout`tan eskiyse bağlantı
+    KOPUK, bir kez görülmüş bir kanal `channel_timeout`tan uzun susarsa ya
+    da toplam hız `min_rate`in altına inerse ZAYIF sayılır. Zaman
+    damgaları hub'ın alma zamanıdır, bu yüzden arayüz gecikse bile kopma
+    bir zaman aşımı içinde görülür. `observe()` (alma iş parçacığı) ve
+    `check()` (arayüz, durum) farklı iş parçacıklarından çağrılabilir.
+    """
+
+    def __init__(self, channels=TELEMETRY_CHANNELS, heartbeat_timeout=1.0,
+                 channel_timeout=3.0, min_rate=None, rate_window=2.0):
+        self.channels = tuple(channels)
+        self.heartbeat_timeout = heartbeat_timeout
+        self.channel_timeout = channel_timeout
+        self.min_rate = min_rate
+        self.rate = SlidingRate(len(self.channels) + 1, window=rate_window)
+        self.age = LatencyHistogram(AGE_BUCKETS)
+        self.gap = LatencyHistogram(AGE_BUCKETS)
+
+        self.received = 0
+        self.started = time.monotonic()
+        self.last_seen = None
+        self._channel_seen = np.full(len(self.channels), np.nan)
+        self.state = LINK_WAITING
+        self._lock = threading.Lock()
+
+    def observe(self, timestamps, arrivals, now=None):
+        """Toplu örnek: alma zamanları ve (k, kanal) geldi-mi maskesi"""
+        now = time.monotonic() if now is None else now
+        timestamps = np.asarray(timestamps, dtype=np.float64)
+        if not len(timestamps):
+            return
+        with self._lock:
+            arrivals = np.asarray(arrivals, dtype=bool)
+            counts = np.empty(len(self.channels) + 1, dtype=np.int64)
+            counts[0] = len(timestamps)
+            counts[1:] = arrivals.sum(axis=0)
+            self.rate.add(counts, now)
+
+            # Kanalın en son geldiği zaman
+            seen = np.where(arrivals, timestamps[:, None], -np.inf).max(axis=0)
+            seen[~np.isfinite(seen)] = np.nan
+            self._channel_seen = np.fmax(self._channel_seen, seen)
+
+            # Boşluklar: önceki topluluğun son örneğinden itibaren
+            previous = timestamps[:-1] if self.last_seen is None else \
+                np.concatenate(([self.last_seen], timestamps[:-1]))
+            current = timestamps[1:] if self.last_seen is None else timestamps
+            self.gap.record_many(current - previous)
+            # Yaş: sadece topluluğun en yeni örneği (arayüzün gördüğü değer)
+            self.age.record(now - timestamps[-1])
+
+            self.last_seen = timestamps[-1]
+            self.received += len(timestamps)
+
+    def check(self, now=None):
+        """Bekçi: durumu hesapla ve özetini döndür"""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            rates = self.rate.rates(now)
+            last_seen = self.last_seen
+            channel_seen = self._channel_seen
+            received = self.received
+        total_rate = float(rates[0])
+
+        silent = now - last_seen if last_seen is not None else now - self.started
+        stale = [name for name, seen in zip(self.channels, channel_seen)
+                 if np.isfinite(seen) and now - seen > self.channel_timeout]
+
+        if last_seen is None:
+            state = LINK_WAITING if silent <= self.heartbeat_timeout else LINK_LOST
+        elif silent > self.heartbeat_timeout:
+            state = LINK_LOST
+        elif stale or (self.min_rate is not None and total_rate < self.min_rate):
+            state = LINK_DEGRADED
+        else:
+            state = LINK_OK
+        self.state = state
+
+        return {
+            "state": state,
+            "rate": total_rate,
+            "channel_rates": {name: float(r) for name, r in zip(self.channels, rates[1:])},
+            "stale": stale,
+            "silent": silent,
+            "received": received,
+            "age_p50": self.age.percentile(50),
+            "age_p95": self.age.percentile(95),
+            "gap_p95": self.gap.percentile(95),
+            "gap_max": self.gap.max,
+        }
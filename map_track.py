@@ -0,0 +1,142 @@
+import math
+import time
+
+import numpy as np
+
+
+def mercator_pixels(lat, lon, zoom):
+    """Enlem/boylamı verilen yakınlaştırmada Web Mercator piksel koordinatına çevir"""
+    lat = np.radians(np.asarray(lat, dtype=np.float64))
+    scale = 256.0 * 2.0 ** zoom
+    x = (np.asarray(lon, dtype=np.float64) + 180.0) / 360.0 * scale
+    y = (1.0 - np.log(np.tan(lat) + 1.0 / np.cos(lat)) / math.pi) / 2.0 * scale
+    return x, y
+
+
+def douglas_peucker(x, y, tolerance):
+    """Douglas–Peucker: korunacak noktaların maskesi (uçlar her zaman korunur)"""
+    n = len(x)
+    keep = np.zeros(n, dtype=bool)
+    if n == 0:
+        return keep
+    keep[0] = keep[-1] = True
+    stack = [(0, n - 1)]
+    while stack:
+        start, end = stack.pop()
+        if end - start < 2:
+            continue
+        dx, dy = x[end] - x[start], y[end] - y[start]
+        px, py = x[start + 1:end] - x[start], y[start + 1:end] - y[start]
+        length = math.hypot(dx, dy)
+        if length == 0.0:
+            dist = np.hypot(px, py)
+        else:
+            dist = np.abs(px * dy - py * dx) / length
+        i = int(np.argmax(dist))
+        if dist[i] > tolerance:
+            mid = start + 1 + i
+            keep[mid] = True
+            stack.append((start, mid))
+            stack.append((mid, end))
+    return keep
+
+
+class TrackLayer:
+    """Haritada aracın izini artımlı çizer ve eski kısımları sadeleştirir.
+
+    Yeni noktalar sadece "aktif" kısa yola eklenir (`add_position`); aktif yol
+    `chunk_size` noktaya ulaşınca Douglas–Peucker ile piksel toleransına göre
+    sadeleştirilip donmuş bir yola çevrilir. Böylece güncelleme maliyeti
+    görevin uzunluğuyla büyümez, tam ham geçmiş ise `history`de kalır.
+    Harita sadece araç görünür alanın kenar payına girince ve en fazla
+    `recenter_interval` saniyede bir yeniden ortalanır.
+    """
+
+    def __init__(self, map_widget, chunk_size=100, tolerance_px=1.5,
+                 simplify_zoom=18, recenter_margin=0.2, recenter_interval=2.0,
+                 **path_options):
+        self.map_widget = map_widget
+        self.chunk_size = chunk_size
+        self.tolerance_px = tolerance_px
+        # Sadeleştirme bu yakınlaştırmadaki piksellere göre yapılır
+        # (kullanıcı yakınlaştırdığında iz kırıklaşmasın diye yüksek tutulur)
+        self.simplify_zoom = simplify_zoom
+        self.recenter_margin = recenter_margin
+        self.recenter_interval = recenter_interval
+        self.path_options = path_options
+
+        self.history = []
+        self._frozen = []
+        self._frozen_vertices = 0
+        self._active = None
+        self._active_points = []
+        self._last_recenter = -math.inf
+
+    @property
+    def vertex_count(self):
+        """Haritada çizilen toplam köşe sayısı"""
+        return self._frozen_vertices + len(self._active_points)
+
+    def append(self, lat, lon):
+        point = (lat, lon)
+        self.history.append(point)
+        self._active_points.append(point)
+
+        if self._active is None:
+            if len(self._active_points) >= 2:
+                self._active = self.map_widget.set_path(list(self._active_points),
+                                                        **self.path_options)
+        else:
+            self._active.add_position(lat, lon)
+
+        if len(self._active_points) >= self.chunk_size:
+            self._freeze()
+
+    def _freeze(self):
+        """Aktif yolu sadeleştirip dondur, son noktadan yeni aktif yol başlat"""
+        points = np.asarray(self._active_points)
+        zoom = max(self.simplify_zoom, getattr(self.map_widget, "zoom", 0))
+        x, y = mercator_pixels(points[:, 0], points[:, 1], zoom)
+        keep = douglas_peucker(x, y, self.tolerance_px)
+        simplified = [tuple(p) for p in points[keep]]
+
+        self._frozen.append(self.map_widget.set_path(simplified, **self.path_options))
+        self._frozen_vertices += len(simplified)
+        if self._active is not None:
+            self._active.delete()
+        self._active = None
+        self._active_points = [self._active_points[-1]]
+
+    def clear(self):
+        for path in self._frozen:
+            path.delete()
+        if self._active is not None:
+            self._active.delete()
+        self._frozen = []
+        self._frozen_vertices = 0
+        self._active = None
+        self._active_points = []
+        self.history = []
+        self._last_recenter = -math.inf
+
+    def maybe_recenter(self, lat, lon, now=None):
+        """Araç kenar payına girdiyse (ve süre dolduysa) haritayı ortala"""
+        now = time.monotonic() if now is None else now
+        if now - self._last_recenter < self.recenter_interval:
+            return False
+
+        widget = self.map_widget
+        width, height = widget.winfo_width(), widget.winfo_height()
+        center_lat, center_lon = widget.get_position()
+        zoom = widget.zoom
+        cx, cy = mercator_pixels(center_lat, center_lon, zoom)
+        mx, my = mercator_pixels(lat, lon, zoom)
+
+        limit_x = width / 2 * (1 - self.recenter_margin)
+        limit_y = height / 2 * (1 - self.recenter_margin)
+        if abs(mx - cx) <= limit_x and abs(my - cy) <= limit_y:
+            return False
+
+        widget.set_position(lat, lon)
+        self._last_recenter = now
+        return True
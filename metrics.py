@@ -0,0 +1,87 @@
+import bisect
+import math
+import threading
+
+import numpy as np
+
+# Varsayılan gecikme kovaları (saniye, üst sınırlar); sonuncusu sınırsız
+LATENCY_BUCKETS = (0.0005, 0.001, 0.002, 0.005, 0.01, 0.02, 0.05, 0.1, 0.2, 0.5, 1.0,
+                   math.inf)
+
+
+class LatencyHistogram:
+    """Sabit kovalı gecikme histogramı (iş parçacığı güvenli).
+
+    Kayıt O(log kova), bellek sabit; yüzdelikler kova üst sınırından
+    yaklaşık verilir. Kovalar Prometheus histogramıyla aynı anlamdadır
+    (değer <= üst sınır).
+    """
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        if self.buckets[-1] != math.inf:
+            self.buckets += (math.inf,)
+        self._counts = [0] * len(self.buckets)
+        self._lock = threading.Lock()
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, value):
+        i = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[i] += 1
+            self.count += 1
+            self.total += value
+            if value > self.max:
+                self.max = value
+
+    def record_many(self, values):
+        """Toplu kayıt (numpy ile tek geçişte)"""
+        values = np.asarray(values, dtype=np.float64)
+        if not len(values):
+            return
+        counts = np.bincount(np.searchsorted(self.buckets, values, side="left"),
+                             minlength=len(self.buckets))
+        with self._lock:
+            for i in np.flatnonzero(counts):
+                self._counts[i] += int(counts[i])
+            self.count += len(values)
+            self.total += float(values.sum())
+            self.max = max(self.max, float(values.max()))
+
+    def reset(self):
+        with self._lock:
+            self._counts = [0] * len(self.buckets)
+            self.count = 0
+            self.total = 0.0
+            self.max = 0.0
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, p):
+        """p (0-100) yüzdeliğinin üst sınırı; son kovadaysa gözlenen en büyük"""
+        with self._lock:
+            if not self.count:
+                return 0.0
+            target = self.count * p / 100.0
+            seen = 0
+            for bound, n in zip(self.buckets, self._counts):
+                seen += n
+                if seen >= target and n:
+                    return min(bound, self.max)
+            return self.max
+
+    def snapshot(self):
+        """Kova sınırı -> birikimli sayı, ve özet değerler"""
+        with self._lock:
+            counts = list(self._counts)
+            count, total, maximum = self.count, self.total, self.max
+        cumulative = []
+        running = 0
+        for bound, n in zip(self.buckets, counts):
+            running += n
+            cumulative.append((bound, running))
+        return {"buckets": cumulative, "count": count, "sum": total, "max": maximum}
@@ -0,0 +1,377 @@
+import json
+import socket
+import threading
+import time
+from collections import OrderedDict
+
+from metrics import LatencyHistogram
+
+# Seri port kütüphanesi kontrolü
+try:
+    import serial  # type: ignore
+except ImportError:
+    serial = None
+
+
+def encode_command(seq, command, value=None):
+    """Komutu tek satırlık JSON'a çevir: {"seq": 12, "cmd": "hız", "value": 50}"""
+    message = {"seq": seq, "cmd": command}
+    if value is not None:
+        message["value"] = value
+    return (json.dumps(message, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+def decode_messages(data):
+    """Gelen satırlardaki JSON nesneleri (bozuk satırlar atlanır)"""
+    messages = []
+    for line in data.split(b"\n"):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            message = json.loads(line)
+        except ValueError:
+            continue
+        if isinstance(message, dict):
+            messages.append(message)
+    return messages
+
+
+class CommandTransport:
+    """Komut aktarım arayüzü: `send(bayt)`, `recv(zaman_aşımı)`, `close()`.
+
+    `recv` veri yoksa zaman aşımında None döner; araç onayları
+    `{"ack": seq}` satırlarıdır.
+    """
+
+    name = "aktarım"
+
+    def send(self, data):
+        raise NotImplementedError
+
+    def recv(self, timeout):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class SerialTransport(CommandTransport):
+    def __init__(self, port, baudrate=115200):
+        if serial is None:
+            raise RuntimeError("Seri port için 'pip install pyserial' kurun.")
+        self.name = f"seri:{port}"
+        self._port = serial.Serial(port, baudrate, timeout=0.1, write_timeout=0.5)
+
+    def send(self, data):
+        self._port.write(data)
+
+    def recv(self, timeout):
+        self._port.timeout = timeout
+        return self._port.readline() or None
+
+    def close(self):
+        self._port.close()
+
+
+class UdpTransport(CommandTransport):
+    def __init__(self, host, port, local_port=0):
+        self.name = f"udp:{host}:{port}"
+        self._address = (host, port)
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._sock.bind(("0.0.0.0", local_port))
+
+    def send(self, data):
+        self._sock.sendto(data, self._address)
+
+    def recv(self, timeout):
+        self._sock.settimeout(timeout)
+        try:
+            data, _ = self._sock.recvfrom(4096)
+            return data
+        except socket.timeout:
+            return None
+        except OSError:
+            return None
+
+    def close(self):
+        self._sock.close()
+
+
+class LoopbackTransport(CommandTransport):
+    """Araç yerine geçen yerel aktarım: komutları kaydeder, gecikmeyle onaylar.
+
+    Testler ve araçsız çalışma içindir; `ack_delay` saniye sonra her komut
+    için `{"ack": seq}` döner. `received` gelen komutların listesidir.
+    """
+
+    name = "yerel"
+
+    def __init__(self, ack_delay=0.002):
+        self.ack_delay = ack_delay
+        self.received = []
+        self._acks = []
+        self._cond = threading.Condition()
+
+    def send(self, data):
+        due = time.monotonic() + self.ack_delay
+        with self._cond:
+            for message in decode_messages(data):
+                self.received.append(message)
+                self._acks.append((due, json.dumps({"ack": message["seq"]}).encode() + b"\n"))
+            self._cond.notify()
+
+    def recv(self, timeout):
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                if self._acks and self._acks[0][0] <= now:
+                    return self._acks.pop(0)[1]
+                wait = deadline - now
+                if self._acks:
+                    wait = min(wait, self._acks[0][0] - now)
+                if wait <= 0 and now >= deadline:
+                    return None
+                self._cond.wait(max(wait, 0.0))
+
+
+def transport_from_spec(spec):
+    """loop | serial:PORT[:BAUD] | udp:HOST:PORT"""
+    kind, _, rest = spec.partition(":")
+    if kind == "loop":
+        return LoopbackTransport()
+    if kind == "serial":
+        port, _, baud = rest.rpartition(":")
+        if not port or not baud.isdigit():
+            port, baud = rest, "115200"
+        return SerialTransport(port, int(baud))
+    if kind == "udp":
+        host, _, port = rest.rpartition(":")
+        return UdpTransport(host or "127.0.0.1", int(port))
+    raise ValueError(f"Bilinmeyen motor aktarımı: {spec}")
+
+
+class MotorCommandDispatcher:
+    """Motor komutlarını arka planda, araç komut hızında gönderir.
+
+    Arayüz hiçbir zaman beklemez: her komut bir anahtarla (hız, yön, özel)
+    bekleyenler sözlüğüne yazılır ve aynı anahtarın eski değeri ezilir
+    (kaydırıcı sürüklenirken sadece son hız gider, `coalesced`). Gönderici
+    iş parçacığı en fazla `rate_hz` komut/saniye gönderir. Acil durdurma
+    kuyruğu boşaltır, hız sınırını beklemez ve onay gelene kadar
+    `estop_retry` aralıkla yeniden gönderilir; `ESTOP_RETRIES` denemeden
+    sonra da onay gelmezse vazgeçilir, `estop_failures` artar ve "hata"
+    olayı bildirilir. Onay gecikmesi histogramda tutulur; `ack_timeout`
+    içinde onaylanmayan komutlar `timeouts` sayılır.
+
+    `on_ack` verilen komut, araç onu (ya da aynı anahtarda yerine geçen
+    komutu) onaylayınca onay iş parçacığında çağrılır; ezilmeden atılan
+    (acil durdurmanın boşalttığı) komutlar ve onaylanmayan acil durdurma
+    için hiç çağrılmaz.
+    """
+
+    ESTOP_RETRIES = 10
+
+    def __init__(self, transport, rate_hz=20.0, ack_timeout=1.0, estop_retry=0.1,
+                 on_event=None):
+        self.transport = transport
+        self.interval = 1.0 / rate_hz
+        self.ack_timeout = ack_timeout
+        self.estop_retry = estop_retry
+        self.on_event = on_event
+        self.ack_latency = LatencyHistogram()
+
+        self._cond = threading.Condition()
+        self._pending = OrderedDict()
+        self._estop = False
+        self._estop_seq = None
+        self._estop_tries = 0
+        self._estop_acks = []
+        self._in_flight = {}
+        self._seq = 0
+        self._last_send = -float("inf")
+        self._last_estop = -float("inf")
+        self._running = False
+        self._threads = []
+
+        # Ölçümler
+        self.submitted = 0
+        self.coalesced = 0
+        self.sent = 0
+        self.acked = 0
+        self.timeouts = 0
+        self.errors = 0
+        self.estop_failures = 0
+
+    # --- Yaşam döngüsü ----------------------------------------------------
+
+    def start(self):
+        if self._running:
+            return
+        self._running = True
+        self._threads = [
+            threading.Thread(target=self._send_loop, name="motor-sender", daemon=True),
+            threading.Thread(target=self._recv_loop, name="motor-acks", daemon=True),
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self, timeout=1.0):
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+        self.transport.close()
+
+    # --- Arayüz tarafı (bloklamaz) ----------------------------------------
+
+    def submit(self, key, command, value=None, on_ack=None):
+        """Komutu kuyruğa yaz; aynı anahtarda bekleyen komutun yerine geçer"""
+        with self._cond:
+            self.submitted += 1
+            callbacks = []
+            if key in self._pending:
+                self.coalesced += 1
+                callbacks = self._pending.pop(key)[2]
+            if on_ack is not None:
+                callbacks.append(on_ack)
+            self._pending[key] = (command, value, callbacks)
+            self._cond.notify()
+
+    def set_speed(self, percent):
+        self.submit("hız", "hız", int(percent))
+
+    def move(self, direction):
+        self.submit("yön", "yön", direction)
+
+    def special(self, name):
+        self.submit("özel", "özel", name)
+
+    def emergency_stop(self, on_ack=None):
+        """Bekleyen her şeyi at, durdurmayı hemen gönder"""
+        with self._cond:
+            self._pending.clear()
+            if on_ack is not None:
+                self._estop_acks.append(on_ack)
+            self._estop = True
+            self._estop_seq = None
+            self._estop_tries = 0
+            self._cond.notify()
+
+    # --- Gönderici --------------------------------------------------------
+
+    def _due(self, now):
+        """Sıradaki gönderimin zamanı; gönderilecek bir şey yoksa None"""
+        if self._estop:
+            if self._estop_seq is None:
+                return now
+            return self._last_estop + self.estop_retry
+        if self._pending:
+            return self._last_send + self.interval
+        return None
+
+    def _send_loop(self):
+        while True:
+            with self._cond:
+                while True:
+                    if not self._running:
+                        return
+                    now = time.monotonic()
+                    due = self._due(now)
+                    if due is not None and due <= now:
+                        break
+                    self._cond.wait(None if due is None else due - now)
+
+                failed = self._estop and self._estop_tries >= self.ESTOP_RETRIES
+                if failed:
+                    # Son denemeden de onay gelmedi: vazgeç, bekleyen geri
+                    # çağrılar sonraki acil durdurmanın onayına kalmasın
+                    self._estop = False
+                    self._estop_acks = []
+                    self.estop_failures += 1
+                elif self._estop:
+                    # Hız sınırı beklenmez; onay gelene kadar yeniden gönderilir
+                    name, value, callbacks = "acil_dur", None, ()
+                    self._estop_tries += 1
+                    self._last_estop = now
+                else:
+                    _, (name, value, callbacks) = self._pending.popitem(last=False)
+                    self._last_send = now
+                if not failed:
+                    self._seq += 1
+                    seq = self._seq
+                    if name == "acil_dur":
+                        self._estop_seq = seq
+                    self._in_flight[seq] = (now, name, callbacks)
+                self._expire(now)
+
+            if failed:
+                self._notify("hata", "acil_dur", f"{self.ESTOP_RETRIES} denemede onay gelmedi")
+                continue
+            try:
+                self.transport.send(encode_command(seq, name, value))
+                self.sent += 1
+                self._notify("gönderildi", name, value)
+            except Exception as e:
+                self.errors += 1
+                self._notify("hata", name, str(e))
+
+    def _expire(self, now):
+        for seq, (sent_at, _, _) in list(self._in_flight.items()):
+            if now - sent_at > self.ack_timeout:
+                del self._in_flight[seq]
+                self.timeouts += 1
+
+    # --- Onaylar ----------------------------------------------------------
+
+    def _recv_loop(self):
+        while self._running:
+            try:
+                data = self.transport.recv(0.1)
+            except Exception:
+                time.sleep(0.1)
+                continue
+            if not data:
+                continue
+            now = time.monotonic()
+            for message in decode_messages(data):
+                seq = message.get("ack")
+                with self._cond:
+                    entry = self._in_flight.pop(seq, None)
+                    callbacks = entry[2] if entry is not None else ()
+                    if entry is not None and entry[1] == "acil_dur":
+                        # Acil durdurma onaylandı: yeniden gönderimi kes
+                        self._estop = False
+                        callbacks, self._estop_acks = self._estop_acks, []
+                    self._cond.notify()
+                if entry is None:
+                    continue
+                self.acked += 1
+                self.ack_latency.record(now - entry[0])
+                for callback in callbacks:
+                    callback()
+                self._notify("onay", entry[1], now - entry[0])
+
+    def _notify(self, event, name, value):
+        if self.on_event:
+            self.on_event(event, name, value)
+
+    def stats(self):
+        return {
+            "transport": self.transport.name,
+            "submitted": self.submitted,
+            "coalesced": self.coalesced,
+            "sent": self.sent,
+            "acked": self.acked,
+            "timeouts": self.timeouts,
+            "errors": self.errors,
+            "estop_failures": self.estop_failures,
+            "pending": len(self._pending),
+            "in_flight": len(self._in_flight),
+            "ack_p50": self.ack_latency.percentile(50),
+            "ack_p95": self.ack_latency.percentile(95),
+            "ack_max": self.ack_latency.max,
+        }
@@ -0,0 +1,269 @@
+import functools
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from metrics import LatencyHistogram
+
+# Aşama süreleri için kovalar: 10 µs .. ~1.3 s, her kova bir öncekinin 2^(1/4) katı
+STAGE_BUCKETS = tuple(10e-6 * 2 ** (k / 4) for k in range(68))
+
+# Dışa aktarımda metrik adlarının öneki
+METRIC_PREFIX = "oruc"
+
+
+class PerfRegistry:
+    """Sıcak yol ölçümleri: aşama süreleri, sayaçlar ve anlık değerler.
+
+    Süreler monotonik `perf_counter` ile ölçülüp sabit kovalı histograma
+    yazılır (çağrı başına birkaç µs). `enabled` kapalıyken `timed` sarmalı
+    sadece bir bayrak kontrolü yapar. Başka modüllerin histogramları da
+    (`add_histogram`) aynı dışa aktarıma eklenebilir.
+    """
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.stages = {}
+        self.counters = {}
+        self.gauges = {}
+        self.histograms = {}
+        self._lock = threading.Lock()
+
+    def stage(self, name):
+        histogram = self.stages.get(name)
+        if histogram is None:
+            with self._lock:
+                histogram = self.stages.setdefault(name, LatencyHistogram(STAGE_BUCKETS))
+        return histogram
+
+    def record(self, name, seconds):
+        if self.enabled:
+            self.stage(name).record(seconds)
+
+    def timed(self, name):
+        """Fonksiyonun her çağrısını `name` aşaması olarak ölçen dekoratör"""
+        def decorate(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                start = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.stage(name).record(time.perf_counter() - start)
+            return wrapper
+        return decorate
+
+    def count(self, name, n=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def gauge(self, name, value):
+        self.gauges[name] = value
+
+    def add_histogram(self, name, histogram):
+        """Başka bir bileşenin histogramını dışa aktarıma ekle"""
+        self.histograms[name] = histogram
+
+    def reset(self):
+        for histogram in list(self.stages.values()):
+            histogram.reset()
+
+    def summary(self):
+        """Aşama başına sayı, p50, p99, en büyük (saniye)"""
+        rows = {}
+        for name, histogram in sorted(self.stages.items()):
+            rows[name] = {
+                "count": histogram.count,
+                "p50": histogram.percentile(50),
+                "p99": histogram.percentile(99),
+                "max": histogram.max,
+            }
+        return rows
+
+    def prometheus_text(self):
+        """Prometheus metin biçiminde tüm ölçümler"""
+        lines = []
+
+        def histogram_lines(metric, histogram, labels=""):
+            snapshot = histogram.snapshot()
+            sep = "," if labels else ""
+            for bound, cumulative in snapshot["buckets"]:
+                le = "+Inf" if bound == float("inf") else f"{bound:.6g}"
+                lines.append(f'{metric}_bucket{{{labels}{sep}le="{le}"}} {cumulative}')
+            suffix = f"{{{labels}}}" if labels else ""
+            lines.append(f"{metric}_sum{suffix} {snapshot['sum']:.9g}")
+            lines.append(f"{metric}_count{suffix} {snapshot['count']}")
+
+        metric = f"{METRIC_PREFIX}_stage_seconds"
+        lines.append(f"# TYPE {metric} histogram")
+        for name, histogram in sorted(self.stages.items()):
+            histogram_lines(metric, histogram, f'stage="{name}"')
+
+        for name, histogram in sorted(self.histograms.items()):
+            metric = f"{METRIC_PREFIX}_{name}_seconds"
+            lines.append(f"# TYPE {metric} histogram")
+            histogram_lines(metric, histogram)
+
+        for name, value in sorted(self.counters.items()):
+            metric = f"{METRIC_PREFIX}_{name}_total"
+            lines.append(f"# TYPE {metric} counter")
+            lines.append(f"{metric} {value}")
+
+        for name, value in sorted(self.gauges.items()):
+            metric = f"{METRIC_PREFIX}_{name}"
+            lines.append(f"# TYPE {metric} gauge")
+            lines.append(f"{metric} {value:.9g}")
+        return "\n".join(lines) + "\n"
+
+
+# Varsayılan kayıt: modüller `REGISTRY.timed(...)` ile doğrudan kullanır
+REGISTRY = PerfRegistry()
+
+
+def timed(name, registry=REGISTRY):
+    return registry.timed(name)
+
+
+class TkLagProbe:
+    """Tk olay döngüsü gecikmesi: `interval_ms` sonrası için kurulan `after`
+    çağrısının ne kadar geç çalıştığını "tk_gecikme" aşaması olarak yazar"""
+
+    def __init__(self, root, registry=REGISTRY, interval_ms=50):
+        self.root = root
+        self.registry = registry
+        self.interval = interval_ms / 1000.0
+        self._after_id = None
+        self._expected = None
+
+    def start(self):
+        self._expected = time.perf_counter() + self.interval
+        self._after_id = self.root.after(int(self.interval * 1000), self._fire)
+
+    def _fire(self):
+        now = time.perf_counter()
+        self.registry.record("tk_gecikme", max(now - self._expected, 0.0))
+        self._expected = now + self.interval
+        self._after_id = self.root.after(int(self.interval * 1000), self._fire)
+
+    def stop(self):
+        if self._after_id:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+
+
+class PerfOverlay:
+    """Ana pencerenin sağ üst köşesinde aşama başına p50/p99 tablosu (F12)"""
+
+    def __init__(self, root, registry=REGISTRY, refresh_ms=500, key="<F12>"):
+        import tkinter as tk  # Arayüzsüz çalışmada perf tkinter'sız yüklenebilsin
+
+        self.root = root
+        self.registry = registry
+        self.refresh_ms = refresh_ms
+        self.visible = False
+        self._after_id = None
+        self.label = tk.Label(root, font=("Courier", 9), justify="left", anchor="nw",
+                              bg="#000000", fg="#00ff00", padx=6, pady=4)
+        root.bind(key, lambda e: self.toggle())
+
+    def toggle(self):
+        if self.visible:
+            self.visible = False
+            self.label.place_forget()
+            if self._after_id:
+                self.root.after_cancel(self._after_id)
+                self._after_id = None
+        else:
+            self.visible = True
+            self.label.place(relx=1.0, rely=0.0, anchor="ne", x=-10, y=10)
+            self.label.lift()
+            self.refresh()
+
+    def refresh(self):
+        lines = [f"{'aşama':<14}{'n':>7}{'p50 ms':>9}{'p99 ms':>9}{'max ms':>9}"]
+        for name, row in self.registry.summary().items():
+            lines.append(f"{name:<14}{row['count']:>7}{row['p50'] * 1000:>9.2f}"
+                         f"{row['p99'] * 1000:>9.2f}{row['max'] * 1000:>9.2f}")
+        for name, value in sorted(self.registry.counters.items()):
+            lines.append(f"{name:<14}{value:>7}")
+        self.label.config(text="\n".join(lines))
+        self._after_id = self.root.after(self.refresh_ms, self.refresh)
+
+
+class MetricsExporter:
+    """Ölçümleri dosyaya (atomik, `interval` saniyede bir) ve/veya yerel HTTP
+    uç noktasına (`/metrics`, Prometheus metin biçimi) aktarır"""
+
+    def __init__(self, registry=REGISTRY, path=None, port=None, host="127.0.0.1",
+                 interval=5.0):
+        self.registry = registry
+        self.path = path
+        self.port = port
+        self.host = host
+        self.interval = interval
+        self._server = None
+        self._stop = threading.Event()
+        self._threads = []
+
+    def start(self):
+        if self.path:
+            thread = threading.Thread(target=self._write_loop, name="metrics-file",
+                                      daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        if self.port is not None:
+            registry = self.registry
+
+            class Handler(BaseHTTPRequestHandler):
+                def do_GET(self):
+                    if self.path.split("?")[0] not in ("/", "/metrics"):
+                        self.send_error(404)
+                        return
+                    body = registry.prometheus_text().encode("utf-8")
+                    self.send_response(200)
+                    self.send_header("Content-Type", "text/plain; version=0.0.4")
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+
+                def log_message(self, format, *args):
+                    pass
+
+            self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+            self.port = self._server.server_address[1]
+            thread = threading.Thread(target=self._server.serve_forever,
+                                      name="metrics-http", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def write(self):
+        """Dosyayı bir kez yaz (yarım dosya okunmasın diye geçiciden taşı)"""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp = self.path + ".tmp"
+        with open(temp, "w", encoding="utf-8") as f:
+            f.write(self.registry.prometheus_text())
+        os.replace(temp, self.path)
+
+    def _write_loop(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.write()
+            except OSError as e:
+                print(f"Ölçüm dosyası yazılamadı: {e}")
+
+    def stop(self):
+        self._stop.set()
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        if self.path:
+            try:
+                self.write()
+            except OSError:
+                pass
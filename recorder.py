@@ -0,0 +1,192 @@
+import csv
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+
+import cv2
+
+
+class VideoRecorder:
+    """Kamera karelerini arka planda, zaman bölümlü dosyalara kaydeder.
+
+    Kareler sınırlı bir kuyruk üzerinden kodlayıcı iş parçacığına gider;
+    `submit()` asla beklemez. Kuyruk doluysa `drop_policy`'ye göre en eski
+    ("oldest") ya da gelen ("newest") kare atılır ve sayılır. Her bölüm
+    (`seg_0001.avi`) yanında kare numarası, seq ve zaman damgalarını tutan
+    bir dizin dosyası (`seg_0001.csv`) bulunur; çökme durumunda en fazla bir
+    bölüm kaybolur.
+
+    Kareler paylaşılan bellek yuvalarıysa `frame_valid(seq)` verilmelidir:
+    kuyrukta beklerken yuvası yeniden yazılan kare kaydedilmez, `overrun`
+    olarak sayılır.
+    """
+
+    def __init__(self, output_dir="recordings", segment_seconds=60.0, fps=30.0,
+                 fourcc="MJPG", queue_size=60, drop_policy="oldest"):
+        if drop_policy not in ("oldest", "newest"):
+            raise ValueError(f"Geçersiz drop_policy: {drop_policy}")
+        self.output_dir = output_dir
+        self.segment_seconds = segment_seconds
+        self.fps = fps
+        self.fourcc = cv2.VideoWriter_fourcc(*fourcc)
+        self.drop_policy = drop_policy
+        self.frame_valid = None
+
+        self.session_dir = None
+        self.recording = False
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._thread = None
+
+        # Monotonik zamanı duvar saatine çevirmek için fark
+        self._wall_offset = 0.0
+
+        # Ölçümler
+        self.submitted = 0
+        self.dropped = 0
+        self.written = 0
+        self.overrun = 0
+        self.segments = 0
+        self.error = None
+
+    def start(self, fps=None):
+        """Yeni kayıt oturumu başlat"""
+        if self.recording:
+            return self.session_dir
+        if fps:
+            self.fps = fps
+        stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        self.session_dir = os.path.join(self.output_dir, f"rec_{stamp}")
+        os.makedirs(self.session_dir, exist_ok=True)
+
+        self._wall_offset = time.time() - time.monotonic()
+        self.submitted = self.dropped = self.written = self.overrun = self.segments = 0
+        self.error = None
+        self.recording = True
+        self._thread = threading.Thread(target=self._run, name="video-recorder",
+                                        daemon=True)
+        self._thread.start()
+        return self.session_dir
+
+    def stop(self, timeout=5.0):
+        """Kuyruktaki kareleri yazıp oturumu kapat"""
+        if not self.recording:
+            return
+        self.recording = False
+        # Bitiş işareti kuyruk dolu olsa bile yerleşmeli
+        while True:
+            try:
+                self._queue.put_nowait(None)
+                break
+            except queue.Full:
+                try:
+                    self._queue.get_nowait()
+                    self.dropped += 1
+                except queue.Empty:
+                    pass
+        if self._thread:
+            self._thread.join(timeout)
+        self._thread = None
+
+    def submit(self, seq, timestamp, frame):
+        """Kareyi kuyruğa koy (bloklamaz); atıldıysa False"""
+        if not self.recording:
+            return False
+        self.submitted += 1
+        item = (seq, timestamp, frame)
+        try:
+            self._queue.put_nowait(item)
+            return True
+        except queue.Full:
+            pass
+
+        self.dropped += 1
+        if self.drop_policy == "newest":
+            return False
+        try:
+            self._queue.get_nowait()
+        except queue.Empty:
+            pass
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            return False
+        return True
+
+    def stats(self):
+        return {
+            "recording": self.recording,
+            "queue_depth": self._queue.qsize(),
+            "queue_size": self._queue.maxsize,
+            "submitted": self.submitted,
+            "dropped": self.dropped,
+            "written": self.written,
+            "overrun": self.overrun,
+            "segments": self.segments,
+        }
+
+    def _run(self):
+        writer = None
+        index_file = None
+        index = None
+        segment_start = 0.0
+        frame_size = None
+        frame_no = 0
+        last_flush = time.monotonic()
+
+        try:
+            while True:
+                item = self._queue.get()
+                if item is None:
+                    break
+                seq, timestamp, frame = item
+                if self.frame_valid is not None:
+                    # Kare paylaşılan yuvaya bakar: kodlama sürerken yakalama
+                    # üzerine yazabileceği için kopyala, kopya bitince yeniden doğrula
+                    if not self.frame_valid(seq):
+                        self.overrun += 1
+                        continue
+                    frame = frame.copy()
+                    if not self.frame_valid(seq):
+                        self.overrun += 1
+                        continue
+                size = (frame.shape[1], frame.shape[0])
+
+                # Süre dolduysa veya kare boyutu değiştiyse yeni bölüme geç
+                if (writer is None or size != frame_size
+                        or timestamp - segment_start >= self.segment_seconds):
+                    if writer is not None:
+                        writer.release()
+                        index_file.close()
+                    self.segments += 1
+                    base = os.path.join(self.session_dir, f"seg_{self.segments:04d}")
+                    writer = cv2.VideoWriter(base + ".avi", self.fourcc, self.fps, size)
+                    if not writer.isOpened():
+                        raise RuntimeError(f"VideoWriter açılamadı: {base}.avi")
+                    index_file = open(base + ".csv", "w", newline="")
+                    index = csv.writer(index_file)
+                    index.writerow(["frame", "seq", "monotonic", "wall"])
+                    segment_start = timestamp
+                    frame_size = size
+                    frame_no = 0
+
+                writer.write(frame)
+                index.writerow([frame_no, seq, f"{timestamp:.6f}",
+                                f"{timestamp + self._wall_offset:.6f}"])
+                frame_no += 1
+                self.written += 1
+
+                now = time.monotonic()
+                if now - last_flush >= 1.0:
+                    index_file.flush()
+                    last_flush = now
+        except Exception as e:
+            self.error = str(e)
+            self.recording = False
+            print(f"Video kayıt hatası: {e}")
+        finally:
+            if writer is not None:
+                writer.release()
+            if index_file is not None:
+                index_file.close()
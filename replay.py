@@ -0,0 +1,280 @@
+import csv
+import glob
+import os
+import time
+import tkinter as tk
+
+import numpy as np
+
+from state_estimator import StateEstimator
+from telemetry_log import TelemetryLogReader
+
+# Oynatma hızları (kayıt saniyesi / gerçek saniye)
+REPLAY_SPEEDS = (0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 16.0)
+
+
+class VideoReplay:
+    """Bir kayıt oturumunun bölümlerinden (seg_XXXX.avi/.csv) zamana göre kare okur"""
+
+    def __init__(self, session_dir):
+        times, segments, frames = [], [], []
+        self.paths = []
+        for seg_no, csv_path in enumerate(sorted(glob.glob(os.path.join(session_dir, "seg_*.csv")))):
+            self.paths.append(csv_path[:-4] + ".avi")
+            with open(csv_path, newline="") as f:
+                for row in csv.DictReader(f):
+                    times.append(float(row["monotonic"]))
+                    segments.append(seg_no)
+                    frames.append(int(row["frame"]))
+
+        order = np.argsort(times, kind="stable")
+        self.times = np.asarray(times)[order]
+        self.segments = np.asarray(segments, dtype=int)[order]
+        self.frames = np.asarray(frames, dtype=int)[order]
+
+        self._cap = None
+        self._cap_segment = -1
+        self._next_frame = 0
+        self._shown = -1
+        self._frame = None
+
+    def __len__(self):
+        return len(self.times)
+
+    def frame_at(self, t):
+        """t anında ekranda olması gereken kare (yoksa None)"""
+        i = int(np.searchsorted(self.times, t, side="right")) - 1
+        if i < 0:
+            return None
+        if i == self._shown:
+            return self._frame
+
+        import cv2  # Sadece video oynatılırken gerekir
+
+        segment, frame_no = int(self.segments[i]), int(self.frames[i])
+        if segment != self._cap_segment:
+            if self._cap is not None:
+                self._cap.release()
+            self._cap = cv2.VideoCapture(self.paths[segment])
+            self._cap_segment = segment
+            self._next_frame = 0
+
+        # Yakın ileri kareler için grab() ile atla, aksi halde konumlan
+        skip = frame_no - self._next_frame
+        if skip < 0 or skip > 15:
+            self._cap.set(cv2.CAP_PROP_POS_FRAMES, frame_no)
+        else:
+            for _ in range(skip):
+                self._cap.grab()
+        ret, frame = self._cap.read()
+        self._next_frame = frame_no + 1
+        if ret:
+            self._shown = i
+            self._frame = frame
+        return self._frame
+
+    def close(self):
+        if self._cap is not None:
+            self._cap.release()
+            self._cap = None
+
+
+class ReplayController:
+    """Kayıtlı telemetriyi (ve videoyu) arayüzün canlı güncelleme yollarından oynatır.
+
+    Kayıttan okunan tüm örnekler telemetri deposuna toplu eklenir; grafik,
+    sensör değerleri, batarya, harita ve kamera ise saniyede `display_fps`
+    kez, sadece son değerle güncellenir. Böylece 16× hızda bile Tk olay
+    kuyruğuna kayıt hızıyla değil ekran hızıyla iş düşer. Konum ve yönelim
+    canlıdaki gibi durum tahmincisinden gelir; tahminci oynatmaya ait
+    örneklerle güncellenir ve her atlamada sıfırlanıp önceki pencereyle ısınır.
+    """
+
+    # Harita güncellemesi (iz yeniden çizimi) için en kısa aralık (gerçek saniye)
+    MAP_INTERVAL = 0.5
+
+    def __init__(self, app, log_path, video_dir=None, speed=1.0, display_fps=30,
+                 preload_seconds=25.0):
+        self.app = app
+        self.reader = TelemetryLogReader(log_path)
+        if not len(self.reader):
+            raise ValueError(f"Telemetri kaydı boş: {log_path}")
+        self.video = VideoReplay(video_dir) if video_dir else None
+        self.display_fps = display_fps
+        self.preload_seconds = preload_seconds
+        self.speed = min(max(speed, REPLAY_SPEEDS[0]), REPLAY_SPEEDS[-1])
+        self.paused = False
+        self.estimator = StateEstimator(app.telemetry.channels)
+
+        self.t_first, self.t_last = self.reader.time_range()
+        self.position = self.t_first
+        self._index = 0
+        self._anchor_wall = time.monotonic()
+        self._anchor_pos = self.position
+        self._last_map = 0.0
+        self._dragging = False
+        self._after_id = None
+
+        # Geçmiş penceresi kaydın tamamını gösterir
+        app.history.clear()
+        self._push(self.reader.records, app.history)
+
+        self.create_controls()
+        self.seek(self.t_first)
+        self.tick()
+
+    # --- Kontroller -------------------------------------------------------
+
+    def create_controls(self):
+        """Başlığın altına oynatma çubuğunu yerleştir"""
+        bar = tk.Frame(self.app.main_container, bg="#162447")
+        bar.pack(fill="x", pady=(0, 10), after=self.app.header_frame)
+
+        self.play_button = tk.Button(bar, text="⏸", width=3,
+                                     font=("Arial", 11, "bold"),
+                                     bg="#3498db", fg="white",
+                                     command=self.toggle_pause)
+        self.play_button.pack(side="left", padx=(10, 5), pady=5)
+
+        self.speed_var = tk.StringVar(value=self._speed_text(self.speed))
+        speed_menu = tk.OptionMenu(bar, self.speed_var,
+                                   *[self._speed_text(s) for s in REPLAY_SPEEDS],
+                                   command=self._on_speed)
+        speed_menu.config(bg="#0f3460", fg="white", highlightthickness=0)
+        speed_menu.pack(side="left", padx=5)
+
+        self.seek_var = tk.DoubleVar(value=0.0)
+        seek = tk.Scale(bar, from_=0, to=self.t_last - self.t_first,
+                        resolution=0.1, orient="horizontal", showvalue=False,
+                        variable=self.seek_var,
+                        bg="#162447", fg="#00ff00",
+                        highlightthickness=0, troughcolor="#2c3e50")
+        seek.pack(side="left", fill="x", expand=True, padx=10)
+        seek.bind("<ButtonPress-1>", self._on_seek_press)
+        seek.bind("<ButtonRelease-1>", self._on_seek_release)
+
+        self.time_var = tk.StringVar(value="")
+        tk.Label(bar, textvariable=self.time_var,
+                 font=("Arial", 10, "bold"),
+                 bg="#162447", fg="#00ffff").pack(side="right", padx=10)
+
+        root = self.app.root
+        root.bind("<space>", lambda e: self.toggle_pause())
+        root.bind("<Left>", lambda e: self.seek(self.position - 10))
+        root.bind("<Right>", lambda e: self.seek(self.position + 10))
+
+    @staticmethod
+    def _speed_text(speed):
+        return f"{speed:g}×"
+
+    def _on_speed(self, text):
+        self.set_speed(float(text.rstrip("×")))
+
+    def _on_seek_press(self, event):
+        self._dragging = True
+
+    def _on_seek_release(self, event):
+        self._dragging = False
+        self.seek(self.t_first + self.seek_var.get())
+
+    def toggle_pause(self):
+        self.paused = not self.paused
+        self._rebase()
+        self.play_button.config(text="▶" if self.paused else "⏸")
+
+    def set_speed(self, speed):
+        self.speed = min(max(speed, REPLAY_SPEEDS[0]), REPLAY_SPEEDS[-1])
+        self.speed_var.set(self._speed_text(self.speed))
+        self._rebase()
+
+    def _rebase(self):
+        """Hız/duraklatma değişince saat referansını şimdiki konuma taşı"""
+        self._anchor_wall = time.monotonic()
+        self._anchor_pos = self.position
+
+    # --- Oynatma ----------------------------------------------------------
+
+    def seek(self, t):
+        """Zaman dizini üzerinden doğrudan konumlan (baştan tarama yok)"""
+        t = min(max(t, self.t_first), self.t_last)
+        self.position = t
+        self._index = self.reader.find(t, side="right")
+        self._rebase()
+
+        # Grafik penceresini konumdan önceki kayıtlarla doldur
+        start = self.reader.find(t - self.preload_seconds)
+        self.app.telemetry.clear()
+        self.app.reset_map_track()
+        self.estimator.reset()
+        self._push(self.reader.records[start:self._index])
+        self._last_map = 0.0
+        self._apply_display()
+
+    def _push(self, records, target=None):
+        """Kayıtları telemetri deposuna (ya da target'a) toplu ekle"""
+        if not len(records):
+            return
+        live = target is None
+        target = self.app.telemetry if live else target
+        # Eski kayıtlarda olmayan kanallar NaN
+        missing = np.full(len(records), np.nan)
+        block = np.column_stack([records[name] if name in records.dtype.names else missing
+                                 for name in target.channels])
+        target.extend(records["t"], block)
+        if live:
+            self.estimator.update(records["t"], block)
+
+    def tick(self):
+        """Ekran hızında çağrılır: oynatma saatini ilerletip arayüzü günceller"""
+        if not self.paused:
+            position = self._anchor_pos + (time.monotonic() - self._anchor_wall) * self.speed
+            if position >= self.t_last:
+                position = self.t_last
+                if not self.paused:
+                    self.toggle_pause()
+            self.position = position
+
+            end = self.reader.find(position, side="right")
+            if end > self._index:
+                self._push(self.reader.records[self._index:end])
+                self._index = end
+            self._apply_display()
+
+        self._after_id = self.app.root.after(int(1000 / self.display_fps), self.tick)
+
+    def _apply_display(self):
+        """Canlı moddaki güncelleme yollarını son değerle çalıştır"""
+        app = self.app
+        _, values = app.telemetry.latest()
+        if values:
+            app.update_sensor_values()
+
+            estimate = self.estimator.state()
+            app.show_estimate(estimate)
+            now = time.monotonic()
+            if now - self._last_map >= self.MAP_INTERVAL and estimate["düzeltme"]:
+                self._last_map = now
+                app.ui_bus.post("konum", (estimate["lat"], estimate["lon"]))
+
+        if self.video is not None:
+            frame = self.video.frame_at(self.position)
+            if frame is not None:
+                app.frame_display.show(frame)
+
+        elapsed = self.position - self.t_first
+        if not self._dragging:
+            self.seek_var.set(elapsed)
+        self.time_var.set(f"{self._clock(elapsed)} / {self._clock(self.t_last - self.t_first)}"
+                          f"  {self._speed_text(self.speed)}")
+
+    @staticmethod
+    def _clock(seconds):
+        seconds = int(seconds)
+        return f"{seconds // 3600:02d}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+
+    def stop(self):
+        if self._after_id:
+            self.app.root.after_cancel(self._after_id)
+            self._after_id = None
+        if self.video is not None:
+            self.video.close()
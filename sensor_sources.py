@@ -0,0 +1,445 @@
+import asyncio
+import json
+import math
+import queue
+import random
+import threading
+import time
+
+import numpy as np
+
+from telemetry import TELEMETRY_CHANNELS
+from telemetry_log import TelemetryLogReader
+from wire_format import ClockOffset, WireDecoder, has_magic
+
+# Seri port kütüphanesi kontrolü
+try:
+    import serial  # type: ignore
+except ImportError:
+    serial = None
+
+
+def parse_line(line):
+    """Tek satırlık metin örneğini sözlüğe çevirir.
+
+    JSON nesnesi (`{"basınç": 1012.3, "derinlik": 4.2}`) ya da
+    `basınç=1012.3,derinlik=4.2` biçimi kabul edilir. Çözülemezse None.
+    """
+    if isinstance(line, (bytes, bytearray)):
+        line = line.decode("utf-8", errors="replace")
+    line = line.strip()
+    if not line:
+        return None
+    try:
+        if line.startswith("{"):
+            values = json.loads(line)
+            return {k: float(v) for k, v in values.items()}
+        values = {}
+        for part in line.split(","):
+            key, _, value = part.partition("=")
+            values[key.strip()] = float(value)
+        return values
+    except (ValueError, TypeError, AttributeError):
+        return None
+
+
+class SensorSource:
+    """Sensör kaynağı temel sınıfı.
+
+    `run(emit)` asyncio döngüsünde çalışan bir eşyordamdır; her örnek için
+    `emit(değerler, zaman=None)` çağırır. Değerler kanal adı -> float
+    sözlüğüdür, eksik kanallar son bilinen değeriyle tamamlanır.
+
+    `block_emitter` True olan kaynaklar ikinci bir `emit_block(kanallar,
+    zamanlar, değerler)` alır ve toplu örnekleri satıra bölmeden verir.
+    """
+
+    name = "kaynak"
+    block_emitter = False
+
+    async def run(self, emit):
+        raise NotImplementedError
+
+
+class SimulatedSource(SensorSource):
+    """Arayüzün eski simülasyonu: sensörler `rate_hz`, konum saniyede bir"""
+
+    name = "simülasyon"
+
+    def __init__(self, rate_hz=2.0, location_interval=1.0,
+                 start_lat=41.0082, start_lon=28.9784):
+        self.rate_hz = rate_hz
+        self.location_interval = location_interval
+        self.lat = start_lat
+        self.lon = start_lon
+
+    async def run(self, emit):
+        period = 1.0 / self.rate_hz
+        next_location = 0.0
+        while True:
+            current_time = time.time()
+            values = {
+                "basınç": 1013.25 + 50 * math.sin(current_time * 0.5) + random.uniform(-2, 2),
+                "derinlik": 50 + 30 * math.sin(current_time * 0.3) + random.uniform(-1, 1),
+                "sıcaklık": 20 + 5 * math.sin(current_time * 0.2) + random.uniform(-0.5, 0.5),
+                "nem": 40 + 10 * math.sin(current_time * 0.1) + random.uniform(-2, 2),
+                "ivme_x": 0.1 * math.sin(current_time),
+                "ivme_y": 0.08 * math.sin(current_time * 1.2),
+                "ivme_z": 0.95 + 0.05 * math.sin(current_time * 0.5),
+                "manyetik": 50 + 5 * math.sin(current_time * 0.3),
+                "gyro": 0.05 * math.sin(current_time),
+                "pusula": (45 + 0.5 * math.cos(current_time) + random.uniform(-1, 1)) % 360,
+                "batarya": max(10, 100 - (current_time % 100)),
+            }
+            if current_time >= next_location:
+                next_location = current_time + self.location_interval
+                self.lat += random.uniform(-0.00025, 0.00025)
+                self.lon += random.uniform(-0.00025, 0.00025)
+                values["lat"] = self.lat
+                values["lon"] = self.lon
+            emit(values)
+            await asyncio.sleep(period)
+
+
+class WireReceiver:
+    """İkili telemetri akışı (bkz. wire_format) -> hub.
+
+    Çözülen toplu örnekler yerel saate çevrilip (bkz. ClockOffset; sıra
+    numarası sıfırlanınca kayma yeniden tohumlanır) `emit_block` ile olduğu
+    gibi verilir; o yoksa satır satır `emit` çağrılır (NaN kanallar atlanır).
+    """
+
+    def __init__(self, emit, emit_block=None):
+        self.emit = emit
+        self.emit_block = emit_block
+        self.decoder = WireDecoder()
+        self.clock = ClockOffset()
+
+    def feed(self, data):
+        now = time.monotonic()
+        restarts = self.decoder.restarts
+        batches = self.decoder.feed(data)
+        if self.decoder.restarts != restarts:
+            # Araç yeniden başladı: eski kayma yeni saate uymaz
+            self.clock.reset()
+        for channels, times, values in batches:
+            times = self.clock.to_local(times, now)
+            if self.emit_block is not None:
+                self.emit_block(channels, times, values)
+                continue
+            for t, row in zip(times.tolist(), values.tolist()):
+                self.emit({name: value for name, value in zip(channels, row)
+                           if value == value}, t)
+
+
+class SerialSource(SensorSource):
+    """Seri porttan örnek okur: satır satır metin (bkz. parse_line) ya da
+    ilk sihirli sayı görülünce ikili çerçeveler (bkz. wire_format)"""
+
+    block_emitter = True
+
+    def __init__(self, port, baudrate=115200):
+        self.port = port
+        self.baudrate = baudrate
+        self.name = f"seri:{port}"
+
+    async def run(self, emit, emit_block=None):
+        if serial is None:
+            raise RuntimeError("Seri port için 'pip install pyserial' kurun.")
+        loop = asyncio.get_running_loop()
+        port = serial.Serial(self.port, self.baudrate, timeout=0)
+        ready = asyncio.Event()
+        try:
+            # POSIX'te veri gelince uyan; değilse kısa aralıklarla yokla
+            try:
+                loop.add_reader(port.fileno(), ready.set)
+                watching = True
+            except (NotImplementedError, AttributeError, ValueError):
+                watching = False
+
+            buffer = b""
+            receiver = None
+            while True:
+                if watching:
+                    await ready.wait()
+                    ready.clear()
+                else:
+                    await asyncio.sleep(0.005)
+                chunk = port.read(port.in_waiting or 1)
+                if not chunk:
+                    continue
+                if receiver is not None:
+                    receiver.feed(chunk)
+                    continue
+                if has_magic(buffer + chunk):
+                    receiver = WireReceiver(emit, emit_block)
+                    receiver.feed(buffer + chunk)
+                    buffer = b""
+                    continue
+                *lines, buffer = (buffer + chunk).split(b"\n")
+                for line in lines:
+                    values = parse_line(line)
+                    if values:
+                        emit(values)
+        finally:
+            if watching:
+                loop.remove_reader(port.fileno())
+            port.close()
+
+
+class UdpSource(SensorSource):
+    """UDP paketlerinden örnek okur; her paket bir veya daha çok satır ya da
+    ikili çerçeve (bkz. wire_format) içerir"""
+
+    block_emitter = True
+
+    def __init__(self, host="0.0.0.0", port=14550):
+        self.host = host
+        self.port = port
+        self.name = f"udp:{host}:{port}"
+
+    async def run(self, emit, emit_block=None):
+        loop = asyncio.get_running_loop()
+        receiver = WireReceiver(emit, emit_block)
+
+        class Protocol(asyncio.DatagramProtocol):
+            def datagram_received(self, data, addr):
+                if has_magic(data):
+                    receiver.feed(data)
+                    return
+                for line in data.split(b"\n"):
+                    values = parse_line(line)
+                    if values:
+                        emit(values)
+
+        transport, _ = await loop.create_datagram_endpoint(
+            Protocol, local_addr=(self.host, self.port))
+        try:
+            await asyncio.Future()
+        finally:
+            transport.close()
+
+
+class ReplaySource(SensorSource):
+    """Telemetri kaydını canlı kaynak gibi, kayıttaki zamanlamayla yayınlar"""
+
+    def __init__(self, path, speed=1.0, loop=False):
+        self.path = path
+        self.speed = speed
+        self.loop = loop
+        self.name = f"kayıt:{path}"
+
+    async def run(self, emit):
+        reader = TelemetryLogReader(self.path)
+        channels = [name for name in reader.channels if name in TELEMETRY_CHANNELS]
+        while True:
+            records = reader.records
+            if not len(records):
+                return
+            t0 = float(records["t"][0])
+            start = time.monotonic()
+            for i, record in enumerate(records):
+                delay = (float(record["t"]) - t0) / self.speed - (time.monotonic() - start)
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                elif i % 256 == 0:
+                    # Geride kalınca bile döngüyü tamamen tıkama
+                    await asyncio.sleep(0)
+                emit({name: float(record[name]) for name in channels})
+            if not self.loop:
+                return
+
+
+def _split_number(text):
+    """'ad:123' -> ('ad', '123'); sonda sayı yoksa (text, '')"""
+    head, sep, tail = text.rpartition(":")
+    if sep and head and tail.replace(".", "", 1).isdigit():
+        return head, tail
+    return text, ""
+
+
+def source_from_spec(spec):
+    """Komut satırı tanımından kaynak oluştur.
+
+    sim[:HZ] | vsim[:HZ[:SENARYO[:TOHUM]]] | serial:PORT[:BAUD] | udp:HOST:PORT |
+    replay:DOSYA[:HIZ]
+    """
+    kind, _, rest = spec.partition(":")
+    if kind == "sim":
+        return SimulatedSource(rate_hz=float(rest) if rest else 2.0)
+    if kind == "vsim":
+        # OpenCV'li benzetim modülü yalnız istenince yüklenir
+        from vehicle_sim import SIM_RATE, VehicleSimSource
+        rate, scenario, seed = (rest.split(":") + ["", "", ""])[:3]
+        return VehicleSimSource(scenario or "dalış", float(rate) if rate else SIM_RATE,
+                                int(seed) if seed else 0)
+    if kind == "serial":
+        port, baud = _split_number(rest)
+        return SerialSource(port, int(baud) if baud else 115200)
+    if kind == "udp":
+        host, port = _split_number(rest)
+        if not port:
+            host, port = "0.0.0.0", rest
+        return UdpSource(host, int(port))
+    if kind == "replay":
+        path, speed = _split_number(rest)
+        return ReplaySource(path, float(speed) if speed else 1.0)
+    raise ValueError(f"Bilinmeyen kaynak: {spec}")
+
+
+class SensorHub:
+    """Tüm sensör kaynaklarını tek bir asyncio döngüsünde çalıştırır.
+
+    Döngü kendi arka plan iş parçacığındadır. Gelen örnekler alındığı an
+    zaman damgalanır, eksik kanallar son değerle tamamlanır ve her
+    `batch_interval` saniyede bir (zamanlar, (k, kanal) dizi, (k, kanal)
+    geldi-mi maskesi) olarak iş parçacığı güvenli `queue`ya konur. Çekirdeğin
+    alma iş parçacığı (`telemetri-alma`) kuyruğu bekleyerek okur; kaynak
+    başına ayrı iş parçacığı açılmaz.
+
+    Değişmez: hub'dan çıkan zamanlar (topluluklar arasında da) hiç
+    azalmaz; halka, piramit ve kayıt ikili aramayla buna dayanır. Kaynaklar
+    farklı saatlerle damgaladığı için (yerel alma zamanı, benzetimin kendi
+    saati, uzak saatten çevrilmiş zaman) son verilen zamandan eski bir
+    damga o zamana çekilir ve `clamped` sayılır.
+    """
+
+    def __init__(self, sources, channels=TELEMETRY_CHANNELS, batch_interval=0.02,
+                 retry_delay=2.0):
+        self.sources = list(sources)
+        self.channels = tuple(channels)
+        self._index = {name: i for i, name in enumerate(self.channels)}
+        self._columns = {}
+        self.batch_interval = batch_interval
+        self.retry_delay = retry_delay
+
+        self.queue = queue.SimpleQueue()
+        self.errors = {}
+        self.received = 0
+        self.clamped = 0
+        self._last_time = -np.inf
+
+        self._state = np.full(len(self.channels), np.nan)
+        self._times = []
+        self._rows = []
+        self._masks = []
+        self._loop = None
+        self._stop = None
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="sensor-hub", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=2.0):
+        if self._loop and self._stop:
+            self._loop.call_soon_threadsafe(self._stop.set)
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def emit(self, values, timestamp=None):
+        """Kaynaklar çağırır (döngü iş parçacığında)"""
+        timestamp = time.monotonic() if timestamp is None else timestamp
+        if timestamp < self._last_time:
+            timestamp = self._last_time
+            self.clamped += 1
+        self._last_time = timestamp
+        mask = np.zeros(len(self.channels), dtype=bool)
+        for name, value in values.items():
+            i = self._index.get(name)
+            if i is not None:
+                self._state[i] = value
+                mask[i] = True
+        self._times.append(timestamp)
+        self._rows.append(self._state.copy())
+        self._masks.append(mask)
+        self.received += 1
+
+    def emit_block(self, channels, timestamps, values):
+        """Toplu örnek: (n,) zaman + (n, len(channels)) değer; NaN = gelmedi"""
+        n = len(timestamps)
+        if not n:
+            return
+        columns = self._columns.get(channels)
+        if columns is None:
+            known = [(j, self._index[name]) for j, name in enumerate(channels)
+                     if name in self._index]
+            columns = self._columns[channels] = (np.array([j for j, _ in known], dtype=int),
+                                                 np.array([i for _, i in known], dtype=int))
+        source, target = columns
+        values = np.asarray(values, dtype=float)[:, source]
+        given = values == values
+        timestamps = np.asarray(timestamps, dtype=float)
+        ordered = np.maximum.accumulate(np.maximum(timestamps, self._last_time))
+        self.clamped += int(np.count_nonzero(ordered != timestamps))
+        self._last_time = float(ordered[-1])
+        self._times.extend(ordered.tolist())
+        self.received += n
+
+        if n <= 4:
+            # Küçük topluluklarda satır satır daha ucuz (dizi kurma maliyeti sabit)
+            for row, present in zip(values, given):
+                self._state[target[present]] = row[present]
+                mask = np.zeros(len(self.channels), dtype=bool)
+                mask[target[present]] = True
+                self._rows.append(self._state.copy())
+                self._masks.append(mask)
+            return
+
+        if not given.all():
+            # Gelmeyen değeri önceki satırdan (ilk satırlarda son durumdan) taşı
+            last = np.where(given, np.arange(n)[:, None], -1)
+            np.maximum.accumulate(last, axis=0, out=last)
+            values = np.where(last >= 0, values[last, np.arange(len(target))],
+                              self._state[target])
+        rows = np.empty((n, len(self.channels)))
+        rows[:] = self._state
+        rows[:, target] = values
+        masks = np.zeros((n, len(self.channels)), dtype=bool)
+        masks[:, target] = given
+        self._state = rows[-1].copy()
+        self._rows.append(rows)
+        self._masks.append(masks)
+
+    def _run(self):
+        asyncio.run(self._main())
+
+    async def _main(self):
+        self._loop = asyncio.get_running_loop()
+        self._stop = asyncio.Event()
+        tasks = [asyncio.create_task(self._supervise(source)) for source in self.sources]
+        tasks.append(asyncio.create_task(self._flush_loop()))
+        await self._stop.wait()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._flush()
+
+    async def _supervise(self, source):
+        """Kaynak hata verirse kaydet ve bir süre sonra yeniden başlat"""
+        while True:
+            try:
+                if source.block_emitter:
+                    await source.run(self.emit, self.emit_block)
+                else:
+                    await source.run(self.emit)
+                return
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.errors[source.name] = str(e)
+                print(f"Sensör kaynağı hatası ({source.name}): {e}")
+                await asyncio.sleep(self.retry_delay)
+
+    async def _flush_loop(self):
+        while True:
+            await asyncio.sleep(self.batch_interval)
+            self._flush()
+
+    def _flush(self):
+        if not self._times:
+            return
+        times, rows, masks = self._times, self._rows, self._masks
+        self._times, self._rows, self._masks = [], [], []
+        self.queue.put((np.asarray(times), np.vstack(rows), np.vstack(masks)))
@@ -0,0 +1,301 @@
+import math
+
+import numpy as np
+
+from telemetry import TELEMETRY_CHANNELS
+
+# Yerçekimi (m/s²) ve ortalama Dünya yarıçapı (m)
+GRAVITY = 9.80665
+EARTH_RADIUS = 6371000.0
+
+# Başlangıç konumu (ilk konum düzeltmesi gelene kadar)
+DEFAULT_ORIGIN = (41.0082, 28.9784)
+
+
+def wrap_angle(angle):
+    """Açıyı [-pi, pi) aralığına indir"""
+    return (angle + np.pi) % (2 * np.pi) - np.pi
+
+
+def linear_recurrence(a, u, x0, max_decay=18.0):
+    """x_k = a_k * x_{k-1} + u_k dizisini Python döngüsü olmadan çöz.
+
+    Çözüm kümülatif çarpımla yazılır: P_k = a_1...a_k için
+    x_k = P_k * (x0 + sum_j u_j / P_j). P çok küçülürse bölme taşar, bu
+    yüzden dizi P'nin e^-max_decay altına düştüğü yerlerden parçalara
+    bölünür (parça sayısı toplam sönüm / max_decay kadardır, örnek
+    sayısından bağımsızdır). `a` (n,), `u` (n,) ya da (n, m), `x0` skaler
+    ya da (m,); 0 < a <= 1.
+    """
+    u = np.asarray(u, dtype=np.float64)
+    n = len(u)
+    out = np.empty_like(u)
+    if n == 0:
+        return out
+    log_a = np.maximum(np.log(np.broadcast_to(np.asarray(a, dtype=np.float64), (n,))),
+                       -max_decay)
+    cumulative = np.cumsum(log_a)
+    segment = np.floor(-cumulative / max_decay).astype(np.int64)
+    bounds = np.flatnonzero(np.diff(segment)) + 1
+    x = np.asarray(x0, dtype=np.float64)
+    for start, end in zip(np.concatenate(([0], bounds)), np.concatenate((bounds, [n]))):
+        base = cumulative[start - 1] if start else 0.0
+        scale = np.exp(cumulative[start:end] - base)
+        if u.ndim > 1:
+            scale = scale[:, None]
+        out[start:end] = scale * (x + np.cumsum(u[start:end] / scale, axis=0))
+        x = out[end - 1]
+    return out
+
+
+class StateEstimator:
+    """İvme, gyro, pusula ve derinlikten konum/hız/yönelim tahmini.
+
+    Tamamlayıcı süzgeçler toplu örnek üzerinde NumPy ile çözülür (her süzgeç
+    `linear_recurrence` ile tek seferde), örnek başına Python döngüsü yoktur:
+
+    - Eğim: ivmeölçerin alçak geçirilmiş hali yerçekimi yönüdür (`gravity_tau`);
+      yatış/yunuslama buradan, doğrusal ivme (ölçüm - yerçekimi) ise
+      yataya döndürülerek bulunur.
+    - Yön: gyro (°/s, saat yönünde +) tümlenir, pusulaya (°) `heading_tau`
+      ile çekilir. `manyetik` alan büyüklüğü referanstan `mag_gate` oranından
+      fazla saparsa (manyetik bozulma) pusula o örnekte kullanılmaz.
+    - Hız/konum: ileri hız, ileri ivmenin tümlevidir ve `velocity_tau` ile
+      konum düzeltmelerinden öğrenilen seyir hızına sızar (ivme yalnız kısa
+      süreli değişimleri taşır, kayma birikmez). Hız yön ile kuzey/doğuya
+      döndürülüp tümlenir, böylece dönüşlerde konum yayı izler. Yeni bir
+      konum düzeltmesi (lat/lon değişimi) gelince konum `fix_gain` ile,
+      seyir hızı ise yol boyunca kalan hatanın `fix_velocity_gain` kadarıyla
+      düzeltilir; ilk düzeltme konumu doğrudan kurar.
+    - Derinlik: düşey hız, ivme ile derinlik türevinin birleşimidir
+      (`vertical_tau`); derinlik, bu hızla öngörülüp ölçüme `depth_tau` ile çekilir.
+
+    Eksenler: x ileri, y sağ, z yukarı (durağan araçta ivme_z ≈ +1 g).
+    """
+
+    def __init__(self, channels=TELEMETRY_CHANNELS, gravity_tau=2.0, heading_tau=3.0,
+                 velocity_tau=5.0, vertical_tau=1.0, depth_tau=0.3, fix_gain=0.5,
+                 fix_velocity_gain=0.5, mag_field=None, mag_gate=0.15, max_dt=0.5,
+                 origin=DEFAULT_ORIGIN):
+        self.channels = tuple(channels)
+        index = {name: i for i, name in enumerate(self.channels)}
+        self._accel = [index[name] for name in ("ivme_x", "ivme_y", "ivme_z")]
+        self._gyro = index["gyro"]
+        self._compass = index.get("pusula")
+        self._mag = index.get("manyetik")
+        self._depth = index.get("derinlik")
+        self._lat = index.get("lat")
+        self._lon = index.get("lon")
+
+        self.gravity_tau = gravity_tau
+        self.heading_tau = heading_tau
+        self.velocity_tau = velocity_tau
+        self.vertical_tau = vertical_tau
+        self.depth_tau = depth_tau
+        self.fix_gain = fix_gain
+        self.fix_velocity_gain = fix_velocity_gain
+        self.mag_gate = mag_gate
+        self.max_dt = max_dt
+        self._mag_fixed = mag_field
+        self.reset(*origin)
+
+    def reset(self, lat=DEFAULT_ORIGIN[0], lon=DEFAULT_ORIGIN[1]):
+        """Tahmini sıfırla; konum (lat, lon)'dan başlar, ilk düzeltmede kurulur"""
+        self._set_origin(lat, lon)
+        self.t = None
+        self.gravity = None
+        self.heading = None
+        self.yaw_rate = 0.0               # saat yönünde + (rad/s)
+        self.speed = 0.0                  # ileri hız (m/s)
+        self.cruise_speed = 0.0           # düzeltmelerden öğrenilen seyir hızı (m/s)
+        self.velocity = np.zeros(2)       # kuzey, doğu (m/s)
+        self.position = np.zeros(2)       # başlangıca göre kuzey, doğu (m)
+        self.vertical_speed = 0.0         # aşağı + (m/s)
+        self.depth = None
+        self._depth_measurement = None
+        self.roll = self.pitch = 0.0
+        self.mag_field = self._mag_fixed
+        self._last_fix = None
+        self._last_fix_t = None
+        self._has_fix = False
+        self.fixes = 0
+        self.rejected_compass = 0
+
+    # --- Yardımcılar ------------------------------------------------------
+
+    def _set_origin(self, lat, lon):
+        """Yerel kuzey/doğu düzleminin başlangıcı (düz Dünya yaklaşımı)"""
+        self.origin = (lat, lon)
+        self._meters_per_deg = (EARTH_RADIUS * math.pi / 180,
+                                EARTH_RADIUS * math.pi / 180 * math.cos(math.radians(lat)))
+
+    def _to_local(self, lat, lon):
+        return np.stack(((lat - self.origin[0]) * self._meters_per_deg[0],
+                         (lon - self.origin[1]) * self._meters_per_deg[1]), axis=-1)
+
+    def _to_geo(self, north, east):
+        return (self.origin[0] + north / self._meters_per_deg[0],
+                self.origin[1] + east / self._meters_per_deg[1])
+
+    @staticmethod
+    def _column(block, i):
+        return block[:, i] if i is not None else np.full(len(block), np.nan)
+
+    # --- Güncelleme -------------------------------------------------------
+
+    def update(self, timestamps, block):
+        """Toplu örnekle tahmini ilerlet; örnek başına tahmin dizilerini döndür"""
+        t = np.asarray(timestamps, dtype=np.float64)
+        block = np.asarray(block, dtype=np.float64)
+        n = len(t)
+        if not n:
+            return None
+        previous_t = self.t if self.t is not None else t[0]
+        dt = np.clip(np.diff(t, prepend=previous_t), 0.0, self.max_dt)
+        self.t = float(t[-1])
+
+        # --- Eğim ve doğrusal ivme
+        accel = np.nan_to_num(block[:, self._accel], nan=0.0)
+        accel[~np.isfinite(block[:, self._accel[2]]), 2] = 1.0
+        if self.gravity is None:
+            self.gravity = accel[0].copy()
+        alpha = np.exp(-dt / self.gravity_tau)
+        gravity = linear_recurrence(alpha, (1 - alpha)[:, None] * accel, self.gravity)
+        self.gravity = gravity[-1]
+        roll = np.arctan2(gravity[:, 1], gravity[:, 2])
+        pitch = np.arctan2(-gravity[:, 0], np.hypot(gravity[:, 1], gravity[:, 2]))
+        linear = (accel - gravity) * GRAVITY
+        cr, sr, cp, sp = np.cos(roll), np.sin(roll), np.cos(pitch), np.sin(pitch)
+        forward = cp * linear[:, 0] + sp * sr * linear[:, 1] + sp * cr * linear[:, 2]
+        up = -sp * linear[:, 0] + cp * sr * linear[:, 1] + cp * cr * linear[:, 2]
+
+        # --- Yön: gyro + (bozulmamış) pusula
+        rate = np.radians(np.nan_to_num(block[:, self._gyro], nan=0.0))
+        compass = np.radians(self._column(block, self._compass))
+        valid = np.isfinite(compass)
+        if valid.any() and self._mag is not None:
+            field = block[:, self._mag]
+            if self.mag_field is None and np.isfinite(field[valid]).any():
+                self.mag_field = float(np.nanmedian(field[valid]))
+            if self.mag_field:
+                disturbed = valid & (np.abs(field / self.mag_field - 1) > self.mag_gate)
+                self.rejected_compass += int(disturbed.sum())
+                valid &= ~disturbed
+        if self.heading is None:
+            self.heading = float(compass[valid][0]) if valid.any() else 0.0
+        predicted = self.heading + np.cumsum(rate * dt)
+        target = predicted + wrap_angle(np.where(valid, compass, 0.0) - predicted)
+        alpha = np.where(valid, np.exp(-dt / self.heading_tau), 1.0)
+        heading = linear_recurrence(alpha, alpha * rate * dt + (1 - alpha) * target,
+                                    self.heading)
+        self.heading = float(wrap_angle(heading[-1]))
+        self.yaw_rate = float(rate[-1])
+
+        # --- Yatay hız ve konum (konum düzeltmeleri arasında parça parça)
+        direction = np.column_stack((np.cos(heading), np.sin(heading)))
+        fixes = self._fix_indices(t, block)
+        speed = np.empty(n)
+        position = np.empty((n, 2))
+        decay = np.exp(-dt / self.velocity_tau)
+        start = 0
+        for end, fix in fixes + [(n, None)]:
+            if end > start:
+                sl = slice(start, end)
+                speed[sl] = linear_recurrence(
+                    decay[sl], forward[sl] * dt[sl] + (1 - decay[sl]) * self.cruise_speed,
+                    self.speed)
+                step = (speed[sl] * dt[sl])[:, None] * direction[sl]
+                position[sl] = self.position + np.cumsum(step, axis=0)
+                self.speed = float(speed[end - 1])
+                self.position = position[end - 1]
+            if fix is not None:
+                self._apply_fix(fix, t[end - 1], direction[end - 1])
+                position[end - 1] = self.position
+                speed[end - 1] = self.speed
+            start = end
+        velocity = speed[:, None] * direction
+        self.velocity = velocity[-1]
+
+        # --- Düşey hız ve derinlik
+        measured = self._column(block, self._depth)
+        if self.depth is None:
+            finite = measured[np.isfinite(measured)]
+            self.depth = float(finite[0]) if len(finite) else 0.0
+        filled = np.where(np.isfinite(measured), measured, self.depth)
+        last = self._depth_measurement if self._depth_measurement is not None else filled[0]
+        previous = np.concatenate(([last], filled[:-1]))
+        rate_from_depth = np.where(dt > 0, (filled - previous) / np.where(dt > 0, dt, 1), 0.0)
+        beta = np.exp(-dt / self.vertical_tau)
+        vertical = linear_recurrence(beta, beta * (-up) * dt + (1 - beta) * rate_from_depth,
+                                     self.vertical_speed)
+        self.vertical_speed = float(vertical[-1])
+        alpha = np.exp(-dt / self.depth_tau)
+        depth = linear_recurrence(alpha, alpha * vertical * dt + (1 - alpha) * filled,
+                                  self.depth)
+        self.depth = float(depth[-1])
+        self._depth_measurement = float(filled[-1])
+
+        self.roll, self.pitch = float(roll[-1]), float(pitch[-1])
+        lat, lon = self._to_geo(position[:, 0], position[:, 1])
+        return {"t": t, "lat": lat, "lon": lon, "north": position[:, 0],
+                "east": position[:, 1], "heading": heading, "depth": depth,
+                "velocity": velocity, "roll": roll, "pitch": pitch}
+
+    def _fix_indices(self, t, block):
+        """Yeni konum düzeltmeleri: [(örnek indisi + 1, (kuzey, doğu))]"""
+        if self._lat is None or self._lon is None:
+            return []
+        lat, lon = block[:, self._lat], block[:, self._lon]
+        finite = np.isfinite(lat) & np.isfinite(lon)
+        if not finite.any():
+            return []
+        previous = self._last_fix if self._last_fix is not None else (np.nan, np.nan)
+        prev_lat = np.concatenate(([previous[0]], lat[:-1]))
+        prev_lon = np.concatenate(([previous[1]], lon[:-1]))
+        new = finite & ((lat != prev_lat) | (lon != prev_lon))
+        self._last_fix = (float(lat[-1]), float(lon[-1])) if finite[-1] else self._last_fix
+        indices = np.flatnonzero(new)
+        if not len(indices):
+            return []
+        if not self._has_fix:
+            # İlk düzeltme yerel düzlemin başlangıcı olur
+            self._set_origin(float(lat[indices[0]]), float(lon[indices[0]]))
+        local = self._to_local(lat[indices], lon[indices])
+        return [(int(i) + 1, local[k]) for k, i in enumerate(indices)]
+
+    def _apply_fix(self, fix, t, direction):
+        self.fixes += 1
+        if not self._has_fix:
+            self._has_fix = True
+            self.position = np.array(fix, dtype=np.float64)
+            self._last_fix_t = t
+            return
+        innovation = fix - self.position
+        self.position = self.position + self.fix_gain * innovation
+        # Yol boyunca kalan hata = seyir hızının eksiği x aradaki süre
+        interval = max(t - self._last_fix_t, 0.5)
+        correction = self.fix_velocity_gain * float(innovation @ direction) / interval
+        self.cruise_speed += correction
+        self.speed += correction
+        self._last_fix_t = t
+
+    # --- Okuma ------------------------------------------------------------
+
+    def state(self):
+        """Son tahmin (arayüz ve kayıt için sade sayılar)"""
+        lat, lon = self._to_geo(self.position[0], self.position[1])
+        return {
+            "zaman": self.t if self.t is not None else math.nan,
+            "lat": float(lat),
+            "lon": float(lon),
+            "kuzey": float(self.position[0]),
+            "doğu": float(self.position[1]),
+            "derinlik": self.depth if self.depth is not None else math.nan,
+            "hız": float(np.hypot(*self.velocity)),
+            "düşey_hız": self.vertical_speed,
+            "yön": math.degrees(self.heading) % 360 if self.heading is not None else math.nan,
+            "dönüş_hızı": math.degrees(self.yaw_rate),
+            "yatış": math.degrees(self.roll),
+            "yunuslama": math.degrees(self.pitch),
+            "düzeltme": self.fixes,
+        }
@@ -0,0 +1,94 @@
+import numpy as np
+
+
+class BlitStripChart:
+    """Tek çizgili şerit grafiği blit ile günceller.
+
+    Eksenler, etiketler ve arka plan yalnızca y-sınırları veya pencere boyutu
+    değiştiğinde yeniden çizilir. Diğer karelerde önbellekteki arka plan geri
+    yüklenir ve sadece çizgi (line) yeniden çizilip ekrana kopyalanır.
+    """
+
+    def __init__(self, canvas, ax, line, ylim, xlim=None, margin=0.1):
+        self.canvas = canvas
+        self.ax = ax
+        self.line = line
+        self.margin = margin
+
+        # Animasyonlu çizgi tam çizimlerde arka plana gömülmez
+        self.line.set_animated(True)
+        self.ax.set_ylim(*ylim)
+        if xlim is not None:
+            self.ax.set_xlim(*xlim)
+
+        self._background = None
+        self._size = None
+        self._dirty = False
+        self._needs_full_draw = True
+
+        # İstatistikler (kaç kez tam çizim / blit yapıldı)
+        self.full_draws = 0
+        self.blits = 0
+
+        # Her tam çizimden sonra (yeniden boyutlandırma dahil) arka planı yakala
+        self.canvas.mpl_connect("draw_event", self._on_draw)
+
+    def _on_draw(self, event):
+        """Tam çizim sonrası arka planı önbelleğe al"""
+        self._background = self.canvas.copy_from_bbox(self.ax.bbox)
+        self._size = self.canvas.get_width_height()
+        self.ax.draw_artist(self.line)
+        self.full_draws += 1
+
+    def set_data(self, x, y):
+        """Çizgi verisini değiştir, gerekirse y-sınırlarını genişlet"""
+        self.line.set_data(x, y)
+        self._dirty = True
+        self._fit_ylim(y)
+
+    def _fit_ylim(self, y):
+        """Veri mevcut y-sınırlarının dışına taşarsa sınırları genişlet"""
+        if len(y) == 0:
+            return
+        lo = float(np.nanmin(y))
+        hi = float(np.nanmax(y))
+        if not (np.isfinite(lo) and np.isfinite(hi)):
+            return
+
+        y0, y1 = self.ax.get_ylim()
+        if lo >= y0 and hi <= y1:
+            return
+
+        # Sadece taşan tarafı, biraz pay bırakarak genişlet
+        pad = max(hi - lo, 1e-6) * self.margin
+        if lo < y0:
+            y0 = lo - pad
+        if hi > y1:
+            y1 = hi + pad
+        self.ax.set_ylim(y0, y1)
+        self._needs_full_draw = True
+
+    def invalidate(self):
+        """Bir sonraki render'da eksenleri baştan çizdir"""
+        self._needs_full_draw = True
+
+    def render(self):
+        """Değişen bölgeyi ekrana çiz (gerekmiyorsa hiçbir şey yapma)"""
+        if self.canvas.get_width_height() != self._size:
+            self._needs_full_draw = True
+
+        if self._needs_full_draw or self._background is None:
+            self._needs_full_draw = False
+            self._dirty = False
+            # draw_event -> _on_draw arka planı yeniden yakalar
+            self.canvas.draw()
+            return
+
+        if not self._dirty:
+            return
+
+        self._dirty = False
+        self.canvas.restore_region(self._background)
+        self.ax.draw_artist(self.line)
+        self.canvas.blit(self.ax.bbox)
+        self.blits += 1
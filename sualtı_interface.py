@@ -1,28 +1,130 @@
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk
 from datetime import datetime
-import random
-import numpy as np
-import threading
+import argparse
+import math
+import os
 import time
-from collections import deque
-import cv2
-from PIL import Image, ImageTk, ImageDraw
-import matplotlib
-matplotlib.use('TkAgg')
-from matplotlib.figure import Figure
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import matplotlib.pyplot as plt
+from strip_chart import BlitStripChart
+from replay import REPLAY_SPEEDS, ReplayController
+from sensor_sources import source_from_spec
+from ui_bus import UiUpdateBus
+from map_track import TrackLayer
+from tile_cache import MBTilesStore, TileProvider, create_map_view
+from link_health import LINK_DEGRADED, LINK_LOST, LINK_OK
+from motor_control import transport_from_spec
+from engine import TELEMETRY_LOG_DIR, TelemetryEngine
+from autopilot import CONTROL_RATE, Autopilot, SimulatedVehicle
+from fanout_server import FANOUT_PORT, ROLE_PRIMARY, ROLE_VIEWER, FanoutClient
+from perf import REGISTRY as PERF, MetricsExporter, PerfOverlay, TkLagProbe, timed
+# OpenCV (camera, recorder, vision), matplotlib, PIL ve tkintermapview burada
+# yüklenmez: ilgili panel ilk kurulurken yüklenir (bkz. load_panels)
 
-# Harita kütüphanesi kontrolü
-try:
-    import tkintermapview  # type: ignore
-except ImportError:
-    tkintermapview = None
+# Grafiklerin ekrana çizilme hızı (sensör hızından bağımsız)
+CHART_FPS = 10
+# Grafiklerde gösterilen son süre (saniye)
+CHART_WINDOW_SECONDS = 25.0
+
+# Arayüz karesi / saniye: sensör kuyruğu ve güncelleme yolu bu hızda işlenir
+UI_FPS = 30
+
+# Sensör panelindeki değerlerin biçimleri
+SENSOR_FORMATS = {
+    "sıcaklık": "{:.1f}°C",
+    "nem": "{:.0f}%",
+    "ivme_x": "{:.3f}g",
+    "ivme_y": "{:.3f}g",
+    "ivme_z": "{:.3f}g",
+    "manyetik": "{:.1f}µT",
+    "gyro": "{:.2f}°/s",
+}
+
+# Durum tahmincisinden gelen değerlerin biçimleri
+ESTIMATE_FORMATS = {
+    "yön": "{:.0f}°",
+    "yatış": "{:.1f}°",
+    "yunuslama": "{:.1f}°",
+    "hız": "{:.2f} m/s",
+}
+
+# Kamera ayarları (yakalama ayrı iş parçacığında, gösterim bu hızda)
+CAMERA_INDEX = 0
+CAMERA_DISPLAY_FPS = 30
+# Yuvaların boyutlandırıldığı kamera hızı; daha hızlı kamerada seri çekim
+# eksik kareleri "halkadan düştü" / "geç kaldı" diye bildirir
+CAMERA_NOMINAL_FPS = 30
+
+# Seri çekim: tetikten önceki ve sonraki süre (saniye) ve kareleri JPEG'e
+# kodlamak için ayrılan süre
+BURST_PRE_SECONDS = 2.0
+BURST_POST_SECONDS = 2.0
+BURST_ENCODE_SECONDS = 1.0
+
+# Paylaşılan bellek kare yuvası sayısı: halka, kayıt kuyruğu ve görüntü
+# işleme aynı kareleri kopyasız okur; bir yuva bu kadar kare sonra yeniden
+# yazılır. Seri çekimin tüm kareleri kodlanana kadar yaşamalı.
+CAMERA_SHARED_SLOTS = math.ceil(
+    (BURST_PRE_SECONDS + BURST_POST_SECONDS + BURST_ENCODE_SECONDS) * CAMERA_NOMINAL_FPS)
+
+# Video kaydı: bölüm süresi (s) ve kodlayıcı kuyruğu uzunluğu
+RECORD_SEGMENT_SECONDS = 60.0
+RECORD_QUEUE_SIZE = 60
+
+# Hedef takibi: her N karede bir tam tespit, arada takip (ayrı süreçte)
+VISION_DETECT_EVERY = 10
+VISION_PROCESS_WIDTH = 640
+
+# Bağlantı bekçisinin kontrol aralığı (ms); zaman aşımları engine.py'de
+LINK_CHECK_MS = 100
+
+# Dağıtım sunucusunun verdiği rolün kontrol aralığı (ms)
+ROLE_CHECK_MS = 500
+
+# Bağlantı durumlarının başlık ve alt bilgi görünümü
+LINK_STYLES = {
+    LINK_OK: ("● ÇALIŞIYOR", "#00ff00"),
+    LINK_DEGRADED: ("● ZAYIF BAĞLANTI", "#f39c12"),
+    LINK_LOST: ("● BAĞLANTI KOPTU", "#e74c3c"),
+}
+
+# Harita karoları: önce bellek, sonra bu MBTiles dosyası, en son sunucu
+# (görev alanı önceden indirilir: python tile_cache.py prefetch --bbox ...)
+MAP_TILE_DB = os.path.join("tiles", "tiles.mbtiles")
+MAP_TILE_SERVER = "https://a.tile.openstreetmap.org/{z}/{x}/{y}.png"
+MAP_MEMORY_TILES = 2048
+# Tahmini konum her örnekte değişir; harita en fazla bu aralıkla güncellenir (s)
+MAP_UPDATE_SECONDS = 0.2
+
+# Performans ölçümü: olay döngüsü gecikme sondası aralığı ve dosyaya aktarım sıklığı
+# (F12 ekrandaki tabloyu açar/kapatır)
+PERF_LAG_PROBE_MS = 50
+PERF_EXPORT_SECONDS = 5.0
+
+# Ağır paneller (kamera, grafikler, harita) pencere ilk çizildikten bu kadar
+# ms sonra sırayla kurulur
+PANEL_LOAD_DELAY_MS = 10
 
 class SystemControlInterface:
-    def __init__(self, root):
+    def __init__(self, root, live=True, sources=None, map_offline=False,
+                 tile_server=MAP_TILE_SERVER, motor_transport=None,
+                 metrics_file=None, metrics_port=None, camera_factory=None):
         self.root = root
+        self._started = time.perf_counter()
+        # live=False: sensör/kamera başlatılmaz, veriyi ReplayController besler
+        self.live = live
+        # Alma, tampon, kayıt ve komut yolu arayüzsüz çekirdekte (engine.py);
+        # arayüz yeni örneklere abone olur. Kısa adlar çekirdeğin nesneleridir.
+        self.engine = TelemetryEngine(sources, log_dir=TELEMETRY_LOG_DIR if live else None,
+                                      motor_transport=motor_transport)
+        self.engine.subscribe(self.on_samples)
+        self.telemetry = self.engine.telemetry
+        self.history = self.engine.history
+        self.link_health = self.engine.link_health
+        self.motors = self.engine.motors
+        # Otonom mod: kontrol döngüsü kendi iş parçacığında, çekirdeğin son tahminini okur
+        self.autopilot = Autopilot(self.engine.snapshot, self.motors, rate_hz=CONTROL_RATE)
+        # Arayüz güncellemeleri: her iş parçacığı yazar, ana döngü kare başına uygular
+        self.ui_bus = UiUpdateBus(root, fps=UI_FPS)
         self.root.title("SUALTI ARACI SİSTEM KONTROL ARAYÜZÜ")
         self.root.geometry("1300x850")
         self.root.configure(bg="#1a1a2e")
@@ -30,19 +132,53 @@ class SystemControlInterface:
         # Harita konumu için değişkenler
         self.map_widget = None
         self.map_marker = None
-        self.map_path = None
-        self.location_points = deque([], maxlen=400)
+        self.map_track = None
+        # offline=True: harita sadece önbellekten çizilir, ağa çıkılmaz
+        self.tile_store = MBTilesStore(MAP_TILE_DB)
+        self.tile_provider = TileProvider(self.tile_store, tile_server,
+                                          memory_tiles=MAP_MEMORY_TILES,
+                                          offline=map_offline)
         self.location_status_var = tk.StringVar(value="Konum simülasyonu hazır.")
-        self.vehicle_icon = self.create_vehicle_icon()
+        self._last_map_update = 0.0
+        self.vehicle_icon = None
         
-        # Veri depoları
-        self.pressure_data = deque([1013.25] * 50, maxlen=100)  # hPa
-        self.depth_data = deque([0] * 50, maxlen=100)  # metre
-        self.time_data = deque(range(50), maxlen=100)
+        # Grafiklerin son çizdiği örnek sayısı; geçmiş penceresi isteğe bağlı açılır
+        self._charted_sample_count = -1
+        self.history_explorer = None
         
-        # Kamera başlatma
+        # Kamera başlatma (camera_factory: cv2.VideoCapture yerine, ör. ölçümlerde sahte kamera)
+        self.camera_factory = camera_factory
         self.camera_active = False
-        self.cap = None
+        self.capture = None
+        self._camera_after_id = None
+        self.display_meter = None
+        self.displayed_frames = 0
+        self.camera_stats_var = tk.StringVar(value="")
+        self._last_camera_stats = 0.0
+        
+        # Son kareler halkası, anlık görüntü ve video kaydı (kamera paneliyle kurulur)
+        self.frame_ring = None
+        self.snapshots = None
+        self.recorder = None
+        self.frame_display = None
+        self.capture_status_var = tk.StringVar(value="")
+        
+        # Hedef takibi (🎯 HEDEF TAKİP ile açılır, kareler ayrı süreçte işlenir)
+        self.vision = None
+        
+        # Motor komut ölçümleri (komutlar çekirdekte arka planda gönderilir)
+        self.motor_stats_var = tk.StringVar(value="")
+        self._estop_failures = 0
+        self.autopilot_var = tk.StringVar(value="🤖 Otonom: kapalı")
+        self.record_button = None
+        # Araca komut gönderen düğmeler (dağıtım sunucusunda izleyiciyken kapatılır)
+        self.command_widgets = []
+        self.read_only = False
+        self._base_title = None
+        
+        # Paneller kurulunca çağrılacaklar (ör. tekrar oynatıcı)
+        self.panels_ready = False
+        self._ready_callbacks = []
         
         # Ana konteyner
         self.main_container = tk.Frame(root, bg="#1a1a2e")
@@ -58,14 +194,60 @@ class SystemControlInterface:
         self.create_footer()
         
         # Veri güncelleme başlat
+        self.bind_ui_updates()
+        self.ui_bus.start()
         self.update_time()
-        self.start_sensor_simulation()
-        self.start_location_updates()
-        self.init_camera()
+        self.engine.start(sensors=live)
+        self.update_motor_stats()
+        self.start_perf(metrics_file, metrics_port)
+        if live:
+            self.watch_link()
+        else:
+            self.connection_label.config(text="🔗 Bağlantı: 📼 KAYIT", fg="#00ffff")
+            self.data_label.config(text="📊 Veri Akışı: kayıttan")
+        self.root.after(PANEL_LOAD_DELAY_MS, self.load_panels)
+    
+    def load_panels(self):
+        """Ağır panelleri sırayla kur (her biri ayrı döngü turunda, pencere donmaz)"""
+        steps = [self.load_camera_panel, self.load_charts, self.load_map]
+        
+        def run(i):
+            if i < len(steps):
+                steps[i]()
+                self.root.after(1, run, i + 1)
+                return
+            self.panels_ready = True
+            PERF.gauge("startup_seconds", time.perf_counter() - self._started)
+            callbacks, self._ready_callbacks = self._ready_callbacks, []
+            for callback in callbacks:
+                callback()
+        
+        run(0)
+    
+    def on_ready(self, callback):
+        """Paneller kurulunca çağır (kurulduysa hemen)"""
+        if self.panels_ready:
+            callback()
+        else:
+            self._ready_callbacks.append(callback)
+    
+    def bind_ui_updates(self):
+        """Güncelleme yolundaki anahtarları widget'lara bağla"""
+        for key, fmt in {**SENSOR_FORMATS, **ESTIMATE_FORMATS}.items():
+            self.ui_bus.bind_var(key, self.sensor_values[key], fmt)
+        self.ui_bus.bind_var("batarya", self.battery_var, "{:.0f}%")
+        self.ui_bus.bind_var("kamera", self.camera_stats_var)
+        self.ui_bus.bind_var("çekim", self.capture_status_var)
+        self.ui_bus.bind("konum", lambda location: self.update_location_on_map(*location))
+        self.ui_bus.bind_var("motor", self.motor_stats_var)
+        self.ui_bus.bind_var("otonom", self.autopilot_var)
+        self.ui_bus.bind("bağlantı", self.show_link_state)
+        self.ui_bus.bind_widget("veri", self.data_label)
     
     def create_header(self):
         header_frame = tk.Frame(self.main_container, bg="#162447", height=70)
         header_frame.pack(fill="x", pady=(0, 10))
+        self.header_frame = header_frame
         
         # Sol tarafta başlık
         title_label = tk.Label(header_frame, text="⚓ SUALTI ARACI KONTROL SİSTEMİ", 
@@ -121,7 +303,11 @@ class SystemControlInterface:
             "ivme_y": tk.StringVar(value="0.08g"),
             "ivme_z": tk.StringVar(value="0.95g"),
             "manyetik": tk.StringVar(value="52.3µT"),
-            "gyro": tk.StringVar(value="0.05°/s")
+            "gyro": tk.StringVar(value="0.05°/s"),
+            "yön": tk.StringVar(value="--"),
+            "yatış": tk.StringVar(value="--"),
+            "yunuslama": tk.StringVar(value="--"),
+            "hız": tk.StringVar(value="--")
         }
         
         details = [
@@ -131,7 +317,11 @@ class SystemControlInterface:
             ("📈 İvme Y:", self.sensor_values["ivme_y"]),
             ("📈 İvme Z:", self.sensor_values["ivme_z"]),
             ("🧲 Manyetik:", self.sensor_values["manyetik"]),
-            ("🔄 Gyro:", self.sensor_values["gyro"])
+            ("🔄 Gyro:", self.sensor_values["gyro"]),
+            ("🧭 Yön:", self.sensor_values["yön"]),
+            ("↔️ Yatış:", self.sensor_values["yatış"]),
+            ("↕️ Yunuslama:", self.sensor_values["yunuslama"]),
+            ("🚤 Hız:", self.sensor_values["hız"])
         ]
         
         for label, var in details:
@@ -152,6 +342,37 @@ class SystemControlInterface:
                                      padx=10, pady=10)
         pressure_frame.pack(fill="x", padx=10, pady=10)
         
+        tk.Label(pressure_frame, text="Grafik yükleniyor...", height=10,
+                 font=("Arial", 10), bg="#0f3460", fg="#b3b3cc").pack(fill="both")
+        self.pressure_frame = pressure_frame
+        
+        # Derinlik Grafiği
+        depth_frame = tk.LabelFrame(left_frame, text="🌊 DERİNLİK (m)", 
+                                  font=("Arial", 12, "bold"),
+                                  bg="#0f3460", fg="#e6e6e6",
+                                  padx=10, pady=10)
+        depth_frame.pack(fill="x", padx=10, pady=10)
+        tk.Label(depth_frame, text="Grafik yükleniyor...", height=10,
+                 font=("Arial", 10), bg="#0f3460", fg="#b3b3cc").pack(fill="both")
+        self.depth_frame = depth_frame
+        
+        tk.Button(left_frame, text="📈 GEÇMİŞ",
+                  font=("Arial", 10, "bold"),
+                  bg="#3498db", fg="white",
+                  command=self.open_history_explorer).pack(fill="x", padx=10, pady=(0, 10))
+    
+    @timed("yükleme:grafik")
+    def load_charts(self):
+        """Basınç ve derinlik grafiklerini kur (matplotlib burada yüklenir)"""
+        import matplotlib
+        matplotlib.use('TkAgg')
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        
+        for frame in (self.pressure_frame, self.depth_frame):
+            for child in frame.winfo_children():
+                child.destroy()
+        
         self.fig_pressure = Figure(figsize=(3.5, 2.5), dpi=80, facecolor='#0f3460')
         self.ax_pressure = self.fig_pressure.add_subplot(111)
         self.ax_pressure.set_facecolor('#0f3460')
@@ -160,17 +381,14 @@ class SystemControlInterface:
         self.ax_pressure.set_xlabel('Zaman (s)', color='white')
         self.line_pressure, = self.ax_pressure.plot([], [], 'y-', linewidth=2)
         
-        self.canvas_pressure = FigureCanvasTkAgg(self.fig_pressure, pressure_frame)
+        self.canvas_pressure = FigureCanvasTkAgg(self.fig_pressure, self.pressure_frame)
+        self.chart_pressure = BlitStripChart(self.canvas_pressure, self.ax_pressure,
+                                             self.line_pressure,
+                                             ylim=(950, 1050),
+                                             xlim=(-CHART_WINDOW_SECONDS, 0))
         self.canvas_pressure.draw()
         self.canvas_pressure.get_tk_widget().pack(fill="both", expand=True)
         
-        # Derinlik Grafiği
-        depth_frame = tk.LabelFrame(left_frame, text="🌊 DERİNLİK (m)", 
-                                  font=("Arial", 12, "bold"),
-                                  bg="#0f3460", fg="#e6e6e6",
-                                  padx=10, pady=10)
-        depth_frame.pack(fill="x", padx=10, pady=10)
-        
         self.fig_depth = Figure(figsize=(3.5, 2.5), dpi=80, facecolor='#0f3460')
         self.ax_depth = self.fig_depth.add_subplot(111)
         self.ax_depth.set_facecolor('#0f3460')
@@ -179,9 +397,15 @@ class SystemControlInterface:
         self.ax_depth.set_xlabel('Zaman (s)', color='white')
         self.line_depth, = self.ax_depth.plot([], [], 'c-', linewidth=2)
         
-        self.canvas_depth = FigureCanvasTkAgg(self.fig_depth, depth_frame)
+        self.canvas_depth = FigureCanvasTkAgg(self.fig_depth, self.depth_frame)
+        self.chart_depth = BlitStripChart(self.canvas_depth, self.ax_depth,
+                                          self.line_depth,
+                                          ylim=(0, 100),
+                                          xlim=(-CHART_WINDOW_SECONDS, 0))
         self.canvas_depth.draw()
         self.canvas_depth.get_tk_widget().pack(fill="both", expand=True)
+        
+        self.schedule_graph_updates()
     
     def create_center_panel(self, parent):
         """Orta paneli eşit parçalı (Kamera/Harita) oluşturur"""
@@ -200,6 +424,31 @@ class SystemControlInterface:
         # pack_propagate(False) diyerek, içeriğin (resmin) çerçeveyi büyütmesini engelliyoruz.
         self.camera_frame.pack_propagate(False)
         
+        # Kamera ölçümleri (yakalama / gösterim FPS, atlanan kareler)
+        tk.Label(self.camera_frame, textvariable=self.camera_stats_var,
+                 font=("Arial", 8), bg="#0f3460", fg="#b3b3cc",
+                 anchor="w").pack(side="bottom", fill="x")
+        
+        # Fotoğraf / seri çekim düğmeleri
+        camera_tools = tk.Frame(self.camera_frame, bg="#0f3460")
+        camera_tools.pack(side="bottom", fill="x", pady=(4, 0))
+        tk.Button(camera_tools, text="📸 FOTOĞRAF",
+                  font=("Arial", 9, "bold"),
+                  bg="#3498db", fg="white",
+                  command=self.capture_image).pack(side="left", padx=2)
+        tk.Button(camera_tools, text="🎞️ SERİ ÇEKİM",
+                  font=("Arial", 9, "bold"),
+                  bg="#9b59b6", fg="white",
+                  command=self.capture_burst).pack(side="left", padx=2)
+        self.record_button = tk.Button(camera_tools, text="⏺ KAYIT",
+                                       font=("Arial", 9, "bold"),
+                                       bg="#e74c3c", fg="white",
+                                       command=self.toggle_recording)
+        self.record_button.pack(side="left", padx=2)
+        tk.Label(camera_tools, textvariable=self.capture_status_var,
+                 font=("Arial", 9), bg="#0f3460", fg="#00ff00",
+                 anchor="w").pack(side="left", fill="x", expand=True, padx=6)
+        
         # Kamera görüntü alanı (Label)
         self.camera_label = tk.Label(self.camera_frame, bg="#000000", 
                                    text="Kamera başlatılıyor...",
@@ -216,6 +465,33 @@ class SystemControlInterface:
         
         self.create_map_section(task_frame)
 
+    @timed("yükleme:kamera")
+    def load_camera_panel(self):
+        """Kamera gösterimi, kare halkası, çekim ve kaydı kur (OpenCV burada yüklenir)"""
+        from camera import FrameDisplay, FrameRing, RateMeter, SnapshotWriter
+        from recorder import VideoRecorder
+        
+        self.display_meter = RateMeter()
+        self.frame_display = FrameDisplay(self.camera_label)
+        
+        # Son kareler halkası (anlık görüntü / seri çekim buradan beslenir)
+        self.frame_ring = FrameRing(seconds=max(BURST_PRE_SECONDS, BURST_POST_SECONDS) + 0.5,
+                                    max_frames=CAMERA_SHARED_SLOTS - 8)
+        self.snapshots = SnapshotWriter(
+            self.frame_ring,
+            notify=lambda ok, message: self.ui_bus.post(
+                "çekim", ("✅ " if ok else "❌ ") + message))
+        
+        # Video kaydı (kuyruk doluysa en eski kare atılır)
+        self.recorder = VideoRecorder(segment_seconds=RECORD_SEGMENT_SECONDS,
+                                      queue_size=RECORD_QUEUE_SIZE,
+                                      drop_policy="oldest")
+        
+        if self.live:
+            self.init_camera()
+        else:
+            self.frame_display.clear("📼 Tekrar modu")
+    
     def create_map_section(self, parent):
         """Harita alanını parent içine yerleştirir"""
         map_frame = tk.Frame(parent, bg="#0f3460")
@@ -225,20 +501,34 @@ class SystemControlInterface:
                               font=("Arial", 10), bg="#0f3460", fg="#00ff00", anchor="w")
         status_label.pack(fill="x", pady=(0, 6), side="top")
 
-        if tkintermapview:
-            self.map_widget = tkintermapview.TkinterMapView(
-                map_frame, corner_radius=0)
-            self.map_widget.set_tile_server("https://a.tile.openstreetmap.org/{z}/{x}/{y}.png")
-            self.map_widget.set_zoom(15)
-            self.map_widget.set_position(41.0082, 28.9784)  # İstanbul başlangıç
-            self.map_widget.pack(fill="both", expand=True)
-        else:
-            tk.Label(map_frame,
+        self.map_frame = map_frame
+        self._map_placeholder = tk.Label(map_frame, text="Harita yükleniyor...",
+                                         font=("Arial", 11), bg="#0f3460", fg="#b3b3cc")
+        self._map_placeholder.pack(fill="both", expand=True)
+    
+    @timed("yükleme:harita")
+    def load_map(self):
+        """Harita bileşenini kur (tkintermapview ve PIL burada yüklenir)"""
+        self._map_placeholder.destroy()
+        try:
+            import tkintermapview  # type: ignore  # noqa: F401
+        except ImportError:
+            tk.Label(self.map_frame,
                      text="Harita için 'pip install tkintermapview' kurun.\n"
                           "Şimdilik harita yüklenemedi.",
                      font=("Arial", 11, "bold"),
                      bg="#0f3460", fg="#ffb347",
                      justify="left").pack(fill="both", expand=True, pady=8)
+            return
+        
+        self.vehicle_icon = self.create_vehicle_icon()
+        self.map_widget = create_map_view(self.map_frame, self.tile_provider, corner_radius=0)
+        self.map_widget.set_tile_server(self.tile_provider.url_template)
+        self.map_widget.set_zoom(15)
+        self.map_widget.set_position(41.0082, 28.9784)  # İstanbul başlangıç
+        self.map_widget.pack(fill="both", expand=True)
+        # İz artımlı çizilir, eski kısımlar sadeleştirilir; tüm geçmiş saklanır
+        self.map_track = TrackLayer(self.map_widget)
     
     def create_right_panel(self, parent):
         right_frame = tk.Frame(parent, bg="#0f3460", width=350,
@@ -280,12 +570,17 @@ class SystemControlInterface:
                              troughcolor="#2c3e50",
                              command=self.update_motor_speed)
         speed_scale.pack(fill="x")
+        self.command_widgets.append(speed_scale)
         
         self.speed_label = tk.Label(speed_frame, text="%50", 
                                   font=("Arial", 12, "bold"),
                                   bg="#0f3460", fg="#00ffff")
         self.speed_label.pack(pady=5)
         
+        # Komut gönderim ölçümleri (onay gecikmesi, birleştirilen komutlar)
+        tk.Label(speed_frame, textvariable=self.motor_stats_var,
+                 font=("Arial", 8), bg="#0f3460", fg="#b3b3cc").pack()
+        
         # Yön kontrolü
         tk.Label(motor_frame, text="🧭 YÖN KONTROLÜ:", 
                 font=("Arial", 10, "bold"),
@@ -315,6 +610,7 @@ class SystemControlInterface:
                           width=4, height=2,
                           command=cmd)
             btn.grid(row=row, column=col, padx=3, pady=3)
+            self.command_widgets.append(btn)
         
         # Özel hareketler
         special_frame = tk.Frame(motor_frame, bg="#0f3460")
@@ -340,6 +636,7 @@ class SystemControlInterface:
                           padx=10, pady=6,
                           command=lambda t=text: self.special_move(t))
             btn.pack(side="left", padx=2, expand=True, fill="x")
+            self.command_widgets.append(btn)
         
         # Acil durum butonu
         emergency_btn = tk.Button(motor_frame, text="🚨 ACİL DURDUR",
@@ -348,20 +645,28 @@ class SystemControlInterface:
                                 padx=20, pady=10,
                                 command=self.emergency_stop)
         emergency_btn.pack(fill="x", pady=(15, 5))
+        self.command_widgets.append(emergency_btn)
 
         # Otonom ve Hedef Takip
         modes_frame = tk.Frame(motor_frame, bg="#0f3460")
         modes_frame.pack(fill="x", pady=(0, 10))
-        tk.Button(modes_frame, text="🚀 OTONOM MOD",
-                  font=("Arial", 10, "bold"),
-                  bg="#9b59b6", fg="white",
-                  padx=10, pady=8,
-                  command=lambda: self.start_task("🚀 OTONOM MOD")).pack(side="left", expand=True, fill="x", padx=4)
+        autopilot_btn = tk.Button(modes_frame, text="🚀 OTONOM MOD",
+                                  font=("Arial", 10, "bold"),
+                                  bg="#9b59b6", fg="white",
+                                  padx=10, pady=8,
+                                  command=lambda: self.start_task("🚀 OTONOM MOD"))
+        autopilot_btn.pack(side="left", expand=True, fill="x", padx=4)
+        self.command_widgets.append(autopilot_btn)
         tk.Button(modes_frame, text="🎯 HEDEF TAKİP",
                   font=("Arial", 10, "bold"),
                   bg="#3498db", fg="white",
                   padx=10, pady=8,
                   command=lambda: self.start_task("🎯 HEDEF TAKİP")).pack(side="left", expand=True, fill="x", padx=4)
+        
+        # Otonom mod durumu ve döngü zamanlaması (sapma, taşma)
+        tk.Label(motor_frame, textvariable=self.autopilot_var,
+                 font=("Arial", 8), bg="#0f3460", fg="#b3b3cc",
+                 justify="left", wraplength=330).pack(anchor="w")
     
     def create_footer(self):
         footer_frame = tk.Frame(self.main_container, bg="#162447", height=40)
@@ -371,14 +676,14 @@ class SystemControlInterface:
         info_frame = tk.Frame(footer_frame, bg="#162447")
         info_frame.pack(fill="both", expand=True)
         
-        # Bağlantı durumu
-        self.connection_label = tk.Label(info_frame, text="🔗 Bağlantı: AKTİF",
+        # Bağlantı durumu (bekçi ölçümlerinden güncellenir)
+        self.connection_label = tk.Label(info_frame, text="🔗 Bağlantı: BEKLENİYOR",
                                        font=("Arial", 9, "bold"),
-                                       bg="#162447", fg="#00ff00")
+                                       bg="#162447", fg="#b3b3cc")
         self.connection_label.pack(side="left", padx=20)
         
         # Veri akışı
-        self.data_label = tk.Label(info_frame, text="📊 Veri Akışı: 125 Hz",
+        self.data_label = tk.Label(info_frame, text="📊 Veri Akışı: —",
                                   font=("Arial", 9),
                                   bg="#162447", fg="#00ffff")
         self.data_label.pack(side="left", padx=20)
@@ -396,96 +701,140 @@ class SystemControlInterface:
                 bg="#162447", fg="#00ff00").pack(side="left")
     
     def init_camera(self):
-        """Kamerayı başlat"""
-        try:
-            self.cap = cv2.VideoCapture(0)
-            if self.cap.isOpened():
-                self.camera_active = True
-                self.start_camera_stream()
-            else:
-                self.camera_active = False
-                self.camera_label.config(text="❌ Kamera bulunamadı veya erişilemiyor.")
-                if self.cap:
-                    self.cap.release()
-        except Exception as e:
-            self.camera_active = False
-            self.camera_label.config(text=f"⚠️ Kamera hatası: {str(e)[:50]}")
-            if self.cap:
-                self.cap.release()
+        """Kamerayı başlat (açılış ve okuma ayrı iş parçacığında)"""
+        from camera import CameraCaptureThread
+        
+        if self.capture:
+            self.capture.stop()
+        self.capture = CameraCaptureThread(CAMERA_INDEX, capture_factory=self.camera_factory,
+                                           ring=self.frame_ring,
+                                           shared_slots=CAMERA_SHARED_SLOTS)
+        # Kayıt kuyruğa bırakılır, canlı görüntüye gecikme eklemez
+        self.recorder.frame_valid = self.capture.frame_valid
+        self.capture.consumers.append(self.recorder.submit)
+        if self.vision:
+            self.vision.source = self.capture
+            self.capture.consumers.append(self.vision.submit)
+        self.capture.start()
+        self.camera_active = True
+        self.start_camera_stream()
     
+    @timed("kamera")
     def start_camera_stream(self):
         """Kamera görüntüsünü göster (Stabil Boyutlandırma)"""
-        if self.camera_active and self.cap and self.cap.isOpened():
-            ret, frame = self.cap.read()
-            if ret:
-                # OpenCV BGR -> RGB dönüşümü
-                frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                
-                # --- ÇÖZÜM: TAŞMAYI ENGELLEYEN BOYUTLANDIRMA ---
-                # Çerçevenin (LabelFrame) boyutunu alıyoruz (Resmin konacağı yer)
-                container_w = self.camera_frame.winfo_width()
-                container_h = self.camera_frame.winfo_height()
-                
-                # Pencere henüz yüklenmediyse standart boyut kullan
-                if container_w < 10 or container_h < 10:
-                    container_w, container_h = 640, 480
-                
-                # Görüntüyü çerçevenin içine sığacak şekilde küçült (Boşluk payı bırak)
-                # 20 piksel boşluk bırakıyoruz ki sınırları zorlamasın
-                w = container_w - 20 
-                h = container_h - 20
-                
-                if w > 10 and h > 10:
-                    frame = cv2.resize(frame, (w, h))
-                    img = Image.fromarray(frame)
-                    imgtk = ImageTk.PhotoImage(image=img)
-                    self.camera_label.imgtk = imgtk
-                    self.camera_label.config(image=imgtk, text="")
-            
-            # 30 ms sonra tekrar çağır
-            self.root.after(30, self.start_camera_stream)
-        elif self.camera_active:
-            self.camera_label.config(text="Kamera görüntüsü alınamıyor")
+        if self._camera_after_id:
+            self.root.after_cancel(self._camera_after_id)
+            self._camera_after_id = None
+        
+        if not (self.camera_active and self.capture):
+            return
+        
+        if self.capture.status == "failed":
+            self.camera_active = False
+            self.frame_display.clear(f"❌ {self.capture.error}")
+            return
+        
+        # Yakalama iş parçacığındaki en yeni kareyi al (bloklamaz)
+        latest = self.capture.get_latest()
+        if latest is not None:
+            seq, timestamp, frame = latest
+            # Boyut <Configure> ile önceden hesaplandı; tamponlar yeniden kullanılıyor
+            overlay = None
+            if self.vision:
+                from vision import draw_overlay
+                result = self.vision.poll()
+                overlay = lambda image, scale: draw_overlay(image, result, scale)
+            self.frame_display.show(frame, overlay)
+            self.displayed_frames += 1
+            self.display_meter.tick()
+        
+        self.update_camera_stats()
+        self._camera_after_id = self.root.after(int(1000 / CAMERA_DISPLAY_FPS),
+                                                self.start_camera_stream)
+    
+    def camera_stats(self):
+        """Yakalama/gösterim FPS ve atlanan kare sayıları"""
+        capture = self.capture
+        return {
+            "capture_fps": capture.capture_meter.rate() if capture else 0.0,
+            "display_fps": self.display_meter.rate(),
+            "captured": capture.captured if capture else 0,
+            "displayed": self.displayed_frames,
+            "dropped": capture.dropped if capture else 0,
+            "read_failures": capture.read_failures if capture else 0,
+            "copies": capture.copies if capture else 0,
+            "record": self.recorder.stats(),
+            "vision": self.vision.stats() if self.vision else None,
+        }
+    
+    def update_camera_stats(self):
+        """Kamera ölçümlerini saniyede bir etikete yaz"""
+        now = time.monotonic()
+        if now - self._last_camera_stats < 1.0:
+            return
+        self._last_camera_stats = now
+        stats = self.camera_stats()
+        text = (f"Yakalama: {stats['capture_fps']:.1f} FPS | "
+                f"Gösterim: {stats['display_fps']:.1f} FPS | "
+                f"Atlanan: {stats['dropped']}")
+        record = stats["record"]
+        if record["recording"]:
+            text += (f" | ⏺ Kuyruk: {record['queue_depth']}/{record['queue_size']}"
+                     f" Atlanan: {record['dropped']}")
+        vision = stats["vision"]
+        if vision:
+            stages = " ".join(f"{stage} {ms:.1f}" for stage, ms in vision["stages_ms"].items())
+            text += (f" | 🎯 {vision['latency_ms']:.0f} ms (en çok {vision['latency_max_ms']:.0f})"
+                     f" Atlanan: {vision['skipped']} [{stages}]")
+        self.ui_bus.post("kamera", text)
     
     def toggle_camera(self):
         """Kamerayı aç/kapat"""
-        if self.cap and self.cap.isOpened():
-            self.camera_active = not self.camera_active
-            if self.camera_active:
-                self.start_camera_stream()
-            else:
-                self.camera_label.config(image="", text="Kamera durduruldu")
+        if self.camera_active and self.capture:
+            self.camera_active = False
+            self.capture.stop()
+            self.frame_display.clear("Kamera durduruldu")
         else:
             self.init_camera()
     
     def capture_image(self):
-        """Fotoğraf çek"""
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"capture_{timestamp}.png"
-        
-        frame = None
-        cap = None
-        try:
-            cap = cv2.VideoCapture(0)
-            if cap.isOpened():
-                ret, frame = cap.read()
-        finally:
-            if cap and cap.isOpened():
-                cap.release()
-
-        if frame is not None:
-            cv2.imwrite(filename, frame)
-            messagebox.showinfo("Başarılı", f"Fotoğraf kaydedildi: {filename}")
+        """Fotoğraf çek (canlı yayının son karesinden, arka planda kaydedilir)"""
+        if self.snapshots and self.snapshots.snapshot():
+            self.ui_bus.post("çekim", "📸 Fotoğraf kaydediliyor...")
+        else:
+            self.ui_bus.post("çekim", "⚠️ Kamera görüntüsü yok, fotoğraf çekilemedi")
+    
+    def capture_burst(self):
+        """Seri çekim: tetikten önceki ve sonraki kareleri kaydet"""
+        if self.frame_ring is None or self.frame_ring.latest() is None:
+            self.ui_bus.post("çekim", "⚠️ Kamera görüntüsü yok, seri çekim yapılamadı")
+            return
+        self.snapshots.burst(BURST_PRE_SECONDS, BURST_POST_SECONDS)
+        self.ui_bus.post("çekim",
+                         f"🎞️ Seri çekim: son {BURST_PRE_SECONDS:.0f} s + sonraki {BURST_POST_SECONDS:.0f} s...")
+    
+    def toggle_recording(self):
+        """Video kaydını başlat/durdur"""
+        if self.recorder is None:
+            return
+        if self.recorder.recording:
+            stats = self.recorder.stats()
+            self.recorder.stop()
+            self.record_button.config(text="⏺ KAYIT", bg="#e74c3c")
+            self.ui_bus.post("çekim",
+                             f"✅ Kayıt durdu: {self.recorder.session_dir} "
+                             f"({stats['written']} kare, {stats['dropped']} atlanan)")
         else:
-            frame = np.zeros((480, 640, 3), dtype=np.uint8)
-            cv2.putText(frame, "SIMULASYON GORUNTUSU", (150, 240), 
-                        cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 255), 2)
-            cv2.imwrite(filename, frame)
-            messagebox.showinfo("Simülasyon", f"Simüle edilmiş fotoğraf kaydedildi: {filename}")
+            fps = self.capture.capture_meter.rate() if self.capture else 0.0
+            session = self.recorder.start(fps=round(fps) if fps >= 1 else None)
+            self.record_button.config(text="⏹ DURDUR", bg="#7f8c8d")
+            self.ui_bus.post("çekim", f"⏺ Kaydediliyor: {session}")
     
     def create_vehicle_icon(self, size=28):
         """Haritada araç için basit simge"""
         try:
+            from PIL import Image, ImageDraw, ImageTk
+            
             img = Image.new("RGBA", (size, size), (0, 0, 0, 0))
             draw = ImageDraw.Draw(img)
             draw.ellipse((2, 2, size - 2, size - 2), fill=(0, 200, 255, 230))
@@ -498,28 +847,7 @@ class SystemControlInterface:
             print(f"Simge oluşturulamadı: {e}")
             return None
 
-    def start_location_updates(self):
-        """Sensör verisi yoksa bile konumu simüle eder ve haritayı günceller"""
-        if not tkintermapview:
-            return
-
-        self.current_lat = 41.0082
-        self.current_lon = 28.9784
-
-        def loc_thread():
-            while True:
-                try:
-                    self.current_lat += random.uniform(-0.00025, 0.00025)
-                    self.current_lon += random.uniform(-0.00025, 0.00025)
-                    self.root.after(0, lambda lat=self.current_lat, lon=self.current_lon:
-                                    self.update_location_on_map(lat, lon))
-                    time.sleep(1.0)
-                except Exception as e:
-                    print(f"Konum simülasyon hatası: {e}")
-                    time.sleep(2)
-
-        threading.Thread(target=loc_thread, daemon=True).start()
-
+    @timed("harita")
     def update_location_on_map(self, lat, lon):
         """Haritada marker ve izi günceller"""
         if not self.map_widget:
@@ -529,110 +857,107 @@ class SystemControlInterface:
             self.map_marker = self.map_widget.set_marker(lat, lon,
                                                        text="Araç",
                                                        icon=self.vehicle_icon)
+            self.map_widget.set_position(lat, lon)
         else:
             self.map_marker.set_position(lat, lon)
 
-        self.location_points.append((lat, lon))
-        if self.map_path:
-            self.map_path.delete()
-        if len(self.location_points) > 1:
-            self.map_path = self.map_widget.set_path(list(self.location_points))
+        # Sadece yeni nokta eklenir; harita araç kenara yaklaşınca ortalanır
+        self.map_track.append(lat, lon)
+        self.map_track.maybe_recenter(lat, lon)
+        self.location_status_var.set(f"Lat: {lat:.6f}  Lon: {lon:.6f} (tahmini)")
 
-        self.map_widget.set_position(lat, lon)
-        self.location_status_var.set(f"Lat: {lat:.6f}  Lon: {lon:.6f} (simüle)")
+    def reset_map_track(self):
+        """Haritadaki izi temizle (tekrar modunda konumlanırken)"""
+        if self.map_track:
+            self.map_track.clear()
 
-    def start_sensor_simulation(self):
-        """Sensör verilerini simüle et"""
-        def sensor_thread():
-            while True:
-                try:
-                    # Basınç simülasyonu
-                    current_time = time.time()
-                    pressure = 1013.25 + 50 * np.sin(current_time * 0.5) + random.uniform(-2, 2)
-                    depth = 50 + 30 * np.sin(current_time * 0.3) + random.uniform(-1, 1)
-                    
-                    self.pressure_data.append(pressure)
-                    self.depth_data.append(depth)
-                    self.time_data.append(len(self.time_data))
-                    
-                    # Grafikleri güncelle (Veri güncellemesi)
-                    self.update_graphs()
-                    
-                    # Sensör değerlerini güncelle
-                    self.update_sensor_values()
-                    
-                    # Batarya simülasyonu
-                    battery = max(10, 100 - (current_time % 100))
-                    self.battery_var.set(f"{battery:.0f}%")
-                    
-                    time.sleep(0.5)
-                    
-                except Exception as e:
-                    print(f"Sensör hatası: {e}")
-                    time.sleep(1)
+    def on_samples(self, timestamps, block):
+        """Çekirdek aboneliği (alma iş parçacığı): yeni örnekleri güncelleme yoluna gönder"""
+        # Grafikler ayrıca sabit hızda çiziliyor (schedule_graph_updates)
+        self.update_sensor_values()
+        estimate = self.engine.snapshot()
+        self.show_estimate(estimate)
         
-        thread = threading.Thread(target=sensor_thread, daemon=True)
-        thread.start()
+        # Harita ilk konum düzeltmesinden sonra, seyrekleştirilerek güncellenir
+        now = time.monotonic()
+        if estimate["düzeltme"] and now - self._last_map_update >= MAP_UPDATE_SECONDS:
+            self._last_map_update = now
+            self.ui_bus.post("konum", (estimate["lat"], estimate["lon"]))
+    
+    def show_estimate(self, estimate):
+        """Tahmin edilen yönelim ve hızı güncelleme yoluna gönder"""
+        self.ui_bus.post_many({key: estimate[key] for key in ESTIMATE_FORMATS})
     
+    def watch_link(self):
+        """Bağlantı bekçisi: durum ve ölçülen veri hızını yayınla"""
+        health = self.link_health.check()
+        self.ui_bus.post("bağlantı", health["state"])
+        text = (f"📊 Veri Akışı: {health['rate']:.1f} Hz | "
+                f"Yaş p95 {health['age_p95'] * 1000:.0f} ms | "
+                f"Boşluk p95 {health['gap_p95'] * 1000:.0f} ms")
+        if health["stale"]:
+            text += " | Susan: " + ", ".join(health["stale"])
+        self.ui_bus.post("veri", text)
+        self.root.after(LINK_CHECK_MS, self.watch_link)
+    
+    def show_link_state(self, state):
+        """Bağlantı durumunu alt bilgi ve başlıktaki göstergeye yansıt"""
+        indicator, color = LINK_STYLES.get(state, ("● BEKLENİYOR", "#b3b3cc"))
+        self.connection_label.config(text=f"🔗 Bağlantı: {state}", fg=color)
+        self.status_indicator.config(text=indicator, fg=color)
+    
+    def schedule_graph_updates(self):
+        """Grafikleri sensör hızından bağımsız, sabit hızda çiz"""
+        self.update_graphs()
+        self.root.after(int(1000 / CHART_FPS), self.schedule_graph_updates)
+
+    @timed("grafik")
     def update_graphs(self):
-        """Grafikleri güncelle"""
+        """Grafikleri güncelle (sadece çizgi verisi + blit)"""
         try:
-            # Sadece verileri güncellemek performans için daha iyidir
-            # Ancak matplotlib-tkagg entegrasyonunda clear() en temiz yöntemlerden biridir
-            # İleri seviye optimizasyon için set_ydata kullanılabilir.
-            
-            # Basınç
-            self.ax_pressure.clear()
-            self.ax_pressure.set_facecolor('#0f3460')
-            self.ax_pressure.tick_params(colors='white')
-            self.ax_pressure.set_ylabel('Basınç (hPa)', color='white')
-            self.ax_pressure.set_xlabel('Zaman (s)', color='white')
-            
-            data_to_show = min(50, len(self.pressure_data))
-            x_data = list(range(data_to_show))
-            y_data = list(self.pressure_data)[-data_to_show:]
-            
-            self.ax_pressure.plot(x_data, y_data, 'y-', linewidth=2)
-            self.ax_pressure.set_ylim(950, 1050)
-            
-            # Derinlik
-            self.ax_depth.clear()
-            self.ax_depth.set_facecolor('#0f3460')
-            self.ax_depth.tick_params(colors='white')
-            self.ax_depth.set_ylabel('Derinlik (m)', color='white')
-            self.ax_depth.set_xlabel('Zaman (s)', color='white')
-            
-            y_depth = list(self.depth_data)[-data_to_show:]
-            self.ax_depth.plot(x_data, y_depth, 'c-', linewidth=2)
-            self.ax_depth.set_ylim(0, 100)
+            # Yeni örnek geldiyse çizgi verisini değiştir
+            count = self.telemetry.count
+            if count != self._charted_sample_count and count > 0:
+                self._charted_sample_count = count
+                
+                # Son pencere, depodan kopyasız görünüm olarak alınır; alma
+                # iş parçacığı aynı anda yazmasın diye çizgiye kopyalanana dek kilitli
+                with self.engine.lock:
+                    latest_t, _ = self.telemetry.latest()
+                    times, data = self.telemetry.window(latest_t - CHART_WINDOW_SECONDS)
+                    x_data = times - latest_t
+                    
+                    self.chart_pressure.set_data(x_data, data["basınç"])
+                    self.chart_depth.set_data(x_data, data["derinlik"])
             
-            self.canvas_pressure.draw()
-            self.canvas_depth.draw()
+            # Boyut veya y-sınırı değiştiyse tam çizim, aksi halde blit
+            self.chart_pressure.render()
+            self.chart_depth.render()
             
         except Exception as e:
             print(f"Grafik güncelleme hatası: {e}")
     
-    def update_sensor_values(self):
-        """Sensör değerlerini güncelle"""
-        temp = 20 + 5 * np.sin(time.time() * 0.2) + random.uniform(-0.5, 0.5)
-        humidity = 40 + 10 * np.sin(time.time() * 0.1) + random.uniform(-2, 2)
-        
-        self.sensor_values["sıcaklık"].set(f"{temp:.1f}°C")
-        self.sensor_values["nem"].set(f"{humidity:.0f}%")
-        
-        ax = 0.1 * np.sin(time.time())
-        ay = 0.08 * np.sin(time.time() * 1.2)
-        az = 0.95 + 0.05 * np.sin(time.time() * 0.5)
-        
-        self.sensor_values["ivme_x"].set(f"{ax:.3f}g")
-        self.sensor_values["ivme_y"].set(f"{ay:.3f}g")
-        self.sensor_values["ivme_z"].set(f"{az:.3f}g")
+    def open_history_explorer(self):
+        """Tüm görev geçmişini yakınlaştırılabilir pencerede aç"""
+        if self.history_explorer:
+            self.history_explorer.window.lift()
+            return
+        from history_pyramid import HistoryExplorer
         
-        mag = 50 + 5 * np.sin(time.time() * 0.3)
-        self.sensor_values["manyetik"].set(f"{mag:.1f}µT")
+        self.history_explorer = HistoryExplorer(
+            self.root, self.history,
+            on_close=lambda: setattr(self, "history_explorer", None))
+    
+    @timed("sensör")
+    def update_sensor_values(self):
+        """Depodaki son örneği güncelleme yoluna gönder (her iş parçacığından)"""
+        _, values = self.telemetry.latest()
+        if not values:
+            return values
         
-        gyro = 0.05 * np.sin(time.time())
-        self.sensor_values["gyro"].set(f"{gyro:.2f}°/s")
+        self.ui_bus.post_many({key: values[key] for key in SENSOR_FORMATS})
+        self.ui_bus.post("batarya", values["batarya"])
+        return values
     
     def update_time(self):
         """Saati güncelle"""
@@ -640,9 +965,60 @@ class SystemControlInterface:
         self.time_label.config(text=f"🕒 {now}")
         self.root.after(1000, self.update_time)
     
+    def watch_remote_role(self, client):
+        """Dağıtım sunucusunun verdiği rolü izle; birincil değilsek komutları kapat"""
+        if client.role is not None and (client.role != ROLE_PRIMARY) != self.read_only:
+            self.set_read_only(client.role != ROLE_PRIMARY, client.note)
+        self.root.after(ROLE_CHECK_MS, self.watch_remote_role, client)
+    
+    def set_read_only(self, read_only, note=None):
+        """Salt okunur izleyici: komut düğmeleri ve otonom mod kapalı"""
+        self.read_only = read_only
+        if read_only and self.autopilot.engaged:
+            self.autopilot.disengage()
+            self.ui_bus.post("otonom", "🤖 Otonom: kapalı")
+        for widget in self.command_widgets:
+            widget.config(state="disabled" if read_only else "normal")
+        if self._base_title is None:
+            self._base_title = self.root.title()
+        if read_only:
+            self.root.title(self._base_title + " — İZLEYİCİ")
+            self.motor_status.config(text=f"👁 SALT OKUNUR: {note or 'izleyici'}",
+                                     fg="#b3b3cc")
+        else:
+            self.root.title(self._base_title)
+            self.motor_status.config(text="⚡ MOTORLAR HAZIR", fg="#00ff00")
+    
     def update_motor_speed(self, value):
-        """Motor hızını güncelle"""
+        """Motor hızını güncelle (sürüklerken sadece son değer gönderilir)"""
+        if self.read_only:
+            return
         self.speed_label.config(text=f"%{value}")
+        self.motors.set_speed(int(float(value)))
+    
+    def update_motor_stats(self):
+        """Komut gönderim ölçümlerini saniyede bir yaz"""
+        stats = self.motors.stats()
+        text = (f"📡 {stats['transport']} | Onay p50 {stats['ack_p50'] * 1000:.0f} ms"
+                f" p95 {stats['ack_p95'] * 1000:.0f} ms | Birleşen: {stats['coalesced']}")
+        if stats["timeouts"] or stats["errors"]:
+            text += f" | ⚠️ Yanıtsız: {stats['timeouts']} Hata: {stats['errors']}"
+        if stats["estop_failures"]:
+            text += f" | 🚨 Onaysız acil dur: {stats['estop_failures']}"
+        if stats["estop_failures"] > self._estop_failures:
+            # Araç acil durdurmayı hiç onaylamadı: durduğu varsayılmasın
+            self._estop_failures = stats["estop_failures"]
+            self.motor_status.config(text="🚨 ACİL DURDURMA ONAYLANMADI", fg="#e74c3c")
+        self.ui_bus.post("motor", text)
+        
+        if self.autopilot.engaged:
+            stats = self.autopilot.stats()
+            text = (f"🤖 Otonom: {stats['mode']} | {stats['rate']:.0f} Hz, "
+                    f"sapma p99 {stats['jitter_p99'] * 1000:.1f} ms, taşma {stats['overruns']}")
+            if stats["stale"] or stats["errors"]:
+                text += f" | ⚠️ Eski veri: {stats['stale']} Hata: {stats['errors']}"
+            self.ui_bus.post("otonom", text)
+        self.root.after(1000, self.update_motor_stats)
     
     def move_direction(self, direction):
         """Yön hareketi"""
@@ -653,47 +1029,207 @@ class SystemControlInterface:
             "DUR": "DURDU"
         }
         
-        if direction in directions:
+        if direction in directions and not self.read_only:
+            self.motors.move(directions[direction])
             self.motor_status.config(text=f"🏃 {directions[direction]}", fg="#f39c12")
-            messagebox.showinfo("Hareket", f"Araç {directions[direction]} yönünde hareket ediyor")
     
     def special_move(self, move_type):
-        """Özel hareket"""
+        """Özel hareket (otonom döngüdeki ilgili kontrolcüyü kurar)"""
         moves = {
-            "🔄 DÖNÜŞ": "360° dönüş yapılıyor",
-            "📏 YÜKSEL": "Yüzeye yükseliyor",
-            "📐 DAL": "Derinliğe dalıyor",
-            "⚖️ DENGE": "Dengeleme yapılıyor"
+            "🔄 DÖNÜŞ": ("360° dönüş yapılıyor", self.autopilot.turn),
+            "📏 YÜKSEL": ("Yüzeye yükseliyor", self.autopilot.surface),
+            "📐 DAL": ("Derinliğe dalıyor", self.autopilot.dive),
+            "⚖️ DENGE": ("Dengeleme yapılıyor", self.autopilot.stabilize)
         }
         
-        if move_type in moves:
-            messagebox.showinfo("Özel Hareket", moves[move_type])
+        if move_type in moves and not self.read_only:
+            if not self.live:
+                self.motor_status.config(text="📼 Tekrar modunda hareket yok", fg="#b3b3cc")
+                return
+            description, start = moves[move_type]
+            start()
+            self.motor_status.config(text=f"🏃 {description}", fg="#f39c12")
+            self.ui_bus.post("otonom", f"🤖 Otonom: {self.autopilot.describe()}")
     
     def emergency_stop(self):
-        """Acil durdur"""
+        """Acil durdur (kuyruktaki tüm komutların önüne geçer)"""
+        if self.read_only:
+            return
+        if self.autopilot.engaged:
+            self.autopilot.disengage()
+            self.ui_bus.post("otonom", "🤖 Otonom: kapalı")
+        self.motors.emergency_stop()
         self.motor_status.config(text="🚨 ACİL DURDURULDU", fg="#e74c3c")
         self.speed_var.set(0)
         self.speed_label.config(text="%0")
-        messagebox.showwarning("Acil Durum", "Tüm motorlar acil durduruldu!")
     
     def start_task(self, task_name):
         """Görev başlat"""
-        tasks = {
-            "🚀 OTONOM MOD": "Otonom mod başlatıldı",
-            "🎯 HEDEF TAKİP": "Hedef takip modu aktif"
-        }
+        if task_name == "🎯 HEDEF TAKİP":
+            self.toggle_target_tracking()
+            return
         
-        if task_name in tasks:
-            messagebox.showinfo("Görev", tasks[task_name])
+        if task_name == "🚀 OTONOM MOD":
+            self.toggle_autopilot()
+    
+    def toggle_autopilot(self):
+        """Otonom modu aç (şimdiki derinlik/yönü tut, dengele) ya da kapat"""
+        if self.autopilot.engaged:
+            self.autopilot.disengage()
+            self.motor_status.config(text="⚡ MOTORLAR HAZIR", fg="#00ff00")
+            self.ui_bus.post("otonom", "🤖 Otonom: kapalı")
+            return
+        
+        if not self.live:
+            self.ui_bus.post("otonom", "🤖 Otonom: tekrar modunda kullanılamaz")
+            return
+        if self.read_only:
+            self.ui_bus.post("otonom", "🤖 Otonom: izleyici konsolda kullanılamaz")
+            return
+        
+        self.autopilot.engage()
+        self.motor_status.config(text="🚀 OTONOM MOD", fg="#9b59b6")
+        self.ui_bus.post("otonom", f"🤖 Otonom: {self.autopilot.describe()}")
+    
+    def toggle_target_tracking(self):
+        """Hedef takibini aç/kapat (kamera akışına tüketici olarak bağlanır)"""
+        if self.vision:
+            vision, self.vision = self.vision, None
+            if self.capture and vision.submit in self.capture.consumers:
+                self.capture.consumers.remove(vision.submit)
+            vision.stop()
+            self.ui_bus.post("çekim", "🎯 Hedef takibi kapatıldı")
+            return
+        
+        if not (self.camera_active and self.capture):
+            self.ui_bus.post("çekim", "⚠️ Kamera kapalı, hedef takibi başlatılamadı")
+            return
+        
+        from vision import VisionPipeline
+        
+        self.vision = VisionPipeline(detect_every=VISION_DETECT_EVERY,
+                                     process_width=VISION_PROCESS_WIDTH,
+                                     frame_budget=1 / CAMERA_DISPLAY_FPS,
+                                     source=self.capture)
+        self.vision.start()
+        self.capture.consumers.append(self.vision.submit)
+        self.ui_bus.post("çekim", "🎯 Hedef takibi aktif")
+    
+    def start_perf(self, metrics_file=None, metrics_port=None):
+        """Olay döngüsü gecikme sondası, F12 tablosu ve isteğe bağlı dışa aktarım"""
+        PERF.add_histogram("motor_ack", self.motors.ack_latency)
+        PERF.add_histogram("link_age", self.link_health.age)
+        PERF.add_histogram("link_gap", self.link_health.gap)
+        PERF.add_histogram("control_jitter", self.autopilot.loop.jitter)
+        PERF.add_histogram("control_work", self.autopilot.loop.work)
+        self.lag_probe = TkLagProbe(self.root, interval_ms=PERF_LAG_PROBE_MS)
+        self.lag_probe.start()
+        self.perf_overlay = PerfOverlay(self.root)
+        self.metrics_exporter = None
+        if metrics_file or metrics_port is not None:
+            self.metrics_exporter = MetricsExporter(path=metrics_file, port=metrics_port,
+                                                    interval=PERF_EXPORT_SECONDS)
+            try:
+                self.metrics_exporter.start()
+            except OSError as e:
+                print(f"Ölçüm uç noktası açılamadı: {e}")
+                self.metrics_exporter = None
     
     def on_closing(self):
         """Pencere kapanırken kaynakları serbest bırak"""
-        if self.cap:
-            self.cap.release()
+        if self.capture:
+            self.capture.stop()
+        if self.vision:
+            self.vision.stop()
+        if self.autopilot.engaged:
+            self.autopilot.disengage()
+        self.engine.stop()
+        if self.recorder:
+            self.recorder.stop()
+        if self.snapshots:
+            self.snapshots.shutdown()
+        self.lag_probe.stop()
+        if self.metrics_exporter:
+            self.metrics_exporter.stop()
         self.root.destroy()
+        self.tile_store.close()
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Sualtı aracı kontrol arayüzü")
+    parser.add_argument("--replay", metavar="LOG",
+                        help="Canlı veri yerine kayıtlı telemetriyi oynat (.otl)")
+    parser.add_argument("--video", metavar="DIR",
+                        help="Tekrar modunda gösterilecek video kayıt klasörü (rec_...)")
+    parser.add_argument("--source", action="append", metavar="SPEC",
+                        help="Sensör kaynağı (birden çok verilebilir): sim[:HZ], "
+                             "vsim[:HZ[:SENARYO[:TOHUM]]], serial:PORT[:BAUD], udp:HOST:PORT, replay:DOSYA[:HIZ]")
+    parser.add_argument("--speed", type=float, default=1.0,
+                        help=f"Oynatma hızı ({REPLAY_SPEEDS[0]:g}-{REPLAY_SPEEDS[-1]:g})")
+    parser.add_argument("--motor", default="loop", metavar="SPEC",
+                        help="Motor komut aktarımı: loop (araç taklidi), "
+                             "serial:PORT[:BAUD], udp:HOST:PORT")
+    parser.add_argument("--offline-map", action="store_true",
+                        help=f"Harita karolarını sadece önbellekten ({MAP_TILE_DB}) yükle")
+    parser.add_argument("--tile-server", default=MAP_TILE_SERVER, metavar="URL",
+                        help="Karo sunucusu şablonu ({z}/{x}/{y})")
+    parser.add_argument("--metrics-file", metavar="DOSYA",
+                        help="Performans ölçümlerini Prometheus metin biçiminde "
+                             f"{PERF_EXPORT_SECONDS:g} s'de bir bu dosyaya yaz")
+    parser.add_argument("--metrics-port", type=int, metavar="PORT",
+                        help="Ölçümleri http://127.0.0.1:PORT/metrics adresinde sun")
+    parser.add_argument("--sim-vehicle", action="store_true",
+                        help="Benzetilmiş araç: sensör kaynağı ve motor aktarımı olarak "
+                             "(otonom modu kapalı çevrimde denemek için)")
+    parser.add_argument("--simulate", metavar="SENARYO",
+                        help="Yük denemesi: tohumlu araç benzetimi (vehicle_sim.py) "
+                             "sensör kaynağı ve hareketli hedefli kamera olarak; "
+                             "senaryolar: dalış, kesinti, gürültü, bağlantı, karma")
+    parser.add_argument("--sim-rate", type=float, metavar="HZ",
+                        help="--simulate örnek hızı (varsayılan 1000)")
+    parser.add_argument("--sim-seed", type=int, default=0, metavar="TOHUM")
+    parser.add_argument("--connect", metavar="HOST[:PORT]",
+                        help="Araca doğrudan değil dağıtım sunucusu (fanout_server.py) "
+                             "üzerinden bağlan: telemetri, video ve komutlar oradan")
+    parser.add_argument("--viewer", action="store_true",
+                        help="--connect ile: salt okunur izleyici olarak bağlan")
+    return parser.parse_args()
 
 if __name__ == "__main__":
+    args = parse_args()
     root = tk.Tk()
-    app = SystemControlInterface(root)
+    sources = [source_from_spec(spec) for spec in args.source] if args.source else None
+    motor_transport = transport_from_spec(args.motor)
+    if args.sim_vehicle:
+        motor_transport = SimulatedVehicle()
+        sources = (sources or []) + [motor_transport.source()]
+    camera_factory = None
+    if args.simulate:
+        from vehicle_sim import SIM_RATE, VehicleSimSource, camera_factory as sim_camera
+        sources = (sources or []) + [VehicleSimSource(args.simulate, args.sim_rate or SIM_RATE,
+                                                      args.sim_seed)]
+        camera_factory = sim_camera(args.simulate, seed=args.sim_seed)
+    client = None
+    if args.connect:
+        host, _, port = args.connect.partition(":")
+        client = FanoutClient(host, int(port) if port else FANOUT_PORT,
+                              role=ROLE_VIEWER if args.viewer else ROLE_PRIMARY)
+        sources = [client.source()]
+        motor_transport = client.motor_transport()
+        camera_factory = client.camera
+    app = SystemControlInterface(root, live=not args.replay, sources=sources,
+                                 map_offline=args.offline_map,
+                                 tile_server=args.tile_server,
+                                 motor_transport=motor_transport,
+                                 metrics_file=args.metrics_file,
+                                 metrics_port=args.metrics_port,
+                                 camera_factory=camera_factory)
+    if client:
+        # Rol el sıkışmada belli olur (birincil isteyen konsol izleyiciye düşebilir)
+        app.watch_remote_role(client)
+    if args.replay:
+        # Oynatıcı kamera panelini kullanır: paneller kurulunca başlat
+        app.on_ready(lambda: setattr(app, "replay", ReplayController(
+            app, args.replay, video_dir=args.video,
+            speed=args.speed, preload_seconds=CHART_WINDOW_SECONDS)))
     root.protocol("WM_DELETE_WINDOW", app.on_closing)
     root.mainloop()
\ No newline at end of file
@@ -0,0 +1,140 @@
+import threading
+import time
+
+import numpy as np
+
+# Ortak telemetri deposundaki kanallar
+# (sensor_values anahtarları + basınç/derinlik + konum ve batarya;
+# manyetik alan büyüklüğü µT, pusula manyetometreden yön °, gyro sapma hızı °/s)
+TELEMETRY_CHANNELS = (
+    "basınç", "derinlik",
+    "sıcaklık", "nem",
+    "ivme_x", "ivme_y", "ivme_z",
+    "manyetik", "gyro", "pusula",
+    "lat", "lon", "batarya",
+)
+
+
+class TelemetryRing:
+    """Önceden ayrılmış, sütun bazlı telemetri halka tamponu.
+
+    Her kanal ve monotonik zaman damgası ayrı bir float64 satırda tutulur.
+    Tampon iki kez yazılır (ayna): `capacity` kadar son örnek her zaman bellekte
+    bitişik durur, bu yüzden `last()` ve `window()` kopya yapmadan görünüm
+    (view) döndürür. Görünümler canlı tampona bakar; `capacity` kadar yeni
+    örnek geldikten sonra üzerine yazılır, saklanacaksa kopyalanmalıdır.
+    """
+
+    def __init__(self, channels=TELEMETRY_CHANNELS, capacity=65536):
+        if capacity < 1:
+            raise ValueError("capacity en az 1 olmalı")
+        self.channels = tuple(channels)
+        self.capacity = capacity
+        self._index = {name: i + 1 for i, name in enumerate(self.channels)}
+
+        # Satır 0: zaman, 1..n: kanallar. Sütun sayısı 2 * capacity (ayna)
+        self._data = np.full((len(self.channels) + 1, 2 * capacity), np.nan)
+        self._head = 0  # Şimdiye kadar yazılan toplam örnek
+        self._start = 0  # clear() sonrası ilk geçerli örnek
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return min(self._head - self._start, self.capacity)
+
+    @property
+    def count(self):
+        """Başlangıçtan beri eklenen toplam örnek sayısı"""
+        return self._head
+
+    def _row(self, values):
+        """dict ya da sıralı değerleri kanal sırasına çevir (eksikler NaN)"""
+        if isinstance(values, dict):
+            row = np.full(len(self.channels), np.nan)
+            for name, value in values.items():
+                row[self._index[name] - 1] = value
+            return row
+        return np.asarray(values, dtype=np.float64)
+
+    def append(self, timestamp=None, values=None):
+        """Tek örnek ekle: O(1)"""
+        timestamp = time.monotonic() if timestamp is None else timestamp
+        row = self._row(values or {})
+        with self._lock:
+            pos = self._head % self.capacity
+            for col in (pos, pos + self.capacity):
+                self._data[0, col] = timestamp
+                self._data[1:, col] = row
+            self._head += 1
+
+    def extend(self, timestamps, block):
+        """Toplu ekleme. block: (k, kanal) dizi ya da kanal -> dizi sözlüğü"""
+        timestamps = np.asarray(timestamps, dtype=np.float64)
+        k = len(timestamps)
+        if k == 0:
+            return
+        if isinstance(block, dict):
+            data = np.full((len(self.channels), k), np.nan)
+            for name, column in block.items():
+                data[self._index[name] - 1] = column
+        else:
+            data = np.asarray(block, dtype=np.float64).T
+
+        # Kapasiteden uzun toplu veride sadece sonu kalır
+        if k > self.capacity:
+            skip = k - self.capacity
+            timestamps, data = timestamps[skip:], data[:, skip:]
+        else:
+            skip = 0
+
+        with self._lock:
+            head = self._head + skip
+            cols = (head + np.arange(len(timestamps))) % self.capacity
+            for offset in (0, self.capacity):
+                self._data[0, cols + offset] = timestamps
+                self._data[1:, cols + offset] = data
+            self._head = head + len(timestamps)
+
+    def clear(self):
+        """Depoyu boşalt; `count` artmaya devam eder (okuyucular değişimi görsün)"""
+        with self._lock:
+            self._data.fill(np.nan)
+            self._start = self._head
+
+    def _span(self, n):
+        """Son n örneğin aynalı tampondaki [başlangıç, bitiş) aralığı"""
+        n = min(n, len(self))
+        end = self._head % self.capacity + self.capacity
+        return end - n, end
+
+    def last(self, n):
+        """Son n örnek: (zamanlar, {kanal: dizi}) — kopyasız görünümler"""
+        start, end = self._span(n)
+        block = self._data[:, start:end]
+        return block[0], {name: block[i] for name, i in self._index.items()}
+
+    def column(self, name, n=None):
+        """Tek kanalın son n örneği (görünüm)"""
+        start, end = self._span(self.capacity if n is None else n)
+        return self._data[self._index[name], start:end]
+
+    def timestamps(self, n=None):
+        start, end = self._span(self.capacity if n is None else n)
+        return self._data[0, start:end]
+
+    def window(self, t0, t1=None):
+        """t0 <= zaman <= t1 aralığındaki örnekler (görünüm)"""
+        start, end = self._span(self.capacity)
+        times = self._data[0, start:end]
+        i0 = start + int(np.searchsorted(times, t0, side="left"))
+        i1 = end if t1 is None else start + int(np.searchsorted(times, t1, side="right"))
+        block = self._data[:, i0:i1]
+        return block[0], {name: block[i] for name, i in self._index.items()}
+
+    def latest(self):
+        """En son örnek: (zaman, {kanal: değer}) ya da (None, {})"""
+        if len(self) == 0:
+            return None, {}
+        with self._lock:
+            col = (self._head - 1) % self.capacity
+            values = self._data[:, col].copy()
+        return float(values[0]), {name: float(values[i]) for name, i in self._index.items()}
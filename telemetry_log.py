@@ -0,0 +1,354 @@
+import argparse
+import mmap
+import os
+import struct
+import time
+
+import numpy as np
+
+# Dosya düzeni:
+#   [0, HEADER_SIZE)  başlık: sihirli sözcük, sürüm, kanal sayısı, kayıt boyutu,
+#                     kesinleşmiş kayıt sayısı, monotonik->duvar saati farkı,
+#                     ardından '\n' ile ayrılmış UTF-8 kanal adları
+#   [HEADER_SIZE, ...) sabit boyutlu kayıtlar: zaman, kanallar..., commit
+# Her kayıt float64'tür. `commit` alanı kayıt numarası + 1'dir ve en son yazılır;
+# elektrik kesintisinden sonra yarım kalan kuyruk bu alanla ayıklanır.
+# Yan dosya (<log>.idx): her INDEX_EVERY kayıtta bir (zaman, kayıt no) çifti.
+MAGIC = b"ORTLOG\x00\x01"
+VERSION = 1
+HEADER_SIZE = 4096
+HEADER_STRUCT = struct.Struct("<8sHHIIQdd")
+INDEX_EVERY = 1024
+
+
+def _record_dtype(channels):
+    return np.dtype([("t", "<f8")] + [(name, "<f8") for name in channels]
+                    + [("commit", "<f8")])
+
+
+def _pack_header(channels, count, epoch_offset, created):
+    names = "\n".join(channels).encode("utf-8")
+    fixed = HEADER_STRUCT.pack(MAGIC, VERSION, HEADER_STRUCT.size, len(channels),
+                               8 * (len(channels) + 2), count, epoch_offset, created)
+    header = fixed + struct.pack("<I", len(names)) + names
+    if len(header) > HEADER_SIZE:
+        raise ValueError("Kanal adları başlığa sığmıyor")
+    return header.ljust(HEADER_SIZE, b"\x00")
+
+
+def _read_header(f):
+    f.seek(0)
+    raw = f.read(HEADER_SIZE)
+    if len(raw) < HEADER_STRUCT.size + 4:
+        raise ValueError("Telemetri kaydı başlığı eksik")
+    magic, version, _, n_channels, record_size, count, epoch_offset, created = \
+        HEADER_STRUCT.unpack_from(raw)
+    if magic != MAGIC:
+        raise ValueError("Telemetri kaydı değil (sihirli sözcük uyuşmuyor)")
+    if version != VERSION:
+        raise ValueError(f"Desteklenmeyen telemetri kaydı sürümü: {version}")
+    (names_len,) = struct.unpack_from("<I", raw, HEADER_STRUCT.size)
+    start = HEADER_STRUCT.size + 4
+    channels = tuple(raw[start:start + names_len].decode("utf-8").split("\n"))
+    if len(channels) != n_channels or record_size != 8 * (n_channels + 2):
+        raise ValueError("Telemetri kaydı başlığı bozuk")
+    return {
+        "channels": channels,
+        "count": count,
+        "epoch_offset": epoch_offset,
+        "created": created,
+    }
+
+
+def _valid_count(flat, start, capacity, chunk=65536):
+    """`start`tan itibaren commit alanı tutarlı olan kayıtların sayısı"""
+    n = start
+    while n < capacity:
+        end = min(n + chunk, capacity)
+        commits = flat[n:end, -1]
+        expected = np.arange(n + 1, end + 1, dtype=np.float64)
+        bad = np.flatnonzero(commits != expected)
+        if len(bad):
+            return n + int(bad[0])
+        n = end
+    return n
+
+
+class TelemetryLogWriter:
+    """Bellek eşlemeli (mmap), sadece sona eklenen telemetri kaydı yazıcısı.
+
+    Dosya `chunk_records` kayıtlık parçalar halinde büyütülür; örnek başına
+    yazma bir dizi atamasıdır. Mevcut bir dosya açılırsa yarım kalan kuyruk
+    atılır ve kayda kaldığı yerden devam edilir.
+
+    Zaman damgaları dosyanın zaman çizgisinde saklanır: ilk açılıştaki
+    monotonik saat (`epoch_offset` ile duvar saatine çevrilir). Yeniden
+    başlatmadan sonra monotonik saat sıfırdan başladığı için devam edilen
+    kayıtta gelen damgalara `shift` eklenir (iki açılışın duvar saati farkı);
+    yeni kayıtlar hiçbir zaman son kesinleşmiş kayıttan geriye düşmez.
+    """
+
+    def __init__(self, path, channels, chunk_records=65536, flush_interval=1.0):
+        self.path = path
+        self.channels = tuple(channels)
+        self._index_of = {name: i + 1 for i, name in enumerate(self.channels)}
+        self.width = len(self.channels) + 2
+        self.record_size = 8 * self.width
+        self.chunk_records = chunk_records
+        self.flush_interval = flush_interval
+        # Gelen monotonik zamana eklenen fark (devam edilen kayıtta)
+        self.shift = 0.0
+
+        if os.path.exists(path) and os.path.getsize(path) >= HEADER_SIZE:
+            self._file = open(path, "r+b")
+            header = _read_header(self._file)
+            if header["channels"] != self.channels:
+                self._file.close()
+                raise ValueError("Mevcut kayıttaki kanallar uyuşmuyor")
+            self.epoch_offset = header["epoch_offset"]
+            self.created = header["created"]
+            start = header["count"]
+        else:
+            dirname = os.path.dirname(path)
+            if dirname:
+                os.makedirs(dirname, exist_ok=True)
+            self._file = open(path, "w+b")
+            self.epoch_offset = time.time() - time.monotonic()
+            self.created = time.time()
+            self._file.write(_pack_header(self.channels, 0, self.epoch_offset,
+                                          self.created))
+            start = 0
+
+        size = os.path.getsize(path)
+        capacity = max(0, (size - HEADER_SIZE) // self.record_size)
+        self._mmap = None
+        self._flat = None
+        self._map(max(capacity, chunk_records))
+
+        # Yarım kalmış kuyruğu ayıkla, geçerli kısımdan devam et
+        self.count = _valid_count(self._flat, min(start, self.capacity), self.capacity)
+        self._flat[self.count:] = 0.0
+        if self.count:
+            # Bu açılışın monotonik saatini dosyanın zaman çizgisine taşı
+            now = time.monotonic()
+            shift = time.time() - now - self.epoch_offset
+            self.shift = max(shift, float(self._flat[self.count - 1, 0]) - now)
+        self._index_file = open(path + ".idx", "wb")
+        self._rebuild_index()
+
+        self._flushed = self.count
+        self._last_flush = time.monotonic()
+
+    def _map(self, capacity):
+        """Dosyayı `capacity` kayda büyütüp yeniden eşle"""
+        if self._mmap is not None:
+            self._mmap.flush()
+            self._flat = None
+            self._mmap.close()
+        self.capacity = capacity
+        self._file.truncate(HEADER_SIZE + capacity * self.record_size)
+        self._mmap = mmap.mmap(self._file.fileno(), 0)
+        self._flat = np.frombuffer(self._mmap, dtype="<f8", offset=HEADER_SIZE,
+                                   count=capacity * self.width).reshape(capacity, self.width)
+
+    def _rebuild_index(self):
+        entries = np.arange(0, self.count, INDEX_EVERY)
+        index = np.column_stack([self._flat[entries, 0], entries.astype(np.float64)])
+        self._index_file.write(index.astype("<f8").tobytes())
+        self._index_file.flush()
+
+    def _row(self, values):
+        if isinstance(values, dict):
+            row = np.full(len(self.channels), np.nan)
+            for name, value in values.items():
+                row[self._index_of[name] - 1] = value
+            return row
+        return values
+
+    def append(self, timestamp, values):
+        """Tek kayıt ekle (dict ya da kanal sırasında değerler)"""
+        i = self.count
+        if i >= self.capacity:
+            self._map(self.capacity + self.chunk_records)
+        record = self._flat[i]
+        timestamp = timestamp + self.shift
+        record[0] = timestamp
+        record[1:-1] = self._row(values)
+        # Kayıt tamamlandı işareti en son yazılır
+        record[-1] = i + 1
+        self.count = i + 1
+
+        if i % INDEX_EVERY == 0:
+            self._index_file.write(struct.pack("<dd", timestamp, i))
+        if time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def extend(self, timestamps, block):
+        """Toplu kayıt ekle. block: (k, kanal) dizi"""
+        timestamps = np.asarray(timestamps, dtype=np.float64)
+        k = len(timestamps)
+        if k == 0:
+            return
+        i = self.count
+        if i + k > self.capacity:
+            chunks = -(-(i + k - self.capacity) // self.chunk_records)
+            self._map(self.capacity + chunks * self.chunk_records)
+        records = self._flat[i:i + k]
+        records[:, 0] = timestamps + self.shift
+        records[:, 1:-1] = block
+        records[:, -1] = np.arange(i + 1, i + k + 1, dtype=np.float64)
+        self.count = i + k
+
+        first = -(-i // INDEX_EVERY) * INDEX_EVERY
+        entries = np.arange(first, i + k, INDEX_EVERY)
+        if len(entries):
+            index = np.column_stack([self._flat[entries, 0], entries.astype(np.float64)])
+            self._index_file.write(index.astype("<f8").tobytes())
+        if time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        """Yeni kayıtları diske yaz, sonra başlıktaki sayacı güncelle"""
+        if self.count > self._flushed:
+            start = HEADER_SIZE + self._flushed * self.record_size
+            start -= start % mmap.ALLOCATIONGRANULARITY
+            end = HEADER_SIZE + self.count * self.record_size
+            self._mmap.flush(start, end - start)
+        self._mmap[:HEADER_SIZE] = _pack_header(self.channels, self.count,
+                                                self.epoch_offset, self.created)
+        self._mmap.flush(0, HEADER_SIZE)
+        self._index_file.flush()
+        self._flushed = self.count
+        self._last_flush = time.monotonic()
+
+    def close(self):
+        """Diske yaz ve kullanılmayan ön-ayrılmış alanı kırp"""
+        if self._mmap is None:
+            return
+        self.flush()
+        self._flat = None
+        self._mmap.close()
+        self._mmap = None
+        self._file.truncate(HEADER_SIZE + self.count * self.record_size)
+        self._file.close()
+        self._index_file.close()
+
+
+class TelemetryLogReader:
+    """Telemetri kaydını numpy.memmap ile okur; dosyanın tamamı yüklenmez.
+
+    Aralık sorguları önce zaman dizinine, sonra ilgili bloktaki zaman
+    damgalarına ikili arama yapar ve memmap dilimi (kopyasız) döndürür.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            header = _read_header(f)
+        self.channels = header["channels"]
+        self.epoch_offset = header["epoch_offset"]
+        self.created = header["created"]
+        self.dtype = _record_dtype(self.channels)
+
+        capacity = max(0, (os.path.getsize(path) - HEADER_SIZE) // self.dtype.itemsize)
+        if capacity == 0:
+            self.records = np.zeros(0, dtype=self.dtype)
+        else:
+            flat = np.memmap(path, dtype="<f8", mode="r", offset=HEADER_SIZE,
+                             shape=(capacity, len(self.channels) + 2))
+            count = _valid_count(flat, min(header["count"], capacity), capacity)
+            del flat
+            self.records = (np.memmap(path, dtype=self.dtype, mode="r",
+                                      offset=HEADER_SIZE, shape=(count,))
+                            if count else np.zeros(0, dtype=self.dtype))
+        self.index = self._load_index()
+
+    def _load_index(self):
+        """Yan dizin dosyasını oku; eksik/bozuksa veriden tamamla"""
+        expected = -(-len(self.records) // INDEX_EVERY)
+        index = np.zeros((0, 2))
+        try:
+            raw = np.fromfile(self.path + ".idx", dtype="<f8")
+            index = raw[:len(raw) // 2 * 2].reshape(-1, 2)[:expected]
+            valid = index[:, 1] == np.arange(len(index)) * INDEX_EVERY
+            index = index[:int(np.argmin(valid))] if not valid.all() else index
+        except OSError:
+            pass
+        if len(index) < expected:
+            entries = np.arange(len(index) * INDEX_EVERY, len(self.records), INDEX_EVERY)
+            rebuilt = np.column_stack([self.records["t"][entries], entries])
+            index = np.vstack([index, rebuilt])
+        return index[:, 0].copy()
+
+    def __len__(self):
+        return len(self.records)
+
+    def time_range(self):
+        if not len(self.records):
+            return None, None
+        return float(self.records["t"][0]), float(self.records["t"][-1])
+
+    def find(self, t, side="left"):
+        """t zamanına karşılık gelen kayıt numarası (ikili arama)"""
+        block = max(0, int(np.searchsorted(self.index, t, side="right")) - 1)
+        start = block * INDEX_EVERY
+        end = min(len(self.records), start + 2 * INDEX_EVERY)
+        # Aynı zaman damgası blok sınırını aşabilir; o yönde bir blok fazla bak
+        if side == "right":
+            end = min(len(self.records), end + INDEX_EVERY)
+        else:
+            start = max(0, start - INDEX_EVERY)
+        times = self.records["t"][start:end]
+        return start + int(np.searchsorted(times, t, side=side))
+
+    def range(self, t0, t1):
+        """t0 <= zaman <= t1 kayıtları (memmap dilimi)"""
+        return self.records[self.find(t0, "left"):self.find(t1, "right")]
+
+    def column(self, name, t0=None, t1=None):
+        records = self.records if t0 is None else self.range(t0, t1)
+        return records[name]
+
+    def wall_time(self, t):
+        """Monotonik zaman damgasını UNIX zamanına çevir"""
+        return t + self.epoch_offset
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Telemetri kaydı araçları")
+    sub = parser.add_subparsers(dest="command", required=True)
+    info = sub.add_parser("info", help="Kayıt özetini göster")
+    info.add_argument("path")
+    export = sub.add_parser("export", help="Zaman aralığını CSV olarak yaz")
+    export.add_argument("path")
+    export.add_argument("output")
+    export.add_argument("--start", type=float, default=None,
+                        help="Kayıt başından itibaren saniye")
+    export.add_argument("--end", type=float, default=None)
+    args = parser.parse_args()
+
+    reader = TelemetryLogReader(args.path)
+    t_first, t_last = reader.time_range()
+    if args.command == "info":
+        print(f"Kanallar : {', '.join(reader.channels)}")
+        print(f"Kayıt    : {len(reader)}")
+        if t_first is not None:
+            print(f"Süre     : {t_last - t_first:.1f} s")
+            print(f"Başlangıç: {time.ctime(reader.wall_time(t_first))}")
+        return
+
+    if t_first is None:
+        print("Kayıt boş")
+        return
+    t0 = t_first + (args.start or 0.0)
+    t1 = t_last if args.end is None else t_first + args.end
+    records = reader.range(t0, t1)
+    header = ",".join(("t",) + reader.channels)
+    columns = [records["t"] - t_first] + [records[name] for name in reader.channels]
+    np.savetxt(args.output, np.column_stack(columns), delimiter=",", header=header,
+               comments="", fmt="%.6f")
+    print(f"{len(records)} kayıt yazıldı: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,356 @@
+import argparse
+import io
+import math
+import os
+import sqlite3
+import threading
+import time
+import urllib.request
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEFAULT_TILE_SERVER = "https://a.tile.openstreetmap.org/{z}/{x}/{y}.png"
+USER_AGENT = "OrucReisIU/1.0 (+tile-cache)"
+
+
+def tile_xy(lat, lon, zoom):
+    """Enlem/boylamın verilen yakınlaştırmadaki karo numarası (x, y)"""
+    lat = max(min(lat, 85.05112878), -85.05112878)
+    n = 2 ** zoom
+    x = int((lon + 180.0) / 360.0 * n)
+    lat_rad = math.radians(lat)
+    y = int((1.0 - math.log(math.tan(lat_rad) + 1.0 / math.cos(lat_rad)) / math.pi) / 2.0 * n)
+    return min(max(x, 0), n - 1), min(max(y, 0), n - 1)
+
+
+def tiles_for_bbox(lat_min, lon_min, lat_max, lon_max, zoom_min, zoom_max):
+    """Sınır kutusunu kapsayan tüm karolar (z, x, y) — düşük yakınlaştırmadan başlayarak"""
+    for zoom in range(zoom_min, zoom_max + 1):
+        x0, y0 = tile_xy(lat_max, lon_min, zoom)
+        x1, y1 = tile_xy(lat_min, lon_max, zoom)
+        for x in range(min(x0, x1), max(x0, x1) + 1):
+            for y in range(min(y0, y1), max(y0, y1) + 1):
+                yield zoom, x, y
+
+
+class MBTilesStore:
+    """Karoları MBTiles (SQLite) dosyasında tutan disk katmanı.
+
+    MBTiles şemasına uyar (`tile_row` TMS düzeninde, y ekseni ters), bu
+    yüzden dosya başka harita araçlarıyla da açılabilir. Bağlantı birden çok
+    iş parçacığından bir kilitle paylaşılır.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        dirname = os.path.dirname(path)
+        if dirname:
+            os.makedirs(dirname, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        with self._lock:
+            self._db.executescript("""
+                PRAGMA journal_mode=WAL;
+                CREATE TABLE IF NOT EXISTS metadata (name TEXT PRIMARY KEY, value TEXT);
+                CREATE TABLE IF NOT EXISTS tiles (
+                    zoom_level INTEGER, tile_column INTEGER, tile_row INTEGER,
+                    tile_data BLOB);
+                CREATE UNIQUE INDEX IF NOT EXISTS tile_index
+                    ON tiles (zoom_level, tile_column, tile_row);
+            """)
+            self._db.execute("INSERT OR IGNORE INTO metadata VALUES ('name', 'oruc-reis-tiles')")
+            self._db.execute("INSERT OR IGNORE INTO metadata VALUES ('format', 'png')")
+            self._db.commit()
+
+    @staticmethod
+    def _tms_row(zoom, y):
+        return (1 << zoom) - 1 - y
+
+    def get(self, zoom, x, y):
+        with self._lock:
+            if self._db is None:
+                return None
+            row = self._db.execute(
+                "SELECT tile_data FROM tiles WHERE zoom_level=? AND tile_column=? AND tile_row=?",
+                (zoom, x, self._tms_row(zoom, y))).fetchone()
+        return row[0] if row else None
+
+    def has(self, zoom, x, y):
+        with self._lock:
+            if self._db is None:
+                return False
+            row = self._db.execute(
+                "SELECT 1 FROM tiles WHERE zoom_level=? AND tile_column=? AND tile_row=?",
+                (zoom, x, self._tms_row(zoom, y))).fetchone()
+        return row is not None
+
+    def put(self, zoom, x, y, data):
+        with self._lock:
+            if self._db is None:
+                return
+            self._db.execute("INSERT OR REPLACE INTO tiles VALUES (?, ?, ?, ?)",
+                             (zoom, x, self._tms_row(zoom, y), sqlite3.Binary(data)))
+            self._db.commit()
+
+    def set_metadata(self, name, value):
+        with self._lock:
+            self._db.execute("INSERT OR REPLACE INTO metadata VALUES (?, ?)", (name, str(value)))
+            self._db.commit()
+
+    def count(self):
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM tiles").fetchone()[0]
+
+    def zoom_levels(self):
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT zoom_level, COUNT(*) FROM tiles GROUP BY zoom_level").fetchall()
+        return dict(rows)
+
+    def close(self):
+        """Bağlantıyı kapat; sonrasında gelen istekler boş döner"""
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+
+class TileLRU:
+    """Çözülmüş karolar için en-az-son-kullanılan (LRU) bellek önbelleği"""
+
+    def __init__(self, capacity=2048):
+        self.capacity = capacity
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return item
+
+    def put(self, key, value):
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.capacity:
+                self._items.popitem(last=False)
+
+    def __len__(self):
+        return len(self._items)
+
+
+class TileProvider:
+    """Karo sağlayıcı: bellek LRU -> MBTiles disk -> (çevrimiçiyse) sunucu.
+
+    Sunucudan inen karolar diske yazılır; `offline=True` iken ağa hiç
+    çıkılmaz. `decode` ham PNG baytını haritanın istediği nesneye çevirir
+    (varsayılan: ImageTk.PhotoImage).
+    """
+
+    def __init__(self, store, url_template=DEFAULT_TILE_SERVER, memory_tiles=2048,
+                 offline=False, timeout=5.0, decode=None):
+        self.store = store
+        self.url_template = url_template
+        self.offline = offline
+        self.timeout = timeout
+        self.lru = TileLRU(memory_tiles)
+        self.decode = decode or self._decode_photo
+        self.downloaded = 0
+        self.failed = 0
+
+    @staticmethod
+    def _decode_photo(data):
+        from PIL import Image, ImageTk
+        return ImageTk.PhotoImage(Image.open(io.BytesIO(data)))
+
+    def tile_url(self, zoom, x, y):
+        return (self.url_template.replace("{z}", str(zoom))
+                .replace("{x}", str(x)).replace("{y}", str(y)))
+
+    def fetch(self, zoom, x, y):
+        """Karoyu sunucudan indir (bayt)"""
+        request = urllib.request.Request(self.tile_url(zoom, x, y),
+                                         headers={"User-Agent": USER_AGENT})
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            return response.read()
+
+    def get_bytes(self, zoom, x, y):
+        """Diskten, yoksa (çevrimiçiyse) sunucudan ham karo"""
+        data = self.store.get(zoom, x, y)
+        if data is not None or self.offline or not self.url_template:
+            return data
+        try:
+            data = self.fetch(zoom, x, y)
+        except Exception:
+            self.failed += 1
+            return None
+        self.store.put(zoom, x, y, data)
+        self.downloaded += 1
+        return data
+
+    def get_image(self, zoom, x, y):
+        """Çözülmüş karo; bellekte varsa doğrudan döner"""
+        key = (zoom, x, y)
+        image = self.lru.get(key)
+        if image is not None:
+            return image
+        data = self.get_bytes(zoom, x, y)
+        if data is None:
+            return None
+        try:
+            image = self.decode(data)
+        except Exception:
+            return None
+        self.lru.put(key, image)
+        return image
+
+    def prefetch(self, bbox, zoom_min, zoom_max, workers=4, progress=None):
+        """Görev alanının karo piramidini önceden diske indir.
+
+        bbox: (lat_min, lon_min, lat_max, lon_max). Diskte olanlar atlanır.
+        Dönüş: {"downloaded", "skipped", "failed"} sayıları.
+        """
+        tiles = list(tiles_for_bbox(*bbox, zoom_min, zoom_max))
+        counts = {"downloaded": 0, "skipped": 0, "failed": 0}
+        lock = threading.Lock()
+
+        def job(tile):
+            if self.store.has(*tile):
+                result = "skipped"
+            else:
+                try:
+                    self.store.put(*tile, self.fetch(*tile))
+                    result = "downloaded"
+                except Exception:
+                    result = "failed"
+            with lock:
+                counts[result] += 1
+                done = sum(counts.values())
+            if progress:
+                progress(done, len(tiles), tile, result)
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="tile-prefetch") as pool:
+            list(pool.map(job, tiles))
+        self.store.set_metadata("bounds", ",".join(str(v) for v in
+                                                   (bbox[1], bbox[0], bbox[3], bbox[2])))
+        return counts
+
+    def stats(self):
+        return {
+            "memory_tiles": len(self.lru),
+            "hits": self.lru.hits,
+            "misses": self.lru.misses,
+            "downloaded": self.downloaded,
+            "failed": self.failed,
+        }
+
+
+def create_map_view(parent, provider, **kwargs):
+    """Karoları `provider` üzerinden yükleyen TkinterMapView oluştur"""
+    import tkintermapview  # type: ignore
+
+    class CachedMapView(tkintermapview.TkinterMapView):
+        # Kütüphanenin kendi sınırsız sözlüğü yerine LRU kullanılır
+        def get_tile_image_from_cache(self, zoom, x, y):
+            image = provider.lru.get((zoom, x, y))
+            return False if image is None else image
+
+        def request_image(self, zoom, x, y, db_cursor=None):
+            if not self.running:
+                return self.empty_tile_image
+            image = provider.get_image(zoom, x, y)
+            return self.empty_tile_image if image is None else image
+
+    return CachedMapView(parent, **kwargs)
+
+
+def serve(store, host="127.0.0.1", port=8080):
+    """MBTiles dosyasını /{z}/{x}/{y}.png olarak sunan yerel karo sunucusu.
+
+    Çevrimdışı testler için gerçek sunucunun yerine geçer.
+    """
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            try:
+                zoom, x, y = self.path.strip("/").rsplit(".", 1)[0].split("/")[-3:]
+                data = store.get(int(zoom), int(x), int(y))
+            except ValueError:
+                data = None
+            if data is None:
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "image/png")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    print(f"Karo sunucusu: http://{host}:{server.server_address[1]}/{{z}}/{{x}}/{{y}}.png")
+    server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Çevrimdışı harita karo önbelleği")
+    parser.add_argument("--db", default="tiles/tiles.mbtiles", help="MBTiles dosyası")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    prefetch = sub.add_parser("prefetch", help="Görev alanının karolarını indir")
+    prefetch.add_argument("--bbox", type=float, nargs=4, required=True,
+                          metavar=("LAT_MIN", "LON_MIN", "LAT_MAX", "LON_MAX"))
+    prefetch.add_argument("--zoom", type=int, nargs=2, default=(10, 17),
+                          metavar=("MIN", "MAX"))
+    prefetch.add_argument("--url", default=DEFAULT_TILE_SERVER,
+                          help="Karo sunucusu şablonu ({z}/{x}/{y})")
+    prefetch.add_argument("--workers", type=int, default=4)
+    prefetch.add_argument("--max-tiles", type=int, default=20000,
+                          help="Bu sayıdan fazla karo gerekiyorsa indirme yapılmaz")
+
+    sub.add_parser("info", help="Önbellekteki karo sayıları")
+
+    serve_cmd = sub.add_parser("serve", help="Önbelleği yerel karo sunucusu olarak yayınla")
+    serve_cmd.add_argument("--host", default="127.0.0.1")
+    serve_cmd.add_argument("--port", type=int, default=8080)
+
+    args = parser.parse_args()
+    store = MBTilesStore(args.db)
+
+    if args.command == "info":
+        print(f"Toplam karo: {store.count()}")
+        for zoom, count in sorted(store.zoom_levels().items()):
+            print(f"  z{zoom}: {count}")
+    elif args.command == "serve":
+        serve(store, args.host, args.port)
+    else:
+        total = sum(1 for _ in tiles_for_bbox(*args.bbox, *args.zoom))
+        if total > args.max_tiles:
+            parser.error(f"{total} karo gerekiyor (sınır {args.max_tiles}); "
+                         "alanı/yakınlaştırmayı küçültün ya da --max-tiles verin")
+        print(f"{total} karo indirilecek: {args.url}")
+        provider = TileProvider(store, args.url)
+        started = time.monotonic()
+
+        def progress(done, count, tile, result):
+            if done % 100 == 0 or done == count:
+                print(f"  {done}/{count}")
+
+        counts = provider.prefetch(args.bbox, *args.zoom, workers=args.workers,
+                                   progress=progress)
+        print(f"Bitti ({time.monotonic() - started:.1f} s): {counts}")
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+import math
+import threading
+
+
+class UiUpdateBus:
+    """İş parçacıkları arasından arayüze değer taşıyan birleştirici güncelleme yolu.
+
+    Üreticiler herhangi bir iş parçacığından `post(anahtar, değer)` çağırır;
+    her anahtar için sadece son değer tutulur. Ana döngü saniyede `fps` kez
+    `apply()` ile bekleyenleri uygular ve biçimlenmiş metni değişmeyen
+    widget'lara dokunmaz. Böylece veri ne kadar hızlı gelirse gelsin kare
+    başına iş, anahtar sayısıyla sınırlı kalır ve Tk sadece ana iş
+    parçacığından çağrılır.
+    """
+
+    def __init__(self, root, fps=30):
+        self.root = root
+        self.fps = fps
+        self._lock = threading.Lock()
+        self._pending = {}
+        self._handlers = {}
+        self._last = {}
+        self._after_id = None
+
+        # Ölçümler
+        self.posted = 0
+        self.applied = 0
+        self.skipped = 0
+
+    # --- Bağlama ----------------------------------------------------------
+
+    def bind_var(self, key, var, fmt="{}"):
+        """Anahtarı bir tk değişkenine bağla; fmt biçim dizesi ya da fonksiyon"""
+        format_value = fmt.format if isinstance(fmt, str) else fmt
+
+        def apply(value):
+            var.set(value)
+
+        self._handlers[key] = (format_value, apply)
+
+    def bind_widget(self, key, widget, fmt="{}", option="text"):
+        """Anahtarı bir widget seçeneğine (varsayılan: text) bağla"""
+        format_value = fmt.format if isinstance(fmt, str) else fmt
+
+        def apply(value):
+            widget.config(**{option: value})
+
+        self._handlers[key] = (format_value, apply)
+
+    def bind(self, key, callback):
+        """Değer değiştiğinde callback(değer) çağır (ana iş parçacığında)"""
+        self._handlers[key] = (None, callback)
+
+    # --- Üretici tarafı (her iş parçacığı) --------------------------------
+
+    def post(self, key, value):
+        with self._lock:
+            self._pending[key] = value
+            self.posted += 1
+
+    def post_many(self, values):
+        with self._lock:
+            self._pending.update(values)
+            self.posted += len(values)
+
+    # --- Ana döngü tarafı -------------------------------------------------
+
+    def start(self):
+        self.apply()
+
+    def stop(self):
+        if self._after_id:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+
+    def apply(self):
+        """Bekleyen son değerleri uygula ve kendini yeniden zamanla"""
+        try:
+            self.flush()
+        finally:
+            self._after_id = self.root.after(int(1000 / self.fps), self.apply)
+
+    def flush(self):
+        """Bekleyen değerleri hemen uygula (ana iş parçacığından)"""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+
+        for key, value in pending.items():
+            handler = self._handlers.get(key)
+            if handler is None:
+                continue
+            format_value, apply = handler
+            shown = self._format(format_value, value) if format_value else value
+            if key in self._last and self._last[key] == shown:
+                self.skipped += 1
+                continue
+            self._last[key] = shown
+            try:
+                apply(shown)
+                self.applied += 1
+            except Exception as e:
+                print(f"Arayüz güncelleme hatası ({key}): {e}")
+
+    @staticmethod
+    def _format(format_value, value):
+        if isinstance(value, float) and math.isnan(value):
+            return "—"
+        return format_value(value)
+
+    def stats(self):
+        return {
+            "posted": self.posted,
+            "applied": self.applied,
+            "skipped": self.skipped,
+            "keys": len(self._handlers),
+        }
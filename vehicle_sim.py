@@ -0,0 +1,340 @@
+import asyncio
+import math
+import time
+
+import numpy as np
+
+from sensor_sources import SensorSource
+from state_estimator import DEFAULT_ORIGIN, EARTH_RADIUS, GRAVITY
+from telemetry import TELEMETRY_CHANNELS
+
+# Varsayılan örnek hızı (Hz); birkaç kHz'e kadar çıkılabilir
+SIM_RATE = 1000.0
+
+# Gürültü bu uzunlukta bloklarla (tohum, blok no) üretilir: çıktı, kaynağın
+# kaç örneği hangi parçalarla istediğinden bağımsız olarak tekrarlanabilir
+SIM_BLOCK_SECONDS = 0.05
+
+# Konum (akustik konumlama) güncelleme hızı
+SIM_LOCATION_HZ = 1.0
+
+# Kanal başına gürültü (1 sigma; konum metre cinsinden)
+SIM_NOISE = {
+    "basınç": 0.5, "derinlik": 0.02, "sıcaklık": 0.05, "nem": 0.5,
+    "ivme_x": 0.005, "ivme_y": 0.005, "ivme_z": 0.005,
+    "manyetik": 0.2, "gyro": 0.1, "pusula": 1.0,
+    "lat": 2.0, "lon": 2.0, "batarya": 0.05,
+}
+
+SIM_CAMERA_SIZE = (640, 480)
+SIM_CAMERA_FPS = 30.0
+
+
+class Scenario:
+    """Görev betiği: derinlik/yön/hız yol noktaları ve olay pencereleri.
+
+    Yol noktaları (zaman s, değer) listesidir, aralarında yumuşak (kosinüs)
+    geçilir; yön sürekli derecedir (360'ı aşabilir). Olaylar:
+    `dropouts` (başlangıç, bitiş, kanallar) o kanalları susturur,
+    `bursts` (başlangıç, bitiş, kat) gürültüyü büyütür, `link_losses`
+    (başlangıç, bitiş) sırasında hiç örnek ve kare gelmez. Süre dolunca
+    betik baştan tekrarlar (konum ve batarya birikmeye devam eder).
+    """
+
+    def __init__(self, name, duration, depth, heading, speed,
+                 dropouts=(), bursts=(), link_losses=()):
+        self.name = name
+        self.duration = duration
+        self.depth = depth
+        self.heading = heading
+        self.speed = speed
+        self.dropouts = tuple(dropouts)
+        self.bursts = tuple(bursts)
+        self.link_losses = tuple(link_losses)
+
+    def with_events(self, name, dropouts=(), bursts=(), link_losses=()):
+        return Scenario(name, self.duration, self.depth, self.heading, self.speed,
+                        self.dropouts + tuple(dropouts), self.bursts + tuple(bursts),
+                        self.link_losses + tuple(link_losses))
+
+    def linked(self, t):
+        """t (s, dizi) anında bağlantı var mı"""
+        phase = np.asarray(t) % self.duration
+        lost = np.zeros(phase.shape, dtype=bool)
+        for start, end in self.link_losses:
+            lost |= (phase >= start) & (phase < end)
+        return ~lost
+
+
+def _profile(points, t):
+    """Yol noktaları arasında kosinüs geçişli değer ve türevi"""
+    times = np.array([p[0] for p in points], dtype=float)
+    values = np.array([p[1] for p in points], dtype=float)
+    i = np.clip(np.searchsorted(times, t, side="right") - 1, 0, len(times) - 2)
+    t0, t1 = times[i], times[i + 1]
+    v0, v1 = values[i], values[i + 1]
+    span = t1 - t0
+    u = np.clip((t - t0) / span, 0.0, 1.0)
+    value = v0 + (v1 - v0) * (1 - np.cos(np.pi * u)) / 2
+    rate = (v1 - v0) * np.pi / 2 * np.sin(np.pi * u) / span
+    return value, rate
+
+
+_DIVE = Scenario(
+    "dalış", 300.0,
+    depth=[(0, 0.5), (40, 0.5), (100, 20.0), (160, 20.0), (200, 10.0), (240, 10.0),
+           (290, 0.5), (300, 0.5)],
+    # Tırmık deseni: 60 s düz, 15 s'de 180° dönüş
+    heading=[(0, 30), (60, 30), (75, 210), (135, 210), (150, 390), (210, 390),
+             (225, 570), (300, 570)],
+    speed=[(0, 0.0), (10, 1.0), (280, 1.0), (300, 0.0)])
+
+SCENARIOS = {
+    "dalış": _DIVE,
+    "kesinti": _DIVE.with_events("kesinti", dropouts=[
+        (50, 60, ("derinlik", "basınç")), (120, 125, ("pusula", "manyetik")),
+        (150, 190, ("lat", "lon")), (220, 230, ("ivme_x", "ivme_y", "ivme_z", "gyro"))]),
+    "gürültü": _DIVE.with_events("gürültü", bursts=[(30, 35, 10.0), (130, 140, 5.0),
+                                                    (250, 252, 20.0)]),
+    "bağlantı": _DIVE.with_events("bağlantı", link_losses=[(60, 62), (140, 150), (200, 200.5)]),
+}
+SCENARIOS["karma"] = SCENARIOS["kesinti"].with_events(
+    "karma", bursts=SCENARIOS["gürültü"].bursts, link_losses=SCENARIOS["bağlantı"].link_losses)
+
+
+class VehicleSimulator:
+    """Tohumlu, vektörel araç benzetimi: tüm kanallar bloklar halinde.
+
+    `take(n)` sıradaki n örneği (zamanlar, (k, kanal) değerler) olarak
+    verir; bağlantı kopukken üretilen örnekler atılır, susturulan ve o an
+    gelmeyen (konum) kanallar NaN'dır. Aynı tohum ve senaryo her zaman
+    aynı diziyi üretir.
+    """
+
+    def __init__(self, scenario="dalış", rate_hz=SIM_RATE, seed=0,
+                 location_hz=SIM_LOCATION_HZ, origin=DEFAULT_ORIGIN):
+        self.scenario = SCENARIOS[scenario] if isinstance(scenario, str) else scenario
+        self.rate_hz = float(rate_hz)
+        self.seed = seed
+        self.origin = origin
+        self.channels = TELEMETRY_CHANNELS
+        self.block_size = max(1, int(round(self.rate_hz * SIM_BLOCK_SECONDS)))
+        self.location_every = max(1, int(round(self.rate_hz / location_hz)))
+
+        index = {name: i for i, name in enumerate(self.channels)}
+        self._noise = np.array([SIM_NOISE.get(name, 0.0) for name in self.channels])
+        self._lat, self._lon = index["lat"], index["lon"]
+        self._dropouts = [(start, end, [index[name] for name in names])
+                          for start, end, names in self.scenario.dropouts]
+        self._index = index
+
+        self.produced = 0         # üretilen (kayıplar dahil) örnek sayısı
+        self._block = 0
+        self._north = self._east = 0.0
+        self._times = np.empty(0)
+        self._values = np.empty((0, len(self.channels)))
+
+    def take(self, count):
+        """Sıradaki `count` örnek: (zamanlar s, değerler); kayıp satırlar atılır"""
+        if len(self._times) < count:
+            blocks = [(self._times, self._values)]
+            have = len(self._times)
+            while have < count:
+                blocks.append(self._generate(self._block))
+                self._block += 1
+                have += self.block_size
+            self._times = np.concatenate([times for times, _ in blocks])
+            self._values = np.concatenate([values for _, values in blocks])
+        times, values = self._times[:count], self._values[:count]
+        self._times, self._values = self._times[count:], self._values[count:]
+        self.produced += count
+        keep = self.scenario.linked(times)
+        if keep.all():
+            return times, values
+        return times[keep], values[keep]
+
+    def _generate(self, block):
+        n = self.block_size
+        i = np.arange(block * n, (block + 1) * n)
+        t = i / self.rate_hz
+        phase = t % self.scenario.duration
+
+        depth, vertical = _profile(self.scenario.depth, phase)
+        heading, yaw_rate = _profile(self.scenario.heading, phase)
+        speed, forward = _profile(self.scenario.speed, phase)
+        h = np.radians(heading)
+
+        # Konum: hız x yön tümlevi, bloklar arasında taşınır
+        step = speed / self.rate_hz
+        north = self._north + np.cumsum(step * np.cos(h))
+        east = self._east + np.cumsum(step * np.sin(h))
+        self._north, self._east = north[-1], east[-1]
+
+        roll = np.radians(np.clip(0.5 * yaw_rate, -25, 25) + 2.0 * np.sin(0.7 * t))
+        pitch = np.radians(np.clip(-15.0 * vertical / 0.6, -20, 20) + 1.5 * np.sin(0.5 * t + 1.3))
+
+        values = np.empty((n, len(self.channels)))
+        column = self._index
+        values[:, column["basınç"]] = 1013.25 + depth * 100.5
+        values[:, column["derinlik"]] = depth
+        values[:, column["sıcaklık"]] = 18.0 - 0.1 * depth
+        values[:, column["nem"]] = 40.0 + 2.0 * np.sin(t / 60.0)
+        values[:, column["ivme_x"]] = -np.sin(pitch) + forward / GRAVITY
+        values[:, column["ivme_y"]] = (np.sin(roll) * np.cos(pitch)
+                                       + speed * np.radians(yaw_rate) / GRAVITY)
+        values[:, column["ivme_z"]] = np.cos(roll) * np.cos(pitch)
+        values[:, column["manyetik"]] = 46.0 + 2.0 * np.cos(h)
+        values[:, column["gyro"]] = yaw_rate
+        values[:, column["pusula"]] = heading
+        values[:, column["batarya"]] = np.maximum(10.0, 100.0 - t / 36.0)
+        values[:, self._lat] = north
+        values[:, self._lon] = east
+
+        rng = np.random.default_rng((self.seed, block))
+        scale = np.ones(n)
+        for start, end, factor in self.scenario.bursts:
+            scale[(phase >= start) & (phase < end)] = factor
+        values += rng.standard_normal(values.shape) * self._noise * scale[:, None]
+
+        lat0, lon0 = self.origin
+        values[:, self._lat] = lat0 + np.degrees(values[:, self._lat] / EARTH_RADIUS)
+        values[:, self._lon] = lon0 + np.degrees(
+            values[:, self._lon] / (EARTH_RADIUS * math.cos(math.radians(lat0))))
+        values[:, column["pusula"]] %= 360
+
+        values[i % self.location_every != 0, self._lat] = np.nan
+        values[i % self.location_every != 0, self._lon] = np.nan
+        for start, end, columns in self._dropouts:
+            rows = (phase >= start) & (phase < end)
+            if rows.any():
+                values[np.ix_(rows, columns)] = np.nan
+        return t, values
+
+
+class VehicleSimSource(SensorSource):
+    """VehicleSimulator'ı canlı kaynak gibi yayınlar.
+
+    Her `tick` saniyede o ana kadar vadesi gelen örnekler tek toplu örnek
+    olarak (`emit_block` varsa) kendi zaman damgalarıyla verilir; ortalama
+    hız tam `rate_hz` olur.
+    """
+
+    block_emitter = True
+
+    def __init__(self, scenario="dalış", rate_hz=SIM_RATE, seed=0, tick=0.005):
+        self.simulator = VehicleSimulator(scenario, rate_hz, seed)
+        self.tick = tick
+        self.name = f"araç-sim:{self.simulator.scenario.name}"
+
+    async def run(self, emit, emit_block=None):
+        sim = self.simulator
+        channels = sim.channels
+        start = time.monotonic() - sim.produced / sim.rate_hz
+        while True:
+            due = int((time.monotonic() - start) * sim.rate_hz)
+            if due > sim.produced:
+                times, values = sim.take(due - sim.produced)
+                times = times + start
+                if emit_block is not None:
+                    emit_block(channels, times, values)
+                else:
+                    for t, row in zip(times.tolist(), values.tolist()):
+                        emit({name: value for name, value in zip(channels, row)
+                              if value == value}, t)
+            await asyncio.sleep(self.tick)
+
+
+class SimulatedCamera:
+    """`cv2.VideoCapture` yerine: hareketli hedefli, tohumlu sualtı sahnesi.
+
+    Arka plan (derinlikle koyulaşan renk + sabit doku) bir kez üretilir,
+    her karede hedefler (turuncu/sarı daire ve kutular) Lissajous
+    yörüngelerinde çizilir. Kare k'nin içeriği yalnız k'ye ve tohuma
+    bağlıdır; `targets_at(k)` gerçek sınırlayıcı kutuları verir (tespit
+    doğruluğunu ölçmek için). Senaryodaki bağlantı kopukluklarında kare
+    gelmez. `realtime=False` ise beklemeden okunur.
+    """
+
+    COLORS = ((0, 140, 255), (0, 220, 255), (40, 40, 230), (200, 200, 255))
+
+    def __init__(self, width=SIM_CAMERA_SIZE[0], height=SIM_CAMERA_SIZE[1],
+                 fps=SIM_CAMERA_FPS, seed=0, targets=4, scenario=None, realtime=True):
+        self.width = width
+        self.height = height
+        self.fps = fps
+        self.realtime = realtime
+        self.scenario = SCENARIOS[scenario] if isinstance(scenario, str) else scenario
+        rng = np.random.default_rng(seed)
+
+        y = np.linspace(0.0, 1.0, height)[:, None, None]
+        top, bottom = np.array([140, 110, 30.0]), np.array([60, 35, 10.0])   # BGR
+        texture = rng.normal(0.0, 6.0, (height, width, 1))
+        self._background = np.clip(top + (bottom - top) * y + texture, 0, 255).astype(np.uint8)
+
+        self._paths = [(rng.uniform(0.1, 0.6), rng.uniform(0.1, 0.6),
+                        rng.uniform(0, 2 * math.pi), rng.uniform(0, 2 * math.pi),
+                        int(rng.integers(min(width, height) // 30, min(width, height) // 10)),
+                        k % 2 == 0, self.COLORS[k % len(self.COLORS)])
+                       for k in range(targets)]
+        self._index = 0
+        self._start = None
+        self._open = True
+
+    def targets_at(self, k):
+        """k. karedeki hedefler: (x, y, g, y) kutuları"""
+        t = k / self.fps
+        boxes = []
+        for a, b, p, q, radius, _, _ in self._paths:
+            x = self.width * (0.5 + 0.4 * math.sin(a * t + p))
+            y = self.height * (0.5 + 0.35 * math.sin(b * t + q))
+            boxes.append((int(x) - radius, int(y) - radius, 2 * radius, 2 * radius))
+        return boxes
+
+    def isOpened(self):
+        return self._open
+
+    def read(self, image=None):
+        import cv2
+
+        k = self._index
+        if self.scenario is not None:
+            while not self.scenario.linked(k / self.fps):
+                k += 1
+        self._index = k + 1
+        if self.realtime:
+            now = time.perf_counter()
+            if self._start is None:
+                self._start = now - k / self.fps
+            wait = self._start + k / self.fps - now
+            if wait > 0:
+                time.sleep(wait)
+
+        if image is None or image.shape != self._background.shape:
+            image = np.empty_like(self._background)
+        np.copyto(image, self._background)
+        for (x, y, w, h), path in zip(self.targets_at(k), self._paths):
+            color = path[6]
+            if path[5]:
+                cv2.circle(image, (x + w // 2, y + h // 2), w // 2, color, -1)
+            else:
+                cv2.rectangle(image, (x, y), (x + w, y + h), color, -1)
+        return True, image
+
+    def get(self, prop):
+        import cv2
+
+        return {cv2.CAP_PROP_FRAME_WIDTH: self.width,
+                cv2.CAP_PROP_FRAME_HEIGHT: self.height,
+                cv2.CAP_PROP_FPS: self.fps}.get(prop, 0.0)
+
+    def set(self, prop, value):
+        return False
+
+    def release(self):
+        self._open = False
+
+
+def camera_factory(scenario=None, seed=0, width=SIM_CAMERA_SIZE[0],
+                   height=SIM_CAMERA_SIZE[1], fps=SIM_CAMERA_FPS):
+    """`SystemControlInterface(camera_factory=...)` için: kaynak numarasını yok sayar"""
+    return lambda source: SimulatedCamera(width, height, fps, seed=seed, scenario=scenario)
@@ -0,0 +1,352 @@
+import multiprocessing
+import queue
+import time
+from collections import deque
+
+import cv2
+import numpy as np
+
+from frame_transport import SharedFrameRing
+
+# Hedef rengi (HSV aralıkları): sualtında iyi ayrışan turuncu/kırmızı işaretler.
+# Kırmızı tonu HSV'de 0 ve 180 civarına bölündüğü için iki aralık var.
+DEFAULT_TARGET_HSV = (
+    ((0, 120, 80), (12, 255, 255)),
+    ((165, 120, 80), (180, 255, 255)),
+)
+
+
+def create_tracker(kind="auto"):
+    """cv2 izleyicisi oluştur; yoksa None (bölgesel yeniden tespit kullanılır).
+
+    "auto": hızlı KCF varsa o (opencv-contrib), değilse None. MIL her
+    karede ~20-50 ms sürdüğü için sadece açıkça istenirse seçilir.
+    """
+    names = {"kcf": "TrackerKCF_create", "mil": "TrackerMIL_create",
+             "csrt": "TrackerCSRT_create"}
+    if kind == "auto":
+        kind = "kcf"
+    if kind not in names:
+        return None
+    for module in (cv2, getattr(cv2, "legacy", None)):
+        factory = getattr(module, names[kind], None) if module is not None else None
+        if factory is not None:
+            return factory()
+    return None
+
+
+class ColorDetector:
+    """HSV renk eşiği + kontur ile en büyük hedefi bulur.
+
+    Güven değeri, kutunun içindeki hedef renkli piksel oranıdır; hem tespit
+    hem takip karelerinde aynı ölçü kullanılır.
+    """
+
+    def __init__(self, hsv_ranges=DEFAULT_TARGET_HSV, min_area=150):
+        self.hsv_ranges = [(np.array(lo, np.uint8), np.array(hi, np.uint8))
+                           for lo, hi in hsv_ranges]
+        self.min_area = min_area
+        self._kernel = np.ones((3, 3), np.uint8)
+
+    def mask(self, bgr):
+        hsv = cv2.cvtColor(bgr, cv2.COLOR_BGR2HSV)
+        mask = None
+        for lo, hi in self.hsv_ranges:
+            part = cv2.inRange(hsv, lo, hi)
+            mask = part if mask is None else cv2.bitwise_or(mask, part)
+        return cv2.morphologyEx(mask, cv2.MORPH_OPEN, self._kernel)
+
+    def detect(self, bgr, offset=(0, 0)):
+        """En büyük hedef: ((x, y, w, h), güven) ya da (None, 0.0)"""
+        mask = self.mask(bgr)
+        contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        best = max(contours, key=cv2.contourArea, default=None)
+        if best is None or cv2.contourArea(best) < self.min_area:
+            return None, 0.0
+        x, y, w, h = cv2.boundingRect(best)
+        confidence = float(np.count_nonzero(mask[y:y + h, x:x + w])) / (w * h)
+        return (x + offset[0], y + offset[1], w, h), confidence
+
+    def confidence(self, bgr, bbox):
+        x, y, w, h = _clip_box(bbox, bgr.shape)
+        if w <= 0 or h <= 0:
+            return 0.0
+        return float(np.count_nonzero(self.mask(bgr[y:y + h, x:x + w]))) / (w * h)
+
+
+def _clip_box(bbox, shape):
+    x, y, w, h = (int(round(v)) for v in bbox)
+    x0, y0 = max(x, 0), max(y, 0)
+    x1, y1 = min(x + w, shape[1]), min(y + h, shape[0])
+    return x0, y0, x1 - x0, y1 - y0
+
+
+class TargetTracker:
+    """Tespit her `detect_every` karede bir, arada takip (süreç içi durum).
+
+    İzleyici yoksa takip, son kutunun çevresinde (kutu boyutunun
+    `search_margin` katı) yeniden renk tespitiyle yapılır.
+    """
+
+    def __init__(self, detect_every=10, process_width=640, hsv_ranges=DEFAULT_TARGET_HSV,
+                 min_area=150, tracker="auto", min_confidence=0.2, search_margin=1.0):
+        self.detect_every = detect_every
+        self.process_width = process_width
+        self.detector = ColorDetector(hsv_ranges, min_area)
+        self.tracker_kind = tracker
+        self.min_confidence = min_confidence
+        self.search_margin = search_margin
+        self._tracker = None
+        self._bbox = None
+        self._since_detect = detect_every
+
+    def process(self, frame):
+        """Kareyi işle: (kutu, güven, kip, aşama süreleri). Kutu kare ölçeğinde"""
+        timings = {}
+        t = time.perf_counter()
+        scale = min(1.0, self.process_width / frame.shape[1])
+        if scale < 1.0:
+            small = cv2.resize(frame, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+        else:
+            small = frame
+        now = time.perf_counter()
+        timings["ölçek"], t = now - t, now
+
+        bbox, confidence, mode = None, 0.0, "takip"
+        if self._bbox is not None and self._since_detect < self.detect_every:
+            bbox, confidence = self._track(small)
+            self._since_detect += 1
+            now = time.perf_counter()
+            timings["takip"], t = now - t, now
+            if bbox is None or confidence < self.min_confidence:
+                bbox = None
+
+        if bbox is None:
+            mode = "tespit"
+            bbox, confidence = self.detector.detect(small)
+            self._since_detect = 1
+            self._tracker = None
+            if bbox is not None:
+                self._tracker = create_tracker(self.tracker_kind)
+                if self._tracker is not None:
+                    self._tracker.init(small, tuple(int(v) for v in bbox))
+            now = time.perf_counter()
+            timings["tespit"], t = now - t, now
+
+        self._bbox = bbox
+        if bbox is not None and scale < 1.0:
+            bbox = tuple(v / scale for v in bbox)
+        return bbox, confidence, mode, timings
+
+    def _track(self, small):
+        if self._tracker is not None:
+            ok, bbox = self._tracker.update(small)
+            if not ok:
+                return None, 0.0
+            return bbox, self.detector.confidence(small, bbox)
+
+        # Bölgesel yeniden tespit
+        x, y, w, h = self._bbox
+        mx, my = w * self.search_margin, h * self.search_margin
+        x0, y0, sw, sh = _clip_box((x - mx, y - my, w + 2 * mx, h + 2 * my), small.shape)
+        if sw <= 0 or sh <= 0:
+            return None, 0.0
+        return self.detector.detect(small[y0:y0 + sh, x0:x0 + sw], offset=(x0, y0))
+
+
+def _worker(inbox, outbox, options):
+    """Görüntü işleme süreci: izleyici durumu burada yaşar.
+
+    Kuyruktan ya kare (pickle ile) ya da paylaşılan halkanın adı gelir;
+    ikincisinde halkadaki en yeni kare kopyasız okunur.
+    """
+    tracker = TargetTracker(**options)
+    ring = None
+    while True:
+        item = inbox.get()
+        if item is None:
+            break
+        shared = item[0] == "shm"
+        if shared:
+            name = item[1]
+            if ring is None or ring.name != name:
+                if ring is not None:
+                    ring.close()
+                ring = SharedFrameRing.attach(name)
+            latest = ring.latest()
+            if latest is None:
+                continue
+            seq, timestamp, frame = latest
+            scale = 1.0
+        else:
+            _, seq, timestamp, frame, scale = item
+        received = time.monotonic()
+        try:
+            bbox, confidence, mode, timings = tracker.process(frame)
+            if bbox is not None and scale != 1.0:
+                bbox = tuple(v / scale for v in bbox)
+            error = None
+        except Exception as e:
+            bbox, confidence, mode, timings, error = None, 0.0, "hata", {}, str(e)
+        if shared and not ring.valid(seq):
+            # İşlerken yuva yeniden yazıldı: sonuç güvenilmez
+            continue
+        timings["aktarım"] = received - timestamp
+        outbox.put({
+            "seq": seq,
+            "timestamp": timestamp,
+            "bbox": bbox,
+            "confidence": confidence,
+            "mode": mode,
+            "timings": timings,
+            "done": time.monotonic(),
+            "error": error,
+        })
+    if ring is not None:
+        ring.close()
+
+
+class VisionPipeline:
+    """Hedef takibini ayrı bir süreçte çalıştırır (GIL arayüzü yavaşlatmaz).
+
+    İzleyici karedan kareye durum tuttuğu için havuz yerine tek bir kalıcı
+    işçi süreç kullanılır. Giriş kuyruğu tek karelik: işçi meşgulken gelen
+    yeni kare bekleyen eskisinin yerine geçer (eski kareler `skipped`).
+    `submit` kamera iş parçacığından tüketici olarak çağrılır. `source`
+    (yakalama) paylaşılan bellek halkası kullanıyorsa işçiye sadece halkanın
+    adı gider ve kare kopyasız okunur; değilse kare aktarım ucuz olsun diye
+    `process_width`e küçültülüp pickle ile gönderilir. `poll` arayüzden
+    çağrılır. Sonuçta kutu (kare ölçeğinde), güven,
+    gecikme ve aşama süreleri bulunur.
+    """
+
+    def __init__(self, detect_every=10, process_width=640, hsv_ranges=DEFAULT_TARGET_HSV,
+                 min_area=150, tracker="auto", frame_budget=1 / 30, stats_window=120,
+                 source=None):
+        self.process_width = process_width
+        self.source = source
+        self.options = dict(detect_every=detect_every, process_width=process_width,
+                            hsv_ranges=hsv_ranges, min_area=min_area, tracker=tracker)
+        self.frame_budget = frame_budget
+        self.latest = None
+        self._context = multiprocessing.get_context("spawn")
+        self._process = None
+        self._inbox = None
+        self._outbox = None
+
+        # Ölçümler
+        self.submitted = 0
+        self.skipped = 0
+        self.processed = 0
+        self.over_budget = 0
+        self._latencies = deque(maxlen=stats_window)
+        self._stage_totals = {}
+
+    @property
+    def running(self):
+        return self._process is not None and self._process.is_alive()
+
+    def start(self):
+        if self.running:
+            return
+        self._inbox = self._context.Queue(maxsize=1)
+        self._outbox = self._context.Queue()
+        self._process = self._context.Process(
+            target=_worker, args=(self._inbox, self._outbox, self.options),
+            name="vision-worker", daemon=True)
+        self._process.start()
+
+    def stop(self, timeout=1.0):
+        if self._process is None:
+            return
+        try:
+            self._drop_pending()
+            self._inbox.put(None, timeout=timeout)
+        except (queue.Full, ValueError, OSError):
+            pass
+        self._process.join(timeout)
+        if self._process.is_alive():
+            self._process.terminate()
+        self._process = None
+        self.latest = None
+
+    def _drop_pending(self):
+        try:
+            self._inbox.get_nowait()
+            return True
+        except queue.Empty:
+            return False
+
+    def submit(self, seq, timestamp, frame):
+        """Kareyi işçiye ver; önceki kare henüz alınmadıysa onun yerine geçer"""
+        if self._process is None:
+            return
+        self.submitted += 1
+        transport = getattr(self.source, "transport", None)
+        if transport is not None:
+            item = ("shm", transport.name)
+        else:
+            scale = min(1.0, self.process_width / frame.shape[1])
+            if scale < 1.0:
+                frame = cv2.resize(frame, None, fx=scale, fy=scale,
+                                   interpolation=cv2.INTER_LINEAR)
+            item = ("frame", seq, timestamp, frame, scale)
+        try:
+            self._inbox.put_nowait(item)
+        except queue.Full:
+            if self._drop_pending():
+                self.skipped += 1
+            try:
+                self._inbox.put_nowait(item)
+            except queue.Full:
+                self.skipped += 1
+
+    def poll(self):
+        """Gelen sonuçları topla (bloklamaz), en yenisini döndür"""
+        if self._outbox is None:
+            return None
+        now = time.monotonic()
+        while True:
+            try:
+                result = self._outbox.get_nowait()
+            except (queue.Empty, OSError, ValueError):
+                break
+            timings = result["timings"]
+            timings["dönüş"] = now - result["done"]
+            result["latency"] = now - result["timestamp"]
+            self.processed += 1
+            self._latencies.append(result["latency"])
+            if result["latency"] > self.frame_budget:
+                self.over_budget += 1
+            for stage, value in timings.items():
+                self._stage_totals[stage] = self._stage_totals.get(stage, 0.0) + value
+            self.latest = result
+        return self.latest
+
+    def stats(self):
+        latencies = np.asarray(self._latencies)
+        return {
+            "running": self.running,
+            "submitted": self.submitted,
+            "skipped": self.skipped,
+            "processed": self.processed,
+            "over_budget": self.over_budget,
+            "latency_ms": float(np.median(latencies) * 1000) if len(latencies) else 0.0,
+            "latency_max_ms": float(latencies.max() * 1000) if len(latencies) else 0.0,
+            "stages_ms": {stage: total / max(self.processed, 1) * 1000
+                          for stage, total in self._stage_totals.items()},
+        }
+
+
+def draw_overlay(image, result, scale, max_age=0.5):
+    """Hedef kutusunu gösterim tamponuna (RGBA) çiz; eski sonuçları çizme"""
+    if not result or result["bbox"] is None:
+        return
+    if time.monotonic() - result["timestamp"] > max_age:
+        return
+    x, y, w, h = (int(v * scale) for v in result["bbox"])
+    color = (0, 255, 0, 255) if result["mode"] == "tespit" else (0, 255, 255, 255)
+    cv2.rectangle(image, (x, y), (x + w, y + h), color, 2)
+    label = f"HEDEF {result['confidence']:.2f}  {result['latency'] * 1000:.0f} ms"
+    cv2.putText(image, label, (x, max(y - 6, 12)), cv2.FONT_HERSHEY_SIMPLEX,
+                0.45, color, 1, cv2.LINE_AA)
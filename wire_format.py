@@ -0,0 +1,287 @@
+import collections
+import struct
+import zlib
+
+import numpy as np
+
+# Çerçeve: sihirli sayı, sürüm, tür, sıra no, yük uzunluğu | yük | CRC32.
+# 0xA5 0x5A geçerli UTF-8 metinde hiç yan yana gelmez (0xA5 devam baytıdır,
+# ardından 'Z' gelemez); kaynaklar ikili akışı metinden buna bakarak ayırır.
+MAGIC = b"\xa5\x5a"
+VERSION = 1
+HEADER = struct.Struct("<2sBBIH")
+CRC = struct.Struct("<I")
+FRAME_OVERHEAD = HEADER.size + CRC.size
+
+# Çerçeve türleri
+KIND_SCHEMA = 1     # <u2 şema no> + UTF-8 kanal adları ("\n" ile)
+KIND_SAMPLES = 2    # <u2 şema no> + n x (<f8 zaman, k x <f4 değer)
+
+SCHEMA_ID = struct.Struct("<H")
+MAX_PAYLOAD = 0xFFFF
+
+# Araç şemayı bu kadar çerçevede bir yineler (bağlantı ortada açılsa da çözülür)
+SCHEMA_EVERY = 50
+
+# Sıra numarası bundan fazla geri giderse araç yeniden başlamış sayılır
+# (daha kısa geri sıçrama yineleme ya da sıra değiştirmedir)
+RESTART_REWIND = 1024
+
+
+def record_dtype(count):
+    """Tek örnek kaydı: zaman (f8) + count kanal (f4), dolgusuz"""
+    return np.dtype([("t", "<f8"), ("v", "<f4", (count,))])
+
+
+def has_magic(data):
+    return MAGIC in data
+
+
+def _plausible(version, kind, length):
+    return version == VERSION and kind in (KIND_SCHEMA, KIND_SAMPLES) and length >= SCHEMA_ID.size
+
+
+def _valid_frame(buffer, view, start, end):
+    """start'ta tamamı elde, CRC'si tutan bir çerçeve var mı"""
+    if end - start < HEADER.size:
+        return False
+    _, version, kind, _, length = HEADER.unpack_from(buffer, start)
+    stop = start + HEADER.size + length + CRC.size
+    if not _plausible(version, kind, length) or stop > end:
+        return False
+    return zlib.crc32(view[start:stop - CRC.size]) == CRC.unpack_from(buffer, stop - CRC.size)[0]
+
+
+class WireEncoder:
+    """Araç tarafı: örnekleri sıra numaralı, CRC'li ikili çerçevelere çevirir"""
+
+    def __init__(self, channels, schema_id=1, schema_every=SCHEMA_EVERY):
+        self.channels = tuple(channels)
+        self.schema_id = schema_id
+        self.schema_every = schema_every
+        self.dtype = record_dtype(len(self.channels))
+        self.max_samples = (MAX_PAYLOAD - SCHEMA_ID.size) // self.dtype.itemsize
+        self.seq = 0
+        self._since_schema = None
+
+    def _frame(self, kind, payload):
+        header = HEADER.pack(MAGIC, VERSION, kind, self.seq, len(payload))
+        self.seq = (self.seq + 1) & 0xFFFFFFFF
+        body = header + payload
+        return body + CRC.pack(zlib.crc32(body))
+
+    def schema_frame(self):
+        self._since_schema = 0
+        names = "\n".join(self.channels).encode("utf-8")
+        return self._frame(KIND_SCHEMA, SCHEMA_ID.pack(self.schema_id) + names)
+
+    def encode(self, timestamps, block, samples_per_frame=1):
+        """(n,) zaman + (n, kanal) değer -> bayt dizisi (gerekirse şema çerçevesiyle)"""
+        records = np.empty(len(timestamps), dtype=self.dtype)
+        records["t"] = timestamps
+        records["v"] = block
+        step = max(1, min(samples_per_frame, self.max_samples))
+        frames = []
+        schema = SCHEMA_ID.pack(self.schema_id)
+        for start in range(0, len(records), step):
+            if self._since_schema is None or self._since_schema >= self.schema_every:
+                frames.append(self.schema_frame())
+            frames.append(self._frame(KIND_SAMPLES, schema + records[start:start + step].tobytes()))
+            self._since_schema += 1
+        return b"".join(frames)
+
+
+class WireDecoder:
+    """Konsol tarafı: alınan tamponu tek geçişte çerçevelere ayırıp çözer.
+
+    `feed(bayt)` eldeki tüm tam çerçeveleri işler ve art arda aynı şemaya
+    ait örnekleri tek `numpy.frombuffer` ile `(kanallar, zamanlar,
+    değerler)` toplu örneğine çevirir (tek çerçeveyse kopyasız görünüm).
+    Sürümü, uzunluğu ya da CRC'si tutmayan çerçeve atlanır ve bir sonraki
+    sihirli sayıdan devam edilir. Eksik çerçeve beklenirken bildirdiği
+    uzunluğun içinde tam ve geçerli başka bir çerçeve belirirse uzunluk
+    alanı bozuk sayılır; bozuk uzunluk akışı bekletmez. Sıra numarası
+    boşlukları `lost`, şeması henüz gelmemiş örnekler `unknown_schema`
+    olarak sayılır. Sıra numarası `RESTART_REWIND`'dan çok geri giderse
+    (aracın yeniden başlaması) `restarts` artar.
+    """
+
+    def __init__(self):
+        self.schemas = {}
+        self._pending = b""
+        self._last_seq = None
+        self.restarts = 0
+
+        # Ölçümler
+        self.frames = 0
+        self.samples = 0
+        self.crc_errors = 0
+        self.bad_frames = 0
+        self.skipped_bytes = 0
+        self.lost = 0
+        self.unknown_schema = 0
+
+    def feed(self, data):
+        buffer = self._pending + bytes(data) if self._pending else bytes(data)
+        view = memoryview(buffer)
+        batches = []
+        group_id, group = None, []
+        pos = 0
+        end = len(buffer)
+        while True:
+            start = buffer.find(MAGIC, pos)
+            if start < 0:
+                # Son bayt sihirli sayının ilk yarısı olabilir
+                keep = 1 if buffer.endswith(MAGIC[:1]) else 0
+                self.skipped_bytes += end - pos - keep
+                pos = end - keep
+                break
+            self.skipped_bytes += start - pos
+            pos = start
+            if end - start < HEADER.size:
+                break
+            _, version, kind, seq, length = HEADER.unpack_from(buffer, start)
+            stop = start + HEADER.size + length + CRC.size
+            if not _plausible(version, kind, length) or self._bad_length(buffer, start, kind, length):
+                self.bad_frames += 1
+                self.skipped_bytes += 1
+                pos = start + 1
+                continue
+            if stop > end:
+                if self._overtaken(buffer, view, start, end):
+                    self.bad_frames += 1
+                    self.skipped_bytes += 1
+                    pos = start + 1
+                    continue
+                break
+            (crc,) = CRC.unpack_from(buffer, stop - CRC.size)
+            if zlib.crc32(view[start:stop - CRC.size]) != crc:
+                self.crc_errors += 1
+                self.skipped_bytes += 1
+                pos = start + 1
+                continue
+
+            pos = stop
+            self.frames += 1
+            if self._last_seq is not None:
+                gap = (seq - self._last_seq - 1) & 0xFFFFFFFF
+                # Geriye sıçrama (yineleme, aracın yeniden başlaması) kayıp değildir
+                if gap < 0x80000000:
+                    self.lost += gap
+                elif 0x100000000 - gap > RESTART_REWIND:
+                    self.restarts += 1
+            self._last_seq = seq
+            payload = view[start + HEADER.size:stop - CRC.size]
+            (schema_id,) = SCHEMA_ID.unpack_from(payload)
+            if kind == KIND_SCHEMA:
+                try:
+                    channels = tuple(bytes(payload[SCHEMA_ID.size:]).decode("utf-8").split("\n"))
+                except UnicodeDecodeError:
+                    self.bad_frames += 1
+                    continue
+                if self.schemas.get(schema_id, (None,))[0] != channels:
+                    self._close(group_id, group, batches)
+                    group_id, group = None, []
+                    self.schemas[schema_id] = (channels, record_dtype(len(channels)))
+                continue
+
+            schema = self.schemas.get(schema_id)
+            body = payload[SCHEMA_ID.size:]
+            if schema is None:
+                self.unknown_schema += 1
+                continue
+            if len(body) % schema[1].itemsize:
+                self.bad_frames += 1
+                continue
+            if schema_id != group_id:
+                self._close(group_id, group, batches)
+                group_id, group = schema_id, []
+            group.append(body)
+
+        self._close(group_id, group, batches)
+        self._pending = buffer[pos:]
+        return batches
+
+    def _bad_length(self, buffer, start, kind, length):
+        """Şeması bilinen örnek çerçevesinin yükü kayıt boyunun katı olmalı"""
+        if kind != KIND_SAMPLES or len(buffer) - start < HEADER.size + SCHEMA_ID.size:
+            return False
+        (schema_id,) = SCHEMA_ID.unpack_from(buffer, start + HEADER.size)
+        schema = self.schemas.get(schema_id)
+        return schema is not None and (length - SCHEMA_ID.size) % schema[1].itemsize != 0
+
+    @staticmethod
+    def _overtaken(buffer, view, start, end):
+        """Beklenen çerçevenin içinde tam, geçerli bir çerçeve başlıyor mu"""
+        at = buffer.find(MAGIC, start + 1, end)
+        while at >= 0:
+            if _valid_frame(buffer, view, at, end):
+                return True
+            at = buffer.find(MAGIC, at + 1, end)
+        return False
+
+    def _close(self, schema_id, group, batches):
+        if not group:
+            return
+        channels, dtype = self.schemas[schema_id]
+        data = group[0] if len(group) == 1 else b"".join(group)
+        records = np.frombuffer(data, dtype=dtype)
+        self.samples += len(records)
+        batches.append((channels, records["t"], records["v"]))
+
+    def stats(self):
+        return {"frames": self.frames, "samples": self.samples,
+                "crc_errors": self.crc_errors, "bad_frames": self.bad_frames,
+                "skipped_bytes": self.skipped_bytes, "lost": self.lost,
+                "unknown_schema": self.unknown_schema, "restarts": self.restarts}
+
+
+class ClockOffset:
+    """Uzak saat -> yerel saat: yakın geçmişte en kısa gecikmeli örnekten kayma.
+
+    Taşıma gecikmesi hep pozitif olduğundan `yerel - uzak` farkının en
+    küçüğü iki saat arasındaki kaymaya en yakın tahmindir. En küçük değer
+    son `window` saniyedeki örnekler üzerinden alınır; böylece saat
+    kayması yukarı doğru da izlenir. Uzak saat `rewind` saniyeden çok geri
+    giderse ya da `reset()` çağrılırsa (aracın yeniden başlaması) kayma
+    yeniden tohumlanır. Verilen yerel zamanlar hiçbir zaman daha önce
+    verilenden geri gitmez; kayma düşünce zamanlar yetişene dek sabit kalır.
+    """
+
+    def __init__(self, window=10.0, rewind=0.5):
+        self.window = window
+        self.rewind = rewind
+        self.offset = None
+        self.reseeds = 0
+        self._candidates = collections.deque()  # (yerel an, kayma), kayma artan
+        self._last_remote = None
+        self._last_local = -float("inf")
+
+    def reset(self):
+        """Sonraki örnekten kaymayı yeniden tohumla"""
+        if self.offset is not None:
+            self.reseeds += 1
+        self.offset = None
+        self._candidates.clear()
+        self._last_remote = None
+
+    def to_local(self, remote_times, now):
+        if len(remote_times):
+            if self._last_remote is not None and \
+                    float(remote_times[0]) < self._last_remote - self.rewind:
+                self.reset()
+            self._last_remote = float(remote_times[-1])
+            offset = now - self._last_remote
+            candidates = self._candidates
+            while candidates and candidates[-1][1] >= offset:
+                candidates.pop()
+            candidates.append((now, offset))
+            while candidates[0][0] < now - self.window:
+                candidates.popleft()
+            self.offset = candidates[0][1]
+        if self.offset is None:
+            return remote_times
+        local = np.maximum.accumulate(np.maximum(remote_times + self.offset, self._last_local))
+        if len(local):
+            self._last_local = float(local[-1])
+        return local